@@ -84,7 +84,7 @@ def ensure_patch():
 def ensure_gendef():
     # ensure presence of gendef.exe on the path
     try:
-        which.which('gendef')
+        return which.which('gendef')
     except FileNotFoundError:
         print("project requires gendef, from the cygwin/mingw tools, or from:")
         print("    git clone https://.....")
@@ -226,6 +226,24 @@ def main(argv=sys.argv):
     parser.add_argument('--do-arm',
                         help='build ARM64 libraries, too',
                         action='store_true')
+    parser.add_argument('--source-root',
+                        help='where the upstream sources are checked out '
+                             '(default: build\\source)',
+                        type=str)
+    parser.add_argument('--intermediate-root',
+                        help='where the packages are configured and built, '
+                             'best on the fastest disk (default: '
+                             'build\\build)',
+                        type=str)
+    parser.add_argument('--output-root',
+                        help='where the built headers, libraries and '
+                             'binaries are collected (default: build)',
+                        type=str)
+    parser.add_argument('--cache-root',
+                        help='where the compiler, import library and '
+                             'environment caches are kept (default: '
+                             'build\\cache)',
+                        type=str)
     parser.add_argument('-v', '--verbose',
                         help='more detailed progress messages',
                         action='store_true')
@@ -235,7 +253,7 @@ def main(argv=sys.argv):
 
     ensure_yaml()
     ensure_patch()
-    ensure_gendef()
+    gendef = ensure_gendef()
     (vcvars32, vcvars64) = locate_vcvars_files()
     vcvars = vcvars64 if vcvars64 is not None else vcvars32
 
@@ -250,7 +268,14 @@ def main(argv=sys.argv):
         compiler = repr(args.compiler)
     else:
         compiler = None
-    archs = ['Win32', 'x64', 'arm64'] if bool(args.do_arm) else []
+    archs = ['Win32', 'x64', 'arm64'] if bool(args.do_arm) else \
+        ['Win32', 'x64']
+
+    roots = {}
+    for name in ['source', 'intermediate', 'output', 'cache']:
+        root = getattr(args, name + '_root')
+        if root:
+            roots[name] = os.path.realpath(root)
 
     generator = find_generator()
 
@@ -264,7 +289,11 @@ def main(argv=sys.argv):
         print('COMPILER = {}'.format(repr(compiler)), file=configs)
         print('MAKE_NSIS = {}'.format(repr(make_nsis)), file=configs)
         print('VCVARS = {}'.format(vcvars_out), file=configs)
+        print('VCVARS_32 = {}'.format(repr(vcvars32)), file=configs)
+        print('VCVARS_64 = {}'.format(repr(vcvars64)), file=configs)
         print('ARCHS = {}'.format(repr(archs)), file=configs)
+        print('GENDEF = {}'.format(repr(gendef)), file=configs)
+        print('ROOTS = {}'.format(repr(roots)), file=configs)
     if v:
         print('Created configvars.py file with values:')
         print('    GENERATOR = {}'.format(repr(generator)))
@@ -273,6 +302,7 @@ def main(argv=sys.argv):
         print('    MAKE_NSIS = {}'.format(repr(make_nsis)))
         print('    VCVARS = {}'.format(vcvars_out))
         print('    ARCHS = {}'.format(repr(archs)))
+        print('    ROOTS = {}'.format(repr(roots)))
 
     # write make.cmd running python make.py %*
     with open('make.cmd', 'w') as makebat:
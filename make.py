@@ -46,14 +46,50 @@
 # #########################################################################
 
 import argparse
+from functools import partial
+import os
+import os.path
+import sys
 
+import configvars
+from maker.bench import ProfileBench
+from maker.ccache import CompilerCache
+from maker.cmakeseed import CMakeSeed
 from maker.dirs import MakerDirs
+from maker.distrib import Coordinator, Worker, parse_address
+from maker.gendef import ImportLibs
+from maker.history import HISTORY_FILE, History, PerfReport, \
+    measured_memory, toolchain_fingerprint
+from maker.install import Installer
+from maker.matrix import Matrix
+from maker.nsis import Packager
+from maker.outcomes import Outcomes
 from maker.parts import Levels
+from maker.plan import Planner
 from maker.proc import Proc
-from maker.target import Target
+from maker.sampler import Sampler, available as sampling_available
+from maker.schedule import Job, Scheduler, physical_memory_mb
+from maker.singleflight import SingleFlight
+from maker.slim import Pruner
+from maker.snapshot import Snapshot
+from maker.superbuild import Superbuild
+from maker.target import StepFailed, Target
+from maker.vcvars import VcVars
 # from configvars import GENERATOR, PREFIX, COMPILER, MAKE_NSIS, VCVARS
 from configvars import PREFIX, MAKE_NSIS
 
+# written by later versions of configure.py
+GENERATOR = getattr(configvars, 'GENERATOR', None)
+ARCHS = getattr(configvars, 'ARCHS', None)
+GENDEF = getattr(configvars, 'GENDEF', 'gendef')
+COMPILER_LAUNCHER = getattr(configvars, 'COMPILER_LAUNCHER', None)
+ROOTS = getattr(configvars, 'ROOTS', {})
+MEMORY_BUDGET = getattr(configvars, 'MEMORY_BUDGET', None)
+NSIS_COMPRESSOR = getattr(configvars, 'NSIS_COMPRESSOR', 'lzma')
+VCVARS_32 = getattr(configvars, 'VCVARS_32', '')
+VCVARS_64 = getattr(configvars, 'VCVARS_64',
+                    getattr(configvars, 'VCVARS', '') if not VCVARS_32 else '')
+
 
 class Maker:
 
@@ -62,9 +98,42 @@ class Maker:
         self.done_ = set()
         self.step_performed_ = False
         self.v_ = False
-        self.env_win32_ = ''
-        self.env_x64_ = ''
-        self.maker_dirs_ = MakerDirs(PREFIX, MAKE_NSIS)
+        self.jobs_ = None
+        self.snapshot_file_ = 'workspace.snapshot'
+        self.with_builds_ = False
+        self.listen_ = ''
+        self.connect_ = None
+        self.matrix_ = Matrix(ARCHS, None, GENERATOR)
+        self.maker_dirs_ = MakerDirs(PREFIX, MAKE_NSIS, ROOTS)
+        self.vcvars_ = None
+        self.compiler_cache_ = None
+        self.cmake_seed_ = None
+        self.single_flight_ = None
+        self.sampler_ = None
+        self.pruner_ = None
+        self.keep_going_ = False
+        self.memory_budget_mb_ = MEMORY_BUDGET
+        self.nsis_compressor_ = NSIS_COMPRESSOR
+        self.nsis_not_solid_ = False
+        self.nsis_dict_size_ = None
+        self.perf_threshold_ = 25.0
+        self.perf_window_ = 5
+        self.operands_ = {}
+
+    # targets that take the words after them (that aren't targets) as
+    # operands
+    takes_operands = set(['bench-profiles'])
+
+    def split_operands(self, raw_targets):
+        targets = []
+        self.operands_ = {}
+        for t in raw_targets:
+            if t not in Maker.targets and targets and \
+                    targets[-1] in Maker.takes_operands:
+                self.operands_.setdefault(targets[-1], []).append(t)
+            else:
+                targets.append(t)
+        return targets
 
     def valid_order(self, raw_targets):
         valid = []
@@ -87,47 +156,193 @@ class Maker:
     def prep_elements_(self):
         if hasattr(self, 'targets_'):
             return
+        self.read_elements_()
         self.targets_ = []
         for element in self.elements_:
-            self.targets_.append(Target(element, self.build_dir_))
+            self.targets_.append(Target(element, self.maker_dirs_,
+                                        self.matrix_, self.vcvars_,
+                                        self.compiler_cache_,
+                                        self.cmake_seed_,
+                                        self.single_flight_))
+        by_name = {t.name(): t for t in self.targets_}
+        for target in self.targets_:
+            target.use_depends(by_name[name] for name in
+                               self.depends_(target) if name in by_name)
 
-    def sync_targets_(self):
+    def levels_of_targets_(self):
+        levels = {}
         for target in self.targets_:
-            target.sync()
+            levels.setdefault(target.element().level(), []).append(target)
+        return [levels[x] for x in sorted(levels)]
+
+    def history_file_(self):
+        return os.path.join(self.maker_dirs_.build_root(), HISTORY_FILE)
 
     def make_all(self):
         self.prep_elements_()
-        self.sync_targets_()
         self.maker_dirs_.create_build_dirs()
+        fresh = set((t.name(), A) for t in self.targets_
+                    for A in self.matrix_.archs()
+                    if not os.path.isdir(os.path.join(t.build_dir(), A)))
+        history = History(self.history_file_(), self.v_)
+        history.start()
+        try:
+            self.build_all_()
+        finally:
+            launcher = self.compiler_cache_.launcher() \
+                if self.compiler_cache_ else None
+            history.stop({t.name(): t.head() for t in self.targets_},
+                         {A: toolchain_fingerprint(
+                             GENERATOR, self.vcvars_.env(A), launcher)
+                          for A in self.matrix_.archs()}, fresh,
+                         self.sampler_.peaks() if self.sampler_ else None,
+                         set((t.name(), A) for t in self.targets_
+                             for A in t.rebuilt()))
+        self.step_performed_ = True
+
+    def memory_budget_(self):
+        # MB the builds running at once may take between them; by default
+        # most of the machine's memory
+        if self.memory_budget_mb_ is not None:
+            return self.memory_budget_mb_ or None
+        total = physical_memory_mb()
+        budget = int(total * 0.8) if total else None
+        if self.v_ and budget:
+            print("Memory budget {} MB".format(budget))
+        return budget
+
+    def depends_(self, target):
+        # an element's YAML can name what it needs; otherwise it needs
+        # everything at the levels before its own
+        depends = target.element().depends()
+        if depends is not None:
+            return depends
+        return [t.name() for t in self.targets_
+                if t.element().level() < target.element().level()]
+
+    def sync_targets_(self, outcomes=None):
         for target in self.targets_:
-            target.sync()
-            target.build()
+            try:
+                target.sync()
+            except StepFailed as e:
+                if outcomes is None:
+                    raise
+                print("ERROR: {}".format(e), file=sys.stderr)
+                outcomes.failed(target.name(), None, str(e))
+
+    def build_unit_(self, outcomes, target, A, configs):
+        try:
+            target.build_unit(A, configs)
+            outcomes.built(target.name(), A)
+        except StepFailed as e:
+            if not self.keep_going_:
+                raise
+            print("ERROR: {}".format(e), file=sys.stderr)
+            outcomes.failed(target.name(), A, str(e))
+
+    def build_all_(self):
+        outcomes = Outcomes(self.matrix_.archs())
+        self.sync_targets_(outcomes if self.keep_going_ else None)
+        scheduler = Scheduler(self.jobs_, self.v_, self.memory_budget_())
+        measured = measured_memory(self.history_file_())
+        for level in self.levels_of_targets_():
+            jobs = []
+            for target in level:
+                hints = target.element().resources()
+                for A, configs in self.matrix_.units():
+                    if outcomes.has_failed(target.name(), A):
+                        continue
+                    blocker = outcomes.blocker(self.depends_(target), A)
+                    if blocker:
+                        outcomes.block(target.name(), A, blocker)
+                        continue
+                    jobs.append(Job('{} {} {}'.format(
+                        target.name(), A, ','.join(configs)),
+                        partial(self.build_unit_, outcomes, target, A,
+                                configs),
+                        memory=hints.get('memory',
+                                         measured.get(target.name())),
+                        weight=hints.get('weight', 1),
+                        group=target.name(),
+                        group_limit=hints.get('max_archs')))
+            scheduler.run(jobs)
+            # later levels may link against the import libraries, for
+            # whichever arches did build
+            by_archs = {}
+            for target in level:
+                archs = tuple(A for A in self.matrix_.archs()
+                              if outcomes.ok(target.name(), A))
+                if archs:
+                    by_archs.setdefault(archs, []).append(target)
+            for archs, targets in by_archs.items():
+                ImportLibs(self.maker_dirs_, targets,
+                           Matrix(list(archs), self.matrix_.configs(),
+                                  GENERATOR), self.jobs_, self.v_,
+                           gendef=GENDEF).run(
+                               outcomes if self.keep_going_ else None)
+            if self.pruner_:
+                # less any whose import libraries then failed
+                everywhere = by_archs.get(tuple(self.matrix_.archs()), [])
+                done = [t for t in everywhere
+                        if all(outcomes.ok(t.name(), A)
+                               for A in self.matrix_.archs())]
+                for target in done:
+                    target.gather()
+                self.slim_(done)
+        if self.compiler_cache_:
+            self.compiler_cache_.report()
+        if self.keep_going_:
+            outcomes.print([t.name() for t in self.targets_])
+            if outcomes.any_failed():
+                sys.exit(1)
+
+    def slim_(self, targets):
+        # with the outputs gathered, the trees only need to stay configured
+        for target in targets:
+            self.pruner_.prune(target.name(), target.build_dir())
+
+    def make_perf_report(self):
+        PerfReport(self.history_file_(), self.perf_threshold_,
+                   self.perf_window_).print()
         self.step_performed_ = True
 
     def make_install(self):
-        self.read_elements_()
+        self.prep_elements_()
+        self.maker_dirs_.create_build_dirs()
+        files = []
         for target in self.targets_:
             target.gather()
-        # make sure c:\ProgramData\include exists
-        # make sure c:\ProgramData\lib exists
-        # make sure c:\ProgramData\bin exists
+            files += target.output_files()
+        if self.pruner_:
+            self.slim_(self.targets_)
+        Installer(self.maker_dirs_, self.jobs_, self.v_).install(files)
         self.step_performed_ = True
 
     def make_uninstall(self):
-        self.read_elements_()
-        # if any of c:\ProgramData\include, c:\ProgramData\lib or
-        # C:\ProgramData\bin do not exist, leave
-        for target in self.targets_:
-            target.uninstall()
+        Installer(self.maker_dirs_, self.jobs_, self.v_).uninstall()
+        self.step_performed_ = True
+
+    def make_rollback(self):
+        Installer(self.maker_dirs_, self.jobs_, self.v_).rollback()
         self.step_performed_ = True
 
     def make_package(self):
-        self.read_elements_()
+        self.prep_elements_()
+        if not MAKE_NSIS:
+            print("FATAL: No makensis was found by configure.py; re-run it "
+                  "with --make-nsis", file=sys.stderr)
+            sys.exit(2)
+        self.maker_dirs_.create_build_dirs()
         self.maker_dirs_.create_nsis_dirs()
+        files = []
         for target in self.targets_:
             target.gather()
-        # generate NSIS script
-        # run makensis
+            files += target.output_files()
+        if self.pruner_:
+            self.slim_(self.targets_)
+        Packager(self.maker_dirs_, MAKE_NSIS, self.jobs_, self.v_,
+                 self.nsis_compressor_, not self.nsis_not_solid_,
+                 self.nsis_dict_size_).package(files)
         self.step_performed_ = True
 
     def make_clean(self):
@@ -151,28 +366,176 @@ class Maker:
         self.step_performed_ = True
         pass
 
+    def make_snapshot(self):
+        self.prep_elements_()
+        Snapshot(self.maker_dirs_, self.targets_, self.jobs_, self.v_).write(
+            self.snapshot_file_, with_builds=self.with_builds_)
+        self.step_performed_ = True
+
+    def make_restore(self):
+        self.prep_elements_()
+        Snapshot(self.maker_dirs_, self.targets_, self.jobs_,
+                 self.v_).restore(self.snapshot_file_)
+        self.step_performed_ = True
+
+    def make_coordinate(self):
+        self.prep_elements_()
+        self.maker_dirs_.create_build_dirs()
+        self.sync_targets_()
+        Coordinator(self.maker_dirs_, self.targets_, self.matrix_,
+                    parse_address(self.listen_, ''), self.v_).run()
+        self.step_performed_ = True
+
+    def make_work(self):
+        if not self.connect_:
+            print("FATAL: work needs --connect HOST:PORT", file=sys.stderr)
+            sys.exit(2)
+        Worker(self.maker_dirs_, parse_address(self.connect_, 'localhost'),
+               GENERATOR, self.v_, GENDEF, self.vcvars_,
+               self.compiler_cache_, self.cmake_seed_).run()
+        self.step_performed_ = True
+
+    def make_superbuild(self):
+        # the same elements, with their dependencies as edges, scheduled by
+        # the native build tool instead of by us
+        self.prep_elements_()
+        self.maker_dirs_.create_build_dirs()
+        self.sync_targets_()
+        Superbuild(self.maker_dirs_, self.targets_, self.matrix_,
+                   self.depends_, self.vcvars_, self.jobs_, self.v_).run()
+        ImportLibs(self.maker_dirs_, self.targets_, self.matrix_, self.jobs_,
+                   self.v_, gendef=GENDEF).run()
+        self.step_performed_ = True
+
+    def make_bench_profiles(self):
+        self.prep_elements_()
+        self.maker_dirs_.create_build_dirs()
+        names = self.operands_.get('bench-profiles', [])
+        if not names:
+            print("FATAL: bench-profiles needs the element(s) to benchmark",
+                  file=sys.stderr)
+            sys.exit(2)
+        by_name = {t.name(): t for t in self.targets_}
+        for name in names:
+            if name not in by_name:
+                print("FATAL: No element named {}".format(name),
+                      file=sys.stderr)
+                sys.exit(2)
+            by_name[name].sync()
+            ProfileBench(by_name[name], self.levels_.profiles(),
+                         self.maker_dirs_, self.matrix_, self.v_).run()
+        self.step_performed_ = True
+
     def make_help(self):
         print("Makefile simluator for ease-of-deployment on Windows in Win32")
         print("  * help: this message")
-        print("  * all: (default target) compile of the libraries (Release)")
+        print("  * all: (default target) compile of the libraries (Release, " +
+              "or as chosen with --arch and --config)")
         print("  * install: deploy headers and libraries to prefix")
         print("  * uninstall: remove the headers and libraries at prefix")
-        print("  * package: build an installer for this source code, place " +
-              "it in .\\build (unaffected by prefix setting)")
+        print("  * rollback: put back what was at prefix before the last " +
+              "install or uninstall")
+        print("  * package: build installers, one per arch and one for " +
+              "the headers, into .\\build\\nsis (unaffected by prefix " +
+              "setting)")
+        print("  * snapshot: write sources (as git bundles) and, with " +
+              "--with-builds, configured build trees to --snapshot-file")
+        print("  * restore: rehydrate a workspace from --snapshot-file")
+        print("  * coordinate: sync the sources, then hand the builds out " +
+              "to workers, gathering what they build")
+        print("  * work: build what the coordinator at --connect hands out")
+        print("  * bench-profiles <element>...: build the element(s) under " +
+              "each acceleration profile and compare times and sizes")
+        print("  * superbuild: generate .\\build\\superbuild, one CMake " +
+              "project of every element, and build it with the native " +
+              "build tool, once per arch")
+        print("  * perf-report: configure and build times that regressed " +
+              "against earlier runs of all")
         print("If you haven't already done so, run .\\configure.cmd before "
               "running .\\make.")
         print("There are some important settings to be determined there.")
         self.step_performed_ = True
 
     targets = {"all": make_all, "install": make_install,
-               "uninstall": make_uninstall, "package": make_package,
-               "clean": make_clean, "scrub": make_scrub, "help": make_help}
+               "uninstall": make_uninstall, "rollback": make_rollback,
+               "package": make_package,
+               "clean": make_clean, "scrub": make_scrub,
+               "snapshot": make_snapshot, "restore": make_restore,
+               "coordinate": make_coordinate, "work": make_work,
+               "bench-profiles": make_bench_profiles,
+               "perf-report": make_perf_report,
+               "superbuild": make_superbuild,
+               "help": make_help}
 
     def process(self, args):
+        self.sampler_ = sampler = None
+        if args.sample:
+            if sampling_available():
+                self.maker_dirs_.create_build_dirs()
+                sampler = Sampler(os.path.join(
+                    self.maker_dirs_.build_root(), 'samples.csv'),
+                    args.sample)
+                sampler.start()
+                self.sampler_ = sampler
+            else:
+                print("WARNING: --sample needs /proc, not sampling",
+                      file=sys.stderr)
+        try:
+            self.process_(args)
+        finally:
+            if sampler is not None:
+                sampler.stop().print()
+
+    def process_(self, args):
         self.v_ = bool(args.verbose)
-        for target in self.valid_order(args.targets):
+        self.vcvars_ = VcVars({'Win32': VCVARS_32, 'x64': VCVARS_64},
+                              self.maker_dirs_.cache_dir(), self.v_)
+        launcher = args.compiler_cache if args.compiler_cache else \
+            COMPILER_LAUNCHER
+        if launcher and launcher != 'none' and self.matrix_.multi_config():
+            # CMake only honours compiler launchers with the Ninja and
+            # Makefile generators
+            print("WARNING: {} ignores compiler launchers; not using "
+                  "{}".format(GENERATOR, launcher), file=sys.stderr)
+        elif launcher and launcher != 'none':
+            self.compiler_cache_ = CompilerCache(
+                launcher, self.maker_dirs_.cache_dir(), self.v_)
+        if not args.no_cmake_seed:
+            self.cmake_seed_ = CMakeSeed(self.maker_dirs_.cache_dir(),
+                                         self.v_)
+        if not args.no_single_flight:
+            self.single_flight_ = SingleFlight(self.maker_dirs_.cache_dir())
+        self.jobs_ = args.jobs
+        self.snapshot_file_ = args.snapshot_file
+        self.with_builds_ = bool(args.with_builds)
+        self.listen_ = args.listen
+        self.connect_ = args.connect
+        self.perf_threshold_ = args.perf_threshold
+        self.keep_going_ = bool(args.keep_going)
+        if args.slim:
+            self.pruner_ = Pruner(self.v_)
+        if args.memory_budget is not None:
+            self.memory_budget_mb_ = args.memory_budget
+        self.nsis_compressor_ = args.nsis_compressor
+        self.nsis_not_solid_ = bool(args.nsis_not_solid)
+        self.nsis_dict_size_ = args.nsis_dict_size
+        self.perf_window_ = args.perf_window
+        self.matrix_ = Matrix(args.arch if args.arch else ARCHS, args.config,
+                              GENERATOR)
+        if args.dry_run or args.explain:
+            # nothing is run: the plan, or what changed, is just printed
+            self.prep_elements_()
+            planner = Planner(self.targets_, self.matrix_, self.vcvars_)
+            if args.dry_run:
+                planner.plan()
+            if args.explain:
+                planner.explain(args.explain)
+            return
+        for target in self.valid_order(self.split_operands(args.targets)):
             assert target in Maker.targets
             Maker.targets[target](self)
+        if self.pruner_:
+            self.pruner_.wait()
         if not self.step_performed_:
             print('Nothing to do for targets, {}'.format(repr(args.targets)))
 
@@ -183,14 +546,115 @@ def main():
     parser.add_argument('-v', '--verbose',
                         help='more detailed progress messages',
                         action='store_true')
+    parser.add_argument('-n', '--dry-run',
+                        help='print what "all" would sync, configure, build '
+                             'and gather, and why, without running anything',
+                        action='store_true')
+    parser.add_argument('--explain',
+                        help='print what has changed for ELEMENT since it '
+                             'last built successfully; may be repeated',
+                        type=str, action='append', metavar='ELEMENT')
+    parser.add_argument('-k', '--keep-going',
+                        help='when an element or arch fails, skip only what '
+                             'depends on it, build everything else and '
+                             'summarize at the end',
+                        action='store_true')
+    parser.add_argument('-j', '--jobs',
+                        help='number of concurrent jobs (default: one per '
+                             'CPU)',
+                        type=int)
+    parser.add_argument('--arch',
+                        help='arch(es) to build, comma-separated (default: '
+                             'as configured); may be repeated',
+                        type=str, action='append')
+    parser.add_argument('--config',
+                        help='build type(s) to build, comma-separated, from '
+                             'Release, Debug, RelWithDebInfo and MinSizeRel '
+                             '(default: Release); may be repeated',
+                        type=str, action='append')
+    parser.add_argument('--compiler-cache',
+                        help='compile through LAUNCHER (sccache, or one that '
+                             'behaves like ccache; default sccache), '
+                             'caching in build/cache/compiler; "none" turns '
+                             'a configured one off',
+                        type=str, nargs='?', const='sccache',
+                        metavar='LAUNCHER')
+    parser.add_argument('--slim',
+                        help='once a package\'s outputs are gathered, '
+                             'delete its objects, debug databases and build '
+                             'logs in the background, keeping its trees '
+                             'configured',
+                        action='store_true')
+    parser.add_argument('--memory-budget',
+                        help='MB of memory the builds running at once may '
+                             'expect to use between them, by the elements\' '
+                             'resources hints or, without them, what '
+                             '--sample measured before (default: 80%% of '
+                             'the machine\'s memory; 0 for no limit)',
+                        type=int, metavar='MB')
+    parser.add_argument('--no-cmake-seed',
+                        help='configure without the shared initial cache of '
+                             'header and type-size check results',
+                        action='store_true')
+    parser.add_argument('--no-single-flight',
+                        help="build even what another make.py sharing the "
+                             "cache is building from the same inputs, "
+                             "instead of waiting for its result",
+                        action='store_true')
+    parser.add_argument('--sample',
+                        help='sample CPU, memory and I/O of the build\'s '
+                             'processes every SECONDS (default 0.5) into '
+                             'build/samples.csv and report on them',
+                        type=float, nargs='?', const=0.5, metavar='SECONDS')
+    parser.add_argument('--snapshot-file',
+                        help='workspace snapshot written by "snapshot" and '
+                             'read by "restore"',
+                        type=str, default='workspace.snapshot')
+    parser.add_argument('--with-builds',
+                        help='"snapshot" also captures the configured build '
+                             'trees',
+                        action='store_true')
+    parser.add_argument('--listen',
+                        help='[HOST:]PORT "coordinate" listens on for '
+                             'workers (default: port 7878 on all '
+                             'interfaces)',
+                        type=str, default='')
+    parser.add_argument('--connect',
+                        help='HOST[:PORT] of the coordinator a "work" '
+                             'process builds for',
+                        type=str)
+    parser.add_argument('--nsis-compressor',
+                        help='compression for the installers "package" '
+                             'builds: zlib, bzip2 or lzma (default: lzma)',
+                        type=str, default=NSIS_COMPRESSOR)
+    parser.add_argument('--nsis-not-solid',
+                        help='compress each file in the installers on its '
+                             'own rather than all together',
+                        action='store_true')
+    parser.add_argument('--nsis-dict-size',
+                        help='lzma dictionary size for the installers, in MB',
+                        type=int, metavar='MB')
+    parser.add_argument('--perf-threshold',
+                        help='"perf-report" flags times more than PERCENT '
+                             'over the baseline (default 25)',
+                        type=float, default=25.0, metavar='PERCENT')
+    parser.add_argument('--perf-window',
+                        help='"perf-report" takes the baseline as the median '
+                             'of up to RUNS rebuilds before the last run '
+                             '(default 5)',
+                        type=int, default=5, metavar='RUNS')
     targets_prompt = 'Things to build. If nothing specified, "all" '
     targets_prompt += 'is assumed. Possible values are: {}'.format(
                       str(Maker.targets.keys()))
     parser.add_argument('targets', help=targets_prompt, type=str, nargs='*')
 
-    Maker().process(parser.parse_args())
+    try:
+        Maker().process(parser.parse_args())
+    except StepFailed as e:
+        print("FATAL: {}".format(e), file=sys.stderr)
+        return e.rc()
+    return 0
 
 
 if __name__ == '__main__':
-    main()
-    return 0
+    sys.exit(main())
@@ -0,0 +1,146 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  bench.py - Builds an element under each acceleration profile and
+#             compares configure, build and link times and deliverable sizes
+#
+# #########################################################################
+
+import os
+import os.path
+import re
+import shutil
+import sys
+import threading
+from . import parts
+from . import phase
+from . import proc
+from .target import StepFailed
+
+PERF_SUMMARY = '/clp:PerformanceSummary'
+TASK_RE = re.compile(r'^\s*(\d+) ms\s+(\S+)\s+\d+ calls')
+LINK_TASKS = ('Link', 'Lib')
+NO_PROFILE = '(none)'
+
+
+class ProfileBench:
+
+    def __init__(self, target, profiles, maker_dirs, build_matrix,
+                 verbose=False):
+        self.target_ = target
+        self.profiles_ = profiles
+        self.dirs_ = maker_dirs
+        self.matrix_ = build_matrix
+        self.v_ = verbose
+
+    def candidates_(self):
+        return [(NO_PROFILE, [])] + [(name, [self.profiles_[name]]) for
+                                     name in sorted(self.profiles_)]
+
+    def perf_summary_(self, profiles):
+        # MSBuild can say how long its Link and Lib tasks took
+        generator = self.matrix_.generator()
+        if generator and 'Visual Studio' not in generator:
+            return []
+        params = [p for one in profiles for p in one.build_params()]
+        return [parts.Profile('perf-summary', {'build_params': (
+            [PERF_SUMMARY] if '--' in params else ['--', PERF_SUMMARY])})]
+
+    def run(self):
+        A = self.matrix_.archs()[0]
+        C = self.matrix_.configs()[0]
+        results = []
+        for label, profiles in self.candidates_():
+            print("Benchmarking {} ({} {}) with profile {}".format(
+                  self.target_.name(), A, C, label))
+            results.append((label, self.bench_one_(label, profiles, A, C)))
+        self.report_(results, A, C)
+
+    def bench_one_(self, label, profiles, A, C):
+        tree = os.path.join(self.dirs_.build_dir(), '.bench',
+                            self.target_.name(), re.sub(r'\W', '_', label))
+        shutil.rmtree(tree, ignore_errors=True)
+        t = self.target_.variant(profiles + self.perf_summary_(profiles),
+                                 tree)
+        me = threading.get_ident()
+        times = {'configure': 0.0, 'build': 0.0}
+        tasks = {}
+
+        def timed(element, arch, name, seconds, ok):
+            if threading.get_ident() == me and name in times:
+                times[name] += seconds
+
+        def watched(p):
+            for line in p.lines():
+                m = TASK_RE.match(line.decode('utf-8', 'replace'))
+                if m:
+                    tasks[m.group(2)] = tasks.get(m.group(2), 0) + \
+                        int(m.group(1))
+
+        phase.add_listener(timed)
+        proc.add_watcher(watched)
+        try:
+            t.build_unit(A, [C])
+            ok = True
+        except (SystemExit, StepFailed):
+            ok = False
+        finally:
+            phase.remove_listener(timed)
+            proc.remove_watcher(watched)
+        size = 0
+        for source, _ in t.deliverable_files(A, C):
+            if os.path.isfile(source):
+                size += os.path.getsize(source)
+        link = sum(tasks.get(x, 0) for x in LINK_TASKS) / 1000.0 \
+            if tasks else None
+        return {'ok': ok, 'configure': times['configure'],
+                'build': times['build'], 'link': link, 'size': size}
+
+    def report_(self, results, A, C, out=sys.stdout):
+        print("Profiles for {} ({} {}):".format(self.target_.name(), A, C),
+              file=out)
+        print("  {:<16} {:>10} {:>10} {:>10} {:>14}".format(
+              'profile', 'configure', 'build', 'link', 'deliverables'),
+              file=out)
+        for label, r in results:
+            if not r['ok']:
+                print("  {:<16} failed".format(label), file=out)
+                continue
+            print("  {:<16} {:>9.1f}s {:>9.1f}s {:>10} {:>11,} KB".format(
+                  label, r['configure'], r['build'],
+                  '-' if r['link'] is None else '{:.1f}s'.format(r['link']),
+                  r['size'] // 1024), file=out)
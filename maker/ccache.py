@@ -0,0 +1,156 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  ccache.py - Object-level compiler caching (sccache, or anything that
+#              behaves like ccache) for the cmake-built elements
+#
+# #########################################################################
+
+import json
+import os
+import os.path
+import sys
+import threading
+from . import dirs
+from . import proc
+
+mkdir = dirs.mkdir_
+
+HIT_STATS = ('direct_cache_hit', 'preprocessed_cache_hit')
+MISS_STATS = ('cache_miss',)
+
+
+class CompilerCache:
+
+    def __init__(self, launcher, cache_dir, verbose=False):
+        self.launcher_ = launcher
+        self.dir_ = os.path.join(cache_dir, 'compiler')
+        self.stats_dir_ = os.path.join(cache_dir, 'compiler-stats')
+        self.sccache_ = os.path.basename(launcher).lower().startswith(
+            'sccache')
+        self.v_ = verbose
+        self.lock_ = threading.Lock()
+        self.counts_ = {}
+        # the ccache stats logs of the builds this run began, by element;
+        # other runs' logs are left alone
+        self.logs_ = {}
+        mkdir(self.dir_)
+        mkdir(self.stats_dir_)
+
+    def launcher(self):
+        return self.launcher_
+
+    def stats_log_(self, name, A):
+        return os.path.join(self.stats_dir_, '{}-{}.log'.format(name, A))
+
+    def env(self, name, A):
+        if self.sccache_:
+            return {'SCCACHE_DIR': self.dir_}
+        # ccache logs the outcome of each compile, per element and arch
+        return {'CCACHE_DIR': self.dir_,
+                'CCACHE_STATSLOG': self.stats_log_(name, A)}
+
+    def prebuild_params(self):
+        return ['-DCMAKE_C_COMPILER_LAUNCHER={}'.format(self.launcher_),
+                '-DCMAKE_CXX_COMPILER_LAUNCHER={}'.format(self.launcher_)]
+
+    def begin(self, name, A):
+        # returns what end() needs to tell this build's hits and misses;
+        # ccache's are read from its logs at the end of the run
+        if self.sccache_:
+            return self.sccache_counts_()
+        log = self.stats_log_(name, A)
+        if os.path.isfile(log):
+            os.remove(log)
+        with self.lock_:
+            self.logs_[log] = name
+        return None
+
+    def end(self, name, A, before):
+        if not self.sccache_:
+            return
+        after = self.sccache_counts_()
+        hits, misses = after[0] - before[0], after[1] - before[1]
+        with self.lock_:
+            counts = self.counts_.setdefault(name, [0, 0])
+            counts[0] += hits
+            counts[1] += misses
+
+    def ccache_counts_(self, log):
+        hits = misses = 0
+        if os.path.isfile(log):
+            with open(log, 'r') as f:
+                for line in f:
+                    line = line.strip()
+                    if line in HIT_STATS:
+                        hits += 1
+                    elif line in MISS_STATS:
+                        misses += 1
+        return hits, misses
+
+    def sccache_counts_(self):
+        # the sccache server is shared, so with builds overlapping the
+        # per-element figures are approximate
+        p = proc.proc(self.launcher_, '--show-stats', '--stats-format=json',
+                      env={'SCCACHE_DIR': self.dir_}, consume=True)
+        if not p.ok():
+            return 0, 0
+        try:
+            stats = json.loads(b''.join(p.lines()).decode('utf-8'))['stats']
+            return (sum(stats['cache_hits']['counts'].values()),
+                    sum(stats['cache_misses']['counts'].values()))
+        except (ValueError, KeyError, TypeError):
+            return 0, 0
+
+    def report(self, out=sys.stdout):
+        for log, name in sorted(self.logs_.items()):
+            hits, misses = self.ccache_counts_(log)
+            counts = self.counts_.setdefault(name, [0, 0])
+            counts[0] += hits
+            counts[1] += misses
+            if os.path.isfile(log):
+                os.remove(log)
+        self.logs_ = {}
+        if not self.counts_:
+            return
+        print("Compiler cache ({}):".format(self.launcher_), file=out)
+        for name in sorted(self.counts_):
+            hits, misses = self.counts_[name]
+            total = hits + misses
+            print("  {:<12} {:5} hits {:5} misses{}".format(
+                  name, hits, misses, '' if not total else
+                  '  ({:.0%} hit)'.format(hits / total)), file=out)
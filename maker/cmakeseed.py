@@ -0,0 +1,160 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  cmakeseed.py - Check results shared between configures with -C
+#
+# #########################################################################
+
+import json
+import os
+import os.path
+import re
+import threading
+from . import dirs
+
+mkdir = dirs.mkdir_
+
+# only results that depend on nothing but the compiler and SDK: checks for
+# the C runtime's and the system's own headers and the sizes of basic types,
+# named the way CMake's modules name them. Any other header or symbol check
+# may be of the project's own files or carry its own definitions, and is
+# never shared.
+SYSTEM_HEADERS = [
+    'ASSERT', 'CTYPE', 'DIRECT', 'DLFCN', 'ERRNO', 'FCNTL', 'FLOAT',
+    'INTTYPES', 'IO', 'LIMITS', 'LOCALE', 'MALLOC', 'MATH', 'MEMORY',
+    'PROCESS', 'PTHREAD', 'SIGNAL', 'STDARG', 'STDBOOL', 'STDDEF', 'STDINT',
+    'STDIO', 'STDLIB', 'STRING', 'STRINGS', 'SYS_PARAM', 'SYS_STAT',
+    'SYS_TIME', 'SYS_TYPES', 'TIME', 'UNISTD', 'WCHAR', 'WCTYPE', 'WINDOWS',
+    'WINSOCK2', 'WS2TCPIP']
+BASIC_TYPES = [
+    'CHAR', 'SHORT', 'INT', 'LONG', 'LONG_LONG', '__INT64', 'INT64', 'FLOAT',
+    'DOUBLE', 'LONG_DOUBLE', 'VOID_P', 'SIZE_T', 'SSIZE_T', 'OFF_T',
+    'PTRDIFF_T', 'WCHAR_T', 'INTPTR_T', 'UINTPTR_T']
+ALLOWED = set(['HAVE_{}_H'.format(h) for h in SYSTEM_HEADERS] +
+              ['CMAKE_HAVE_PTHREAD_H'] +
+              ['HAVE_SIZEOF_{}'.format(t) for t in BASIC_TYPES] +
+              ['SIZEOF_{}'.format(t) for t in BASIC_TYPES])
+
+CACHE_LINE = re.compile(r'^([A-Za-z_][A-Za-z0-9_.+-]*):INTERNAL=(.*)$')
+
+
+def allowed(name):
+    return name in ALLOWED
+
+
+def read_results_(cache_file):
+    results = {}
+    if not os.path.isfile(cache_file):
+        return results
+    with open(cache_file, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            m = CACHE_LINE.match(line.rstrip('\r\n'))
+            if m and allowed(m.group(1)):
+                results[m.group(1)] = m.group(2)
+    return results
+
+
+def cmake_quote_(value):
+    return '"{}"'.format(value.replace('\\', '\\\\').replace('"', '\\"')
+                         .replace('$', '\\$'))
+
+
+class CMakeSeed:
+    """Initial caches of shareable check results, per toolchain and arch"""
+
+    def __init__(self, cache_dir, verbose=False):
+        self.dir_ = os.path.join(cache_dir, 'cmake-seed')
+        self.v_ = verbose
+        self.lock_ = threading.Lock()
+
+    def stem_(self, fingerprint, A):
+        return os.path.join(self.dir_, '{}-{}'.format(fingerprint, A))
+
+    def load_(self, fingerprint, A):
+        path = self.stem_(fingerprint, A) + '.json'
+        if not os.path.isfile(path):
+            return {'results': {}, 'conflicts': []}
+        with open(path, 'r') as f:
+            return json.load(f)
+
+    def params(self, fingerprint, A):
+        # what to add to a configure: nothing until there's a seed
+        script = self.stem_(fingerprint, A) + '.cmake'
+        return ['-C', script] if os.path.isfile(script) else []
+
+    def harvest(self, fingerprint, A, tree, name=''):
+        # fold a configured tree's check results into the seed; a name that
+        # has come out differently in two trees is dropped for good. A tree
+        # configured with the seed reports the seeded values back, so only
+        # trees configured before a name was seeded can disagree about it;
+        # that's why only results fixed by the toolchain are allowed at all
+        found = read_results_(os.path.join(tree, 'CMakeCache.txt'))
+        if not found:
+            return
+        with self.lock_:
+            seed = self.load_(fingerprint, A)
+            results = seed['results']
+            conflicts = set(seed['conflicts'])
+            added = 0
+            for key, value in found.items():
+                if key in conflicts:
+                    continue
+                if key not in results:
+                    results[key] = value
+                    added += 1
+                elif results[key] != value:
+                    del results[key]
+                    conflicts.add(key)
+            if not added and conflicts == set(seed['conflicts']):
+                return
+            seed['conflicts'] = sorted(conflicts)
+            self.write_(fingerprint, A, seed)
+        if self.v_:
+            print("Seeded {} check result(s) from {} {}".format(
+                  added, name, A))
+
+    def write_(self, fingerprint, A, seed):
+        mkdir(self.dir_)
+        stem = self.stem_(fingerprint, A)
+        with open(stem + '.json.tmp', 'w') as f:
+            json.dump(seed, f, indent=2, sort_keys=True)
+        with open(stem + '.cmake.tmp', 'w') as f:
+            for key, value in sorted(seed['results'].items()):
+                print('set({} {} CACHE INTERNAL "seeded by make.py")'.format(
+                      key, cmake_quote_(value)), file=f)
+        os.replace(stem + '.json.tmp', stem + '.json')
+        os.replace(stem + '.cmake.tmp', stem + '.cmake')
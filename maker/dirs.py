@@ -58,26 +58,45 @@ def create_these_(dir_d):
         mkdir_(dir_d[dir_key])
 
 
+# the kinds of data that can each live on their own volume
+ROOTS = ['source', 'intermediate', 'output', 'cache']
+
+
 class MakerDirs:
 
-    def __init__(self, prefix, make_nsis=''):
+    def __init__(self, prefix, make_nsis='', roots=None):
         self.prefix_ = prefix
         self.has_nsis_ = bool(make_nsis)
         self.build_dirs_ = {}
         self.install_dirs_ = {}
         self.nsis_dests_ = {}
         self.root_ = os.getcwd()
+        self.roots_ = {}
+        for name, path in (roots or {}).items():
+            if name not in ROOTS:
+                print("FATAL: Unknown root {}, expected one of {}".format(
+                      name, ', '.join(ROOTS)), file=sys.stderr)
+                sys.exit(2)
+            if path:
+                self.roots_[name] = os.path.join(self.root_, path)
 
     def build_dirs(self):
         if self.build_dirs_:
             return self.build_dirs_
         proj_build = os.path.join(self.root_, 'build')
-        proj_lib = os.path.join(proj_build, 'lib')
-        proj_bin = os.path.join(proj_build, 'bin')
+        proj_output = self.roots_.get('output', proj_build)
+        proj_lib = os.path.join(proj_output, 'lib')
+        proj_bin = os.path.join(proj_output, 'bin')
         self.build_dirs_ = {'build-root': proj_build,
-                            'src-root': os.path.join(proj_build, 'source'),
-                            'build': os.path.join(proj_build, 'build'),
-                            'include': os.path.join(proj_build, 'include'),
+                            'src-root': self.roots_.get(
+                                'source', os.path.join(proj_build, 'source')),
+                            'build': self.roots_.get(
+                                'intermediate',
+                                os.path.join(proj_build, 'build')),
+                            'output-root': proj_output,
+                            'include': os.path.join(proj_output, 'include'),
+                            'cache': self.roots_.get(
+                                'cache', os.path.join(proj_build, 'cache')),
 
                             'lib_root': proj_lib,
                             'lib_win32': os.path.join(proj_lib, 'Win32'),
@@ -110,7 +129,7 @@ class MakerDirs:
         if self.has_nsis_:
             if self.nsis_dests_:
                 return self.nsis_dests_
-            self.nsis_dests_ = {'nsis': os.path.join('build', 'nsis')}
+            self.nsis_dests_ = {'nsis': self.nsis_dir()}
 
             return self.nsis_dests_
         else:
@@ -125,25 +144,37 @@ class MakerDirs:
 
     def root(self): return self.root_
 
+    def prefix(self): return self.prefix_
+
     def build_root(self): return self.build_dirs()['build-root']
 
     def build_dir(self): return self.build_dirs()['build']
 
+    def output_root(self): return self.build_dirs()['output-root']
+
     def source_dir(self): return self.build_dirs()['src-root']
 
     def include_dir(self): return self.build_dirs()['include']
 
-    def lib_dir(self, arch=None):
+    def cache_dir(self): return self.build_dirs()['cache']
+
+    def nsis_dir(self): return os.path.join(self.build_root(), 'nsis')
+
+    def lib_dir(self, arch=None, config=None):
         if arch is None:
-            return self.build_dirs()['lib']
-        else:
+            return self.build_dirs()['lib_root']
+        elif config is None:
             return self.build_dirs()['lib_{}'.format(arch.lower())]
+        else:
+            return os.path.join(self.lib_dir(arch), config)
 
-    def bin_dir(self, arch=None):
+    def bin_dir(self, arch=None, config=None):
         if arch is None:
-            return self.build_dirs()['bin']
-        else:
+            return self.build_dirs()['bin_root']
+        elif config is None:
             return self.build_dirs()['bin_{}'.format(arch.lower())]
+        else:
+            return os.path.join(self.bin_dir(arch), config)
 
     def patches_dir(self):
-        return os.path.join(self.root_, 'patches')
+        return os.path.join(self.root_, 'patch')
@@ -0,0 +1,382 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  distrib.py - Spreading element/arch builds over worker machines: a
+#               coordinator hands out jobs over TCP and gathers what the
+#               workers build
+#
+# #########################################################################
+
+import io
+import json
+import os
+import os.path
+import socket
+import socketserver
+import sys
+import tarfile
+import threading
+from . import dirs
+from . import gendef
+from . import matrix
+from . import parts
+from . import proc
+from . import target
+
+mkdir = dirs.mkdir_
+
+DEFAULT_PORT = 7878
+HEARTBEAT = 15
+MAX_ATTEMPTS = 3
+OUTPUTS = ('include', 'lib', 'bin')
+
+# Every message is one line of JSON; when it has a "size", that many bytes
+# of payload follow the line.
+#
+#   worker -> coordinator: register {name}
+#   coordinator -> worker: job {job} | done
+#   worker -> coordinator: alive | log {command, rc} + output
+#                          | result {ok, message} + tar.gz of outputs
+
+
+def parse_address(text, default_host):
+    # HOST:PORT, HOST or PORT
+    host, _, port = text.rpartition(':')
+    if not _:
+        host, port = ('', text) if text.isdigit() else (text, '')
+    return (host if host else default_host, int(port) if port else
+            DEFAULT_PORT)
+
+
+def send_(wfile, lock, header, payload=b''):
+    if payload:
+        header = dict(header, size=len(payload))
+    data = (json.dumps(header) + '\n').encode('utf-8') + payload
+    with lock:
+        wfile.write(data)
+        wfile.flush()
+
+
+def recv_(rfile):
+    line = rfile.readline()
+    if not line:
+        raise EOFError('connection closed')
+    header = json.loads(line.decode('utf-8'))
+    size = header.get('size', 0)
+    payload = rfile.read(size) if size else b''
+    if len(payload) != size:
+        raise EOFError('connection closed')
+    return header, payload
+
+
+class JobBoard:
+    """Jobs level by level; a level's jobs are handed out once every job of
+    the levels before it is done"""
+
+    def __init__(self, levels):
+        self.cond_ = threading.Condition()
+        self.levels_ = [lev for lev in levels if lev]
+        self.level_ = 0
+        self.waiting_ = list(self.levels_[0]) if self.levels_ else []
+        self.running_ = {}
+        self.failed_ = []
+
+    def finished_(self):
+        return bool(self.failed_) or self.level_ >= len(self.levels_)
+
+    def take(self):
+        with self.cond_:
+            while True:
+                if self.finished_():
+                    return None
+                if self.waiting_:
+                    job = self.waiting_.pop(0)
+                    self.running_[job['id']] = job
+                    return job
+                self.cond_.wait()
+
+    def requeue(self, job):
+        with self.cond_:
+            self.running_.pop(job['id'], None)
+            job['attempts'] += 1
+            if job['attempts'] >= MAX_ATTEMPTS:
+                self.failed_.append((job, 'lost {} workers'.format(
+                                     job['attempts'])))
+            else:
+                self.waiting_.insert(0, job)
+            self.cond_.notify_all()
+
+    def complete(self, job):
+        with self.cond_:
+            self.running_.pop(job['id'], None)
+            if not self.waiting_ and not self.running_:
+                self.level_ += 1
+                if self.level_ < len(self.levels_):
+                    self.waiting_ = list(self.levels_[self.level_])
+            self.cond_.notify_all()
+
+    def fail(self, job, message):
+        with self.cond_:
+            self.running_.pop(job['id'], None)
+            self.failed_.append((job, message))
+            self.cond_.notify_all()
+
+    def wait(self):
+        with self.cond_:
+            while not self.finished_():
+                self.cond_.wait()
+            return self.failed_
+
+
+class CoordinatorHandler(socketserver.StreamRequestHandler):
+
+    def handle(self):
+        coordinator = self.server.coordinator_
+        board = coordinator.board_
+        lock = threading.Lock()
+        # a busy worker checks in every HEARTBEAT seconds
+        self.request.settimeout(HEARTBEAT * 4)
+        try:
+            header, _ = recv_(self.rfile)
+        except (OSError, EOFError, ValueError):
+            return
+        if header.get('op') != 'register':
+            return
+        name = header.get('name', '{}:{}'.format(*self.client_address))
+        print("Worker {} registered".format(name))
+        while True:
+            job = board.take()
+            if job is None:
+                try:
+                    send_(self.wfile, lock, {'op': 'done'})
+                except OSError:
+                    pass
+                return
+            try:
+                print("{} -> {}".format(job['id'], name))
+                send_(self.wfile, lock, {'op': 'job', 'job': job})
+                while True:
+                    header, payload = recv_(self.rfile)
+                    if header['op'] == 'log':
+                        coordinator.log_(name, job, header, payload)
+                    elif header['op'] == 'result':
+                        break
+                if not header.get('ok'):
+                    board.fail(job, header.get('message', 'failed'))
+                    continue
+                coordinator.gather_(payload)
+                board.complete(job)
+            except (OSError, EOFError, ValueError, tarfile.TarError) as e:
+                print("WARNING: lost worker {} during {} ({}); rescheduling"
+                      .format(name, job['id'], e), file=sys.stderr)
+                board.requeue(job)
+                return
+
+
+class Coordinator:
+
+    def __init__(self, maker_dirs, targets, build_matrix, address,
+                 verbose=False):
+        self.dirs_ = maker_dirs
+        self.targets_ = targets
+        self.matrix_ = build_matrix
+        self.address_ = address
+        self.v_ = verbose
+        self.lock_ = threading.Lock()
+        self.board_ = None
+
+    def jobs_(self):
+        levels = {}
+        for t in self.targets_:
+            commit = t.head()
+            for A, configs in self.matrix_.units():
+                levels.setdefault(t.element().level(), []).append({
+                    'id': '{} {} {}'.format(t.name(), A, ','.join(configs)),
+                    'element': t.name(), 'level': t.element().level(),
+                    'manifest': t.element().manifest(),
+                    'profiles': {p.name(): p.content()
+                                 for p in t.profiles()}, 'arch': A,
+                    'configs': configs, 'commit': commit, 'attempts': 0})
+        return [levels[x] for x in sorted(levels)]
+
+    def run(self):
+        # the sources have been synced here, their heads are the revisions
+        # the workers build
+        self.board_ = JobBoard(self.jobs_())
+        socketserver.ThreadingTCPServer.allow_reuse_address = True
+        server = socketserver.ThreadingTCPServer(self.address_,
+                                                 CoordinatorHandler)
+        server.daemon_threads = True
+        server.coordinator_ = self
+        print("Coordinator listening on {}:{}".format(
+              *server.server_address[:2]))
+        serving = threading.Thread(target=server.serve_forever, daemon=True)
+        serving.start()
+        try:
+            failed = self.board_.wait()
+        finally:
+            server.shutdown()
+            server.server_close()
+        if failed:
+            for job, message in failed:
+                print("FATAL: {} failed: {}".format(job['id'], message),
+                      file=sys.stderr)
+            sys.exit(7)
+
+    def log_(self, name, job, header, payload):
+        log_dir = os.path.join(self.dirs_.build_root(), 'logs', job['element'])
+        with self.lock_:
+            mkdir(log_dir)
+            with open(os.path.join(log_dir, job['arch'] + '.log'), 'ab') as f:
+                f.write('[{}] {} (rc {})\n'.format(
+                        name, header.get('command'), header.get('rc'))
+                        .encode('utf-8'))
+                f.write(payload)
+        if self.v_:
+            print("[{}] {}: {} (rc {})".format(name, job['id'],
+                  header.get('command'), header.get('rc')))
+
+    def gather_(self, payload):
+        roots = {'include': self.dirs_.include_dir(),
+                 'lib': self.dirs_.lib_dir(), 'bin': self.dirs_.bin_dir()}
+        with self.lock_, tarfile.open(fileobj=io.BytesIO(payload),
+                                      mode='r:gz') as outputs:
+            for member in outputs.getmembers():
+                names = member.name.split('/')
+                if not member.isfile() or names[0] not in roots or \
+                        '..' in names or '' in names:
+                    continue
+                dest = os.path.join(roots[names[0]], *names[1:])
+                mkdir(os.path.dirname(dest))
+                with outputs.extractfile(member) as src, \
+                        open(dest, 'wb') as out:
+                    out.write(src.read())
+
+
+class Worker:
+
+    def __init__(self, maker_dirs, address, generator=None, verbose=False,
+                 gendef_tool=gendef.GENDEF, vcvars=None, compiler_cache=None,
+                 cmake_seed=None):
+        self.dirs_ = maker_dirs
+        self.vcvars_ = vcvars
+        self.compiler_cache_ = compiler_cache
+        self.cmake_seed_ = cmake_seed
+        self.address_ = address
+        self.generator_ = generator
+        self.v_ = verbose
+        self.gendef_ = gendef_tool
+        self.lock_ = threading.Lock()
+
+    def run(self):
+        sock = socket.create_connection(self.address_)
+        rfile = sock.makefile('rb')
+        self.wfile_ = sock.makefile('wb')
+        name = '{}:{}'.format(socket.gethostname(), os.getpid())
+        send_(self.wfile_, self.lock_, {'op': 'register', 'name': name})
+        print("Worker {} connected to {}:{}".format(name, *self.address_))
+        try:
+            while True:
+                header, _ = recv_(rfile)
+                if header['op'] == 'done':
+                    break
+                if header['op'] == 'job':
+                    self.do_job_(header['job'])
+        except EOFError:
+            print("Coordinator went away", file=sys.stderr)
+        finally:
+            sock.close()
+
+    def do_job_(self, job):
+        if self.v_:
+            print("Building {}".format(job['id']))
+        stop = threading.Event()
+
+        def alive():
+            while not stop.wait(HEARTBEAT):
+                send_(self.wfile_, self.lock_, {'op': 'alive'})
+
+        def log(p):
+            send_(self.wfile_, self.lock_, {
+                'op': 'log', 'rc': p.rc_,
+                'command': ' '.join(str(a) for a in p.args())},
+                b''.join(p.lines()))
+
+        beating = threading.Thread(target=alive, daemon=True)
+        beating.start()
+        proc.add_watcher(log)
+        payload, ok, message = b'', False, ''
+        try:
+            element = parts.Element(job['level'], job['element'],
+                                    job['manifest'])
+            # the profiles it asks for, as the coordinator's manifests
+            # define them
+            element.use_profiles({name: parts.Profile(name, content)
+                                  for name, content in
+                                  job.get('profiles', {}).items()})
+            m = matrix.Matrix([job['arch']], job['configs'], self.generator_)
+            t = target.Target(element, self.dirs_, m, self.vcvars_,
+                              self.compiler_cache_, self.cmake_seed_)
+            self.dirs_.create_build_dirs()
+            t.sync_to(job['commit'])
+            t.build_unit(job['arch'], job['configs'])
+            gendef.ImportLibs(self.dirs_, [t], m, 1, self.v_,
+                              gendef=self.gendef_).run()
+            payload = self.pack_(t)
+            ok = True
+        except SystemExit as e:
+            message = 'stopped with exit code {}'.format(e.code)
+        except target.StepFailed as e:
+            message = str(e)
+        except OSError as e:
+            message = str(e)
+        finally:
+            proc.remove_watcher(log)
+            stop.set()
+            beating.join()
+        send_(self.wfile_, self.lock_,
+              {'op': 'result', 'ok': ok, 'message': message}, payload)
+
+    def pack_(self, t):
+        data = io.BytesIO()
+        root = self.dirs_.output_root()
+        with tarfile.open(fileobj=data, mode='w:gz') as outputs:
+            for source, dest in t.gathered_files():
+                name = os.path.relpath(os.path.join(
+                    dest, os.path.basename(source)), root)
+                outputs.add(source, arcname=name.replace(os.sep, '/'))
+        return data.getvalue()
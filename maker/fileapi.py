@@ -0,0 +1,141 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  fileapi.py - Where CMake says each target's artifacts are, from its File API
+#              codemodel, indexed per build tree
+#
+# #########################################################################
+
+import glob
+import json
+import os
+import os.path
+
+CLIENT = 'client-gtk-msvc'
+QUERY = 'codemodel-v2'
+ARTIFACTS_FILE = '.gtk-msvc-artifacts.json'
+
+# what gather delivers; debug databases and the like stay in the tree
+DELIVERED = ('.dll', '.exe', '.lib')
+
+
+def api_dir_(tree):
+    return os.path.join(tree, '.cmake', 'api', 'v1')
+
+
+def request(tree):
+    # a query file left in the tree before configuring is answered when
+    # cmake generates
+    query_dir = os.path.join(api_dir_(tree), 'query', CLIENT)
+    os.makedirs(query_dir, exist_ok=True)
+    query = os.path.join(query_dir, QUERY)
+    if not os.path.isfile(query):
+        open(query, 'w').close()
+
+
+def read_(reply_dir, name):
+    with open(os.path.join(reply_dir, name), 'r') as f:
+        return json.load(f)
+
+
+def codemodel_(tree):
+    # the newest reply index names the codemodel answering our query
+    reply_dir = os.path.join(api_dir_(tree), 'reply')
+    indexes = sorted(glob.glob(os.path.join(reply_dir, 'index-*.json')))
+    if not indexes:
+        return None, None
+    index = read_(reply_dir, os.path.basename(indexes[-1]))
+    answer = index.get('reply', {}).get(CLIENT, {}).get(QUERY)
+    if not answer or 'jsonFile' not in answer:
+        return None, None
+    return reply_dir, read_(reply_dir, answer['jsonFile'])
+
+
+def artifacts_(reply_dir, configuration, wanted):
+    found = {}
+    for t in configuration.get('targets', []):
+        if t['name'] not in wanted:
+            continue
+        detail = read_(reply_dir, t['jsonFile'])
+        found[t['name']] = [a['path'] for a in detail.get('artifacts', [])
+                            if a['path'].lower().endswith(DELIVERED)]
+    return found
+
+
+def index(tree, targets):
+    # {config: {target: [artifact paths, relative to the tree unless
+    # outside it]}}; written empty when cmake didn't answer, so the
+    # deliverables in the manifest are used
+    try:
+        reply_dir, codemodel = codemodel_(tree)
+    except (OSError, ValueError, KeyError):
+        codemodel = None
+    found = {}
+    if codemodel:
+        for c in codemodel.get('configurations', []):
+            found[c['name']] = artifacts_(reply_dir, c, set(targets))
+    with open(os.path.join(tree, ARTIFACTS_FILE), 'w') as f:
+        json.dump(found, f, indent=2, sort_keys=True)
+    return found
+
+
+def indexed(tree):
+    return os.path.isfile(os.path.join(tree, ARTIFACTS_FILE))
+
+
+def artifacts(tree, C, targets):
+    # the artifacts of the targets built for C, or None if any of them
+    # wasn't indexed; a DLL's import library only if it was made
+    try:
+        with open(os.path.join(tree, ARTIFACTS_FILE), 'r') as f:
+            found = json.load(f).get(C, {})
+    except (OSError, ValueError):
+        return None
+    if not targets or any(t not in found for t in targets):
+        return None
+    paths = []
+    for t in targets:
+        mine = [os.path.join(*p.split('/')) if not os.path.isabs(p) else p
+                for p in found[t]]
+        if any(p.lower().endswith('.dll') for p in mine):
+            # a DLL that exports nothing comes without the import library
+            # CMake names for it; gendef makes one instead. A static
+            # library that's missing is still missing.
+            mine = [p for p in mine if not p.lower().endswith('.lib') or
+                    os.path.isfile(os.path.join(tree, p))]
+        paths += mine
+    return paths
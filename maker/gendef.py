@@ -0,0 +1,161 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  gendef.py - Import libraries for DLLs whose builds don't produce one,
+#              made with gendef and lib, cached by DLL content
+#
+# #########################################################################
+
+import hashlib
+import os
+import os.path
+import shutil
+import sys
+import tempfile
+import threading
+from . import dirs
+from . import phase
+from . import proc
+from . import schedule
+from .target import StepFailed
+
+mkdir = dirs.mkdir_
+
+GENDEF = 'gendef'
+LIB = 'lib'
+
+MACHINES = {'Win32': 'X86', 'x64': 'X64', 'arm64': 'ARM64'}
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class ImportLibs:
+
+    def __init__(self, maker_dirs, targets, build_matrix, jobs=None,
+                 verbose=False, gendef=GENDEF, lib=LIB):
+        self.dirs_ = maker_dirs
+        self.targets_ = targets
+        self.matrix_ = build_matrix
+        self.scheduler_ = schedule.Scheduler(jobs)
+        self.v_ = verbose
+        self.gendef_ = gendef
+        self.lib_ = lib
+        self.hits_ = 0
+        self.made_ = 0
+        self.lock_ = threading.Lock()
+
+    def cache_dir(self):
+        return os.path.join(self.dirs_.cache_dir(), 'gendef')
+
+    def run(self, outcomes=None):
+        # with outcomes, a failure is recorded for the element and arch, so
+        # what depends on it is held back, and the others go on
+        jobs = []
+        for target in self.targets_:
+            for A, C in self.matrix_.cells():
+                for dll, out in target.import_lib_files(A, C):
+                    jobs.append(schedule.Job(
+                        'gendef {}'.format(os.path.basename(dll)),
+                        lambda t=target, d=dll, o=out, A=A:
+                            self.make_or_record_(t, d, o, A, outcomes)))
+        self.scheduler_.run(jobs)
+        if jobs and self.v_:
+            print("Import libraries: {} from cache, {} generated".format(
+                  self.hits_, self.made_))
+
+    def make_or_record_(self, target, dll, out, A, outcomes):
+        try:
+            self.make_one_(target, dll, out, A)
+        except StepFailed as e:
+            if outcomes is None:
+                raise
+            print("ERROR: {}".format(e), file=sys.stderr)
+            outcomes.failed(target.name(), A, str(e))
+
+    def make_one_(self, target, dll, out, A):
+        if not os.path.isfile(dll):
+            raise StepFailed("{} was not built for {}".format(
+                             dll, target.name()), 5)
+        stem = os.path.splitext(os.path.basename(dll))[0]
+        key = '{}-{}'.format(file_digest(dll), A)
+        cached = os.path.join(self.cache_dir(), key)
+        if os.path.isfile(os.path.join(cached, stem + '.lib')):
+            with self.lock_:
+                self.hits_ += 1
+        else:
+            with phase.phase(target.name(), A, 'gendef'):
+                self.generate_(target, dll, stem, A, cached)
+            with self.lock_:
+                self.made_ += 1
+        mkdir(os.path.dirname(out))
+        shutil.copy2(os.path.join(cached, stem + '.lib'), out)
+        shutil.copy2(os.path.join(cached, stem + '.def'),
+                     os.path.splitext(out)[0] + '.def')
+
+    def generate_(self, target, dll, stem, A, cached):
+        mkdir(self.cache_dir())
+        work = tempfile.mkdtemp(prefix='work-', dir=self.cache_dir())
+        try:
+            shutil.copy2(dll, work)
+            steps = [('gendef', (self.gendef_, os.path.basename(dll))),
+                     ('lib', (self.lib_, '/nologo', '/def:{}.def'.format(stem),
+                              '/out:{}.lib'.format(stem),
+                              '/machine:{}'.format(MACHINES[A])))]
+            for name, step in steps:
+                p = proc.proc(*step, cwd=work, env=target.env(A),
+                              consume=True)
+                if not p.ok():
+                    raise StepFailed("{} failed on {} for {}".format(
+                                     name, os.path.basename(dll),
+                                     target.name()), p.rc())
+            os.remove(os.path.join(work, os.path.basename(dll)))
+            try:
+                os.rename(work, cached)
+            except OSError:
+                # another job made the same one first
+                pass
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+        if self.v_:
+            print("Generated {}.lib for {} ({})".format(stem, target.name(),
+                                                        A))
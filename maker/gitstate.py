@@ -0,0 +1,190 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  gitstate.py - Reading a checkout's state without running git
+#
+# #########################################################################
+
+import os
+import os.path
+import re
+from . import proc
+
+# good enough for the configs git writes for a clone; anything it can't
+# follow comes back None and the caller asks git instead
+SECTION = re.compile(r'^\s*\[\s*([-.\w]+)(?:\s+"((?:[^"\\]|\\.)*)")?\s*\]')
+ENTRY = re.compile(r'^\s*([-\w]+)\s*(?:=\s*(.*?))?\s*$')
+SHA = re.compile(r'^[0-9a-f]{40}([0-9a-f]{24})?$')
+
+
+def read_(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+class GitState:
+    """HEAD, branch and upstream of a checkout, read from its .git"""
+
+    def __init__(self, work_tree):
+        self.work_tree_ = work_tree
+        self.git_dir_ = None
+        self.common_dir_ = None
+        self.packed_ = None
+        self.config_ = None
+
+    def work_tree(self):
+        return self.work_tree_
+
+    def git_dir(self):
+        if self.git_dir_ is None:
+            dot_git = os.path.join(self.work_tree_, '.git')
+            self.git_dir_ = dot_git
+            if os.path.isfile(dot_git):
+                # submodules and worktrees point somewhere else
+                text = read_(dot_git) or ''
+                if text.startswith('gitdir:'):
+                    self.git_dir_ = os.path.normpath(os.path.join(
+                        self.work_tree_, text[len('gitdir:'):].strip()))
+        return self.git_dir_
+
+    def exists(self):
+        return os.path.isfile(os.path.join(self.git_dir(), 'HEAD'))
+
+    def common_dir_of_(self):
+        if self.common_dir_ is None:
+            common = read_(os.path.join(self.git_dir(), 'commondir'))
+            self.common_dir_ = self.git_dir() if common is None else \
+                os.path.normpath(os.path.join(self.git_dir(), common.strip()))
+        return self.common_dir_
+
+    def packed_refs_(self):
+        if self.packed_ is None:
+            self.packed_ = {}
+            text = read_(os.path.join(self.common_dir_of_(), 'packed-refs'))
+            for line in (text or '').splitlines():
+                if not line or line[0] in '#^':
+                    continue
+                sha, _, name = line.partition(' ')
+                self.packed_[name.strip()] = sha
+        return self.packed_
+
+    def ref(self, name):
+        # loose refs win over packed ones; symbolic refs are followed
+        for _ in range(5):
+            base = self.git_dir() if name == 'HEAD' else \
+                self.common_dir_of_()
+            text = read_(os.path.join(base, *name.split('/')))
+            if text is None:
+                sha = self.packed_refs_().get(name)
+                return sha if sha and SHA.match(sha) else None
+            text = text.strip()
+            if text.startswith('ref:'):
+                name = text[len('ref:'):].strip()
+                continue
+            return text if SHA.match(text) else None
+        return None
+
+    def head(self):
+        return self.ref('HEAD')
+
+    def branch(self):
+        text = read_(os.path.join(self.git_dir(), 'HEAD'))
+        if text is None or not text.startswith('ref:'):
+            return None
+        name = text[len('ref:'):].strip()
+        return name[len('refs/heads/'):] if \
+            name.startswith('refs/heads/') else None
+
+    def config_entries_(self):
+        if self.config_ is None:
+            self.config_ = {}
+            text = read_(os.path.join(self.common_dir_of_(), 'config'))
+            section = None
+            for line in (text or '').splitlines():
+                line = line.split('#')[0].split(';')[0]
+                m = SECTION.match(line)
+                if m:
+                    section = m.group(1).lower()
+                    if m.group(2) is not None:
+                        section += '.' + m.group(2)
+                    continue
+                m = ENTRY.match(line)
+                if m and section and m.group(1):
+                    key = section + '.' + m.group(1).lower()
+                    value = (m.group(2) or 'true').strip('"')
+                    self.config_[key] = value
+        return self.config_
+
+    def upstream(self):
+        # what @{u} names, for a branch tracking a fetched remote
+        branch = self.branch()
+        if branch is None:
+            return None
+        config = self.config_entries_()
+        remote = config.get('branch.{}.remote'.format(branch))
+        merge = config.get('branch.{}.merge'.format(branch))
+        if not remote or not merge or not merge.startswith('refs/heads/'):
+            return None
+        if remote == '.':
+            return self.ref(merge)
+        return self.ref('refs/remotes/{}/{}'.format(
+            remote, merge[len('refs/heads/'):]))
+
+    def forget(self):
+        # after running git that may have moved refs
+        self.packed_ = None
+        self.config_ = None
+
+    def dirty(self):
+        # the one check that needs git: what in the tree differs from HEAD
+        p = proc.git('-c', 'core.untrackedCache=true',
+                     '-c', 'core.fsmonitor=true',
+                     'status', '--porcelain=v2', consume=True,
+                     cwd=self.work_tree_)
+        if not p.ok():
+            return None
+        dirty = []
+        for line in p.lines():
+            line = line.decode('utf-8', 'replace').rstrip('\r\n')
+            # the path comes after a fixed number of fields per kind
+            fields = {'1': 8, '2': 9, 'u': 10, '?': 1}.get(line[:1])
+            if fields is not None:
+                dirty.append(line.split(' ', fields)[-1].split('\t')[0])
+        return dirty
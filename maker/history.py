@@ -0,0 +1,218 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  history.py - Phase timings kept across runs, and what regressed
+#
+# #########################################################################
+
+import hashlib
+import json
+import os
+import os.path
+import statistics
+import sys
+import threading
+import time
+from . import phase
+
+HISTORY_FILE = 'history.jsonl'
+
+# what in a vcvars environment says which compiler and SDK are in use
+TOOLCHAIN_KEYS = ['VCToolsVersion', 'VCToolsInstallDir', 'WindowsSDKVersion',
+                  'VSCMD_VER', 'UCRTVersion', 'CC', 'CXX']
+
+REPORTED_PHASES = ['configure', 'build']
+# shorter than this, a phase is all noise
+MIN_SECONDS = 2.0
+
+
+def toolchain_fingerprint(generator, env, launcher=None):
+    env = {k.upper(): v for k, v in (env or {}).items()}
+    parts = [generator or '', launcher or ''] + \
+        [env.get(k.upper(), '') for k in TOOLCHAIN_KEYS]
+    return hashlib.sha256('\n'.join(parts).encode()).hexdigest()[:12]
+
+
+class History:
+    """Appends each run's phase timings to build/history.jsonl"""
+
+    def __init__(self, path, verbose=False):
+        self.path_ = path
+        self.v_ = verbose
+        self.lock_ = threading.Lock()
+        self.times_ = {}
+        self.started_ = None
+
+    def start(self):
+        self.started_ = time.time()
+        phase.add_listener(self.ended_)
+
+    def ended_(self, element, arch, name, seconds, ok):
+        # a phase run once per build type adds up
+        with self.lock_:
+            key = (element, arch or '', name)
+            total, all_ok = self.times_.get(key, (0.0, True))
+            self.times_[key] = (total + seconds, all_ok and ok)
+
+    def stop(self, commits, toolchains, fresh, peaks=None, rebuilt=None):
+        # fresh: the (element, arch) pairs whose build trees didn't exist
+        # beforehand, so incremental builds aren't held against full ones;
+        # peaks: the most memory each phase held, when it was sampled;
+        # rebuilt: the pairs whose inputs had changed, not no-op builds
+        phase.remove_listener(self.ended_)
+        peaks = peaks or {}
+        rebuilt = rebuilt or set()
+        with self.lock_:
+            times = dict(self.times_)
+        if not times:
+            return
+        run = {'time': self.started_,
+               'commits': commits,
+               'toolchains': toolchains,
+               'timings': [{'element': element, 'arch': arch,
+                            'phase': name, 'seconds': round(seconds, 3),
+                            'ok': ok,
+                            'fresh': (element, arch) in fresh,
+                            'rebuilt': (element, arch) in rebuilt,
+                            'peak_kb': peaks.get((element, arch or None,
+                                                  name))}
+                           for (element, arch, name), (seconds, ok)
+                           in sorted(times.items())]}
+        with open(self.path_, 'a') as f:
+            f.write(json.dumps(run, sort_keys=True) + '\n')
+        if self.v_:
+            print("Recorded {} phase timings in {}".format(
+                  len(times), self.path_))
+
+
+def load_runs(path):
+    runs = []
+    if not os.path.isfile(path):
+        return runs
+    with open(path, 'r') as f:
+        for line in f:
+            try:
+                runs.append(json.loads(line))
+            except ValueError:
+                # a run cut short while writing; the rest still count
+                continue
+    return runs
+
+
+def measured_memory(path, runs=5):
+    # element -> the most memory (MB) one of its builds was seen to take in
+    # the last few runs that were sampled
+    memory = {}
+    for run in load_runs(path)[-runs:]:
+        for t in run.get('timings', []):
+            if t.get('peak_kb') and t['phase'] in REPORTED_PHASES:
+                memory[t['element']] = max(memory.get(t['element'], 0),
+                                           -(-t['peak_kb'] // 1024))
+    return memory
+
+
+class PerfReport:
+    """The last run's timings of each element against a rolling baseline"""
+
+    def __init__(self, path, threshold=25.0, window=5):
+        self.runs_ = load_runs(path)
+        self.threshold_ = threshold
+        self.window_ = window
+
+    def series_(self):
+        # (element, arch, phase, fresh) -> [(run, seconds)], oldest first;
+        # only builds that had something to do, since a no-op incremental
+        # build says nothing about how long a real one takes (runs recorded
+        # before rebuilds were noted don't say, so they're left out)
+        series = {}
+        for run in self.runs_:
+            for t in run.get('timings', []):
+                if not t.get('ok') or t['phase'] not in REPORTED_PHASES or \
+                        not (t.get('fresh') or t.get('rebuilt')):
+                    continue
+                key = (t['element'], t['arch'], t['phase'],
+                       bool(t.get('fresh')))
+                series.setdefault(key, []).append((run, t['seconds']))
+        return series
+
+    def regressions(self):
+        found = []
+        last = self.runs_[-1] if self.runs_ else None
+        for key, points in sorted(self.series_().items()):
+            # what the last run rebuilt; anything older has been reported
+            if len(points) < 2 or points[-1][0] is not last:
+                continue
+            run, latest = points[-1]
+            earlier = points[-1 - self.window_:-1]
+            baseline = statistics.median(s for _, s in earlier)
+            if latest < MIN_SECONDS or \
+                    latest <= baseline * (1 + self.threshold_ / 100):
+                continue
+            before = earlier[-1][0]
+            element, arch = key[0], key[1]
+            why = []
+            if before.get('commits', {}).get(element) != \
+                    run.get('commits', {}).get(element):
+                why.append('{} moved {} -> {}'.format(
+                    element,
+                    (before.get('commits', {}).get(element) or '?')[:10],
+                    (run.get('commits', {}).get(element) or '?')[:10]))
+            if before.get('toolchains', {}).get(arch) != \
+                    run.get('toolchains', {}).get(arch):
+                why.append('toolchain changed')
+            found.append((key, baseline, latest, len(earlier), why))
+        return found
+
+    def print(self, out=sys.stdout):
+        if not self.runs_:
+            print("No build history yet; it's recorded by \"all\"", file=out)
+            return 0
+        found = self.regressions()
+        print("{} runs recorded; flagging configure and build times of the "
+              "last run more than {:g}% over the median of up to {} earlier "
+              "rebuilds".format(
+                  len(self.runs_), self.threshold_, self.window_), file=out)
+        if not found:
+            print("  no regressions", file=out)
+        for (element, arch, name, fresh), baseline, latest, n, why in found:
+            print("  {} {} {}{}: {:.1f}s against {:.1f}s in {} earlier "
+                  "(+{:.0%}){}".format(
+                      element, arch, name, ' (fresh tree)' if fresh else '',
+                      latest, baseline, n, latest / baseline - 1
+                      if baseline else 0,
+                      '; ' + ', '.join(why) if why else ''), file=out)
+        return len(found)
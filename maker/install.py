@@ -0,0 +1,221 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  install.py - Installs into the prefix by building the new include, lib
+#               and bin trees beside the live ones and renaming them into
+#               place, keeping the previous generation for rollback
+#
+# #########################################################################
+
+import json
+import os
+import os.path
+import shutil
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from . import dirs
+
+mkdir = dirs.mkdir_
+
+AREAS = {'include': 'include', 'lib': 'lib_root', 'bin': 'bin'}
+NEW = '.gtk-msvc-new'
+OLD = '.gtk-msvc-old'
+MANIFEST = '.gtk-msvc-install.json'
+RENAME_TRIES = 10
+
+
+def rename_(source, dest):
+    # on Windows, a consumer reading a file in the tree can hold up a rename
+    # for a moment
+    for attempt in range(RENAME_TRIES):
+        try:
+            os.rename(source, dest)
+            return
+        except PermissionError:
+            if attempt + 1 == RENAME_TRIES:
+                raise
+            time.sleep(0.1 * (attempt + 1))
+
+
+def same_file_(a, b):
+    sa, sb = os.stat(a), os.stat(b)
+    return sa.st_size == sb.st_size and \
+        int(sa.st_mtime) == int(sb.st_mtime)
+
+
+class Installer:
+
+    def __init__(self, maker_dirs, jobs=None, verbose=False):
+        self.dirs_ = maker_dirs
+        self.prefix_ = maker_dirs.prefix()
+        self.jobs_ = jobs if jobs else (os.cpu_count() or 1)
+        self.v_ = verbose
+
+    def live_(self, area):
+        return self.dirs_.install_dests()[AREAS[area]]
+
+    def manifest_path_(self):
+        return os.path.join(self.prefix_, MANIFEST)
+
+    def manifest(self):
+        if not os.path.isfile(self.manifest_path_()):
+            return []
+        with open(self.manifest_path_(), 'r') as f:
+            return json.load(f)['files']
+
+    def install(self, files):
+        # files are paths relative to the build root, under include, lib or
+        # bin; whatever was installed before and isn't among them goes
+        old_files = set(self.manifest())
+        self.stage_and_swap_(files, old_files - set(files))
+        print("Installed {} files into {}".format(len(files), self.prefix_))
+
+    def uninstall(self):
+        files = self.manifest()
+        if not files:
+            print("Nothing installed in {}".format(self.prefix_))
+            return
+        self.stage_and_swap_([], set(files))
+        print("Removed {} files from {}".format(len(files), self.prefix_))
+
+    def stage_and_swap_(self, files, drop):
+        by_area = {area: [] for area in AREAS}
+        for rel in files:
+            by_area[rel.split('/')[0]].append(rel)
+        areas = [area for area in AREAS if by_area[area] or
+                 any(rel.split('/')[0] == area for rel in drop)]
+
+        with ThreadPoolExecutor(max_workers=self.jobs_) as pool:
+            for area in areas:
+                self.stage_(pool, area, by_area[area], drop)
+        for area in AREAS:
+            if area in areas:
+                self.swap_(area)
+            else:
+                # unchanged this time: rolling back leaves it as it is
+                shutil.rmtree(self.live_(area) + OLD, ignore_errors=True)
+        manifest = self.manifest_path_()
+        if os.path.isfile(manifest):
+            os.replace(manifest, manifest + OLD)
+        with open(manifest, 'w') as f:
+            json.dump({'files': sorted(files)}, f, indent=2)
+
+    def stage_(self, pool, area, files, drop):
+        live = self.live_(area)
+        new = live + NEW
+        shutil.rmtree(new, ignore_errors=True)
+        mkdir(new)
+        dropped = set(os.path.join(live, *rel.split('/')[1:]) for rel in drop
+                      if rel.split('/')[0] == area)
+        ours = {}
+        for rel in files:
+            ours[os.path.join(live, *rel.split('/')[1:])] = os.path.join(
+                self.dirs_.output_root(), *rel.split('/'))
+
+        jobs = []
+        # whatever else lives in the tree is carried over as hardlinks
+        if os.path.isdir(live):
+            for here, subdirs, names in os.walk(live):
+                for name in names:
+                    path = os.path.join(here, name)
+                    if path in dropped or path in ours:
+                        continue
+                    jobs.append(pool.submit(
+                        self.place_, path, os.path.join(
+                            new, os.path.relpath(path, live)), True))
+        for path, source in ours.items():
+            keep = os.path.isfile(path) and same_file_(path, source)
+            jobs.append(pool.submit(
+                self.place_, path if keep else source,
+                os.path.join(new, os.path.relpath(path, live)), keep))
+        for job in jobs:
+            job.result()
+
+    def place_(self, source, dest, link):
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if link:
+            try:
+                os.link(source, dest)
+                return
+            except OSError:
+                pass
+        shutil.copy2(source, dest)
+
+    def swap_(self, area):
+        live = self.live_(area)
+        new, old = live + NEW, live + OLD
+        shutil.rmtree(old, ignore_errors=True)
+        if os.path.isdir(live):
+            rename_(live, old)
+        try:
+            rename_(new, live)
+        except OSError as e:
+            if os.path.isdir(old):
+                rename_(old, live)
+            print("FATAL: could not put the new {} in place: {}".format(
+                  live, e), file=sys.stderr)
+            sys.exit(9)
+        if self.v_:
+            print("Swapped in {}".format(live))
+
+    def rollback(self):
+        # swaps the previous generation back in; rolling back again undoes
+        # the rollback
+        swapped = 0
+        for area in AREAS:
+            live = self.live_(area)
+            old = live + OLD
+            if not os.path.isdir(old):
+                continue
+            spare = live + NEW
+            shutil.rmtree(spare, ignore_errors=True)
+            rename_(live, spare)
+            rename_(old, live)
+            rename_(spare, old)
+            swapped += 1
+        if not swapped:
+            print("No previous generation in {} to roll back to".format(
+                  self.prefix_))
+            return
+        manifest = self.manifest_path_()
+        if os.path.isfile(manifest + OLD):
+            spare = manifest + NEW
+            os.replace(manifest, spare)
+            os.replace(manifest + OLD, manifest)
+            os.replace(spare, manifest + OLD)
+        print("Rolled back {} to its previous generation".format(self.prefix_))
@@ -0,0 +1,117 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  matrix.py - The arch x build-type matrix that make.py builds
+#
+# #########################################################################
+
+import sys
+
+ARCH_Win32 = "Win32"
+ARCH_X64 = "x64"
+ARCH_ARM64 = "arm64"
+
+ARCHS = [ARCH_Win32, ARCH_X64]
+KNOWN_ARCHS = [ARCH_Win32, ARCH_X64, ARCH_ARM64]
+
+BUILD_RELEASE = "Release"
+BUILD_DEBUG = "Debug"
+BUILD_RELWITHDEBINFO = "RelWithDebInfo"
+BUILD_MINSIZEREL = "MinSizeRel"
+
+CONFIGS = [BUILD_RELEASE]
+KNOWN_CONFIGS = [BUILD_RELEASE, BUILD_DEBUG, BUILD_RELWITHDEBINFO,
+                 BUILD_MINSIZEREL]
+
+
+def is_multi_config(generator):
+    # Visual Studio is the default (configure.py insists on it) and builds
+    # every configuration out of one configured tree
+    if not generator:
+        return True
+    return 'Visual Studio' in generator or 'Multi-Config' in generator or \
+        generator == 'Xcode'
+
+
+def pick_(values, known, what):
+    picked = []
+    lowered = {k.lower(): k for k in known}
+    for value in values:
+        for one in value.split(','):
+            one = one.strip()
+            if not one:
+                continue
+            if one.lower() not in lowered:
+                print("FATAL: Unknown {} {}, choose from {}".format(
+                      what, one, ', '.join(known)), file=sys.stderr)
+                sys.exit(2)
+            if lowered[one.lower()] not in picked:
+                picked.append(lowered[one.lower()])
+    return picked
+
+
+class Matrix:
+
+    def __init__(self, archs=None, configs=None, generator=None):
+        self.archs_ = pick_(archs, KNOWN_ARCHS, 'arch') if archs else \
+            list(ARCHS)
+        self.configs_ = pick_(configs, KNOWN_CONFIGS, 'build type') if \
+            configs else list(CONFIGS)
+        self.generator_ = generator
+        self.multi_config_ = is_multi_config(generator)
+
+    def archs(self):
+        return self.archs_
+
+    def configs(self):
+        return self.configs_
+
+    def generator(self):
+        return self.generator_
+
+    def multi_config(self):
+        return self.multi_config_
+
+    def cells(self):
+        return [(A, C) for A in self.archs_ for C in self.configs_]
+
+    def units(self):
+        # a unit is one configured build tree and the configurations built
+        # out of it; units never share a tree, so they can run concurrently
+        if self.multi_config_:
+            return [(A, list(self.configs_)) for A in self.archs_]
+        return [(A, [C]) for A, C in self.cells()]
@@ -0,0 +1,205 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  nsis.py - Installers built from the install manifest, one per arch plus
+#              the headers, side by side
+#
+# #########################################################################
+
+import hashlib
+import json
+import os
+import os.path
+import sys
+from . import dirs
+from . import phase
+from . import proc
+from .schedule import Job, Scheduler
+
+mkdir = dirs.mkdir_
+
+HEADERS = 'headers'
+COMPRESSORS = ['zlib', 'bzip2', 'lzma']
+DEFAULT_INSTALL_DIR = 'C:\\ProgramData'
+PRODUCT = 'gtk-msvc'
+
+
+def quote_(text):
+    return '"{}"'.format(text.replace('"', '$\\"'))
+
+
+def literal_(text):
+    # $ starts a variable
+    return text.replace('$', '$$')
+
+
+def inst_path_(rel):
+    return '$INSTDIR\\' + literal_(rel.replace('/', '\\'))
+
+
+def components(files):
+    # include/... and anything not under an arch go with the headers;
+    # lib/<arch>/... and bin/<arch>/... make up each arch's installer
+    parts = {}
+    for rel in files:
+        names = rel.split('/')
+        if names[0] in ('lib', 'bin') and len(names) > 2:
+            parts.setdefault(names[1], []).append(rel)
+        else:
+            parts.setdefault(HEADERS, []).append(rel)
+    return {name: sorted(part) for name, part in parts.items()}
+
+
+class Packager:
+
+    def __init__(self, maker_dirs, make_nsis, jobs=None, verbose=False,
+                 compressor='lzma', solid=True, dict_size=None,
+                 install_dir=DEFAULT_INSTALL_DIR):
+        self.dirs_ = maker_dirs
+        self.make_nsis_ = make_nsis
+        self.jobs_ = jobs
+        self.v_ = verbose
+        if compressor not in COMPRESSORS:
+            print("FATAL: Unknown NSIS compressor {}, expected one of "
+                  "{}".format(compressor, ', '.join(COMPRESSORS)),
+                  file=sys.stderr)
+            sys.exit(2)
+        self.compressor_ = compressor
+        self.solid_ = solid
+        self.dict_size_ = dict_size
+        self.install_dir_ = install_dir
+
+    def out_dir_(self):
+        return self.dirs_.nsis_dir()
+
+    def installer_(self, name):
+        return os.path.join(self.out_dir_(), '{}-{}.exe'.format(PRODUCT, name))
+
+    def source_(self, rel):
+        return os.path.join(self.dirs_.output_root(), *rel.split('/'))
+
+    def script(self, name, files):
+        lines = ['Unicode true',
+                 'SetCompressor {}{}'.format(
+                     '/SOLID ' if self.solid_ else '', self.compressor_)]
+        if self.dict_size_ and self.compressor_ == 'lzma':
+            lines.append('SetCompressorDictSize {}'.format(self.dict_size_))
+        uninstaller = inst_path_('{}-{}-uninstall.exe'.format(PRODUCT, name))
+        lines += ['Name {}'.format(quote_('{} {}'.format(PRODUCT, name))),
+                  'OutFile {}'.format(quote_(literal_(
+                      self.installer_(name)))),
+                  'InstallDir {}'.format(quote_(literal_(
+                      self.install_dir_))),
+                  'RequestExecutionLevel admin',
+                  'Page directory', 'Page instfiles',
+                  'UninstPage uninstConfirm', 'UninstPage instfiles',
+                  '', 'Section {}'.format(quote_(name))]
+        by_dir = {}
+        for rel in files:
+            by_dir.setdefault(os.path.dirname(rel), []).append(rel)
+        for rel_dir in sorted(by_dir):
+            lines.append('  SetOutPath {}'.format(quote_(
+                inst_path_(rel_dir))))
+            for rel in by_dir[rel_dir]:
+                lines.append('  File {}'.format(quote_(literal_(
+                    self.source_(rel)))))
+        lines += ['  WriteUninstaller {}'.format(quote_(uninstaller)),
+                  'SectionEnd', '', 'Section "Uninstall"']
+        for rel in files:
+            lines.append('  Delete {}'.format(quote_(inst_path_(rel))))
+        # deepest first; RMDir without /r only takes empty directories
+        rel_dirs = set()
+        for rel_dir in by_dir:
+            names = rel_dir.split('/')
+            rel_dirs.update('/'.join(names[:n])
+                            for n in range(1, len(names) + 1))
+        for rel_dir in sorted(rel_dirs, key=lambda d: (-d.count('/'), d)):
+            lines.append('  RMDir {}'.format(quote_(inst_path_(rel_dir))))
+        lines += ['  Delete {}'.format(quote_(uninstaller)),
+                  'SectionEnd']
+        return '\n'.join(lines) + '\n'
+
+    def digest_(self, text, files):
+        # the script and what it packs, by size and time
+        h = hashlib.sha256(text.encode())
+        for rel in files:
+            st = os.stat(self.source_(rel))
+            h.update('{} {} {}\n'.format(rel, st.st_size,
+                                         st.st_mtime_ns).encode())
+        return h.hexdigest()
+
+    def package(self, files):
+        mkdir(self.out_dir_())
+        parts = components(files)
+        jobs = []
+        # biggest first, so the last one to start isn't the longest
+        for name in sorted(parts, key=lambda n: -sum(
+                os.path.getsize(self.source_(rel)) for rel in parts[n])):
+            jobs.append(Job(name, lambda n=name: self.one_(n, parts[n])))
+        Scheduler(self.jobs_, self.v_).run(jobs)
+        print("Installers in {}: {}".format(self.out_dir_(), ', '.join(
+            os.path.basename(self.installer_(n)) for n in sorted(parts))))
+
+    def one_(self, name, files):
+        text = self.script(name, files)
+        stamp_file = os.path.join(self.out_dir_(), name + '.json')
+        digest = self.digest_(text, files)
+        if os.path.isfile(self.installer_(name)) and \
+                os.path.isfile(stamp_file):
+            with open(stamp_file, 'r') as f:
+                if json.load(f).get('digest') == digest:
+                    if self.v_:
+                        print("{} is unchanged".format(
+                              self.installer_(name)))
+                    return
+        script = os.path.join(self.out_dir_(), name + '.nsi')
+        with open(script, 'w', encoding='utf-8') as f:
+            f.write(text)
+        with phase.phase(PRODUCT, None if name == HEADERS else name,
+                         'package'):
+            p = proc.Proc(self.make_nsis_, '-V2', script, consume=True)
+            if not p.ok():
+                for line in p.lines():
+                    print(line.decode('utf-8', 'replace').rstrip(),
+                          file=sys.stderr)
+                print("FATAL: makensis failed for {}".format(script),
+                      file=sys.stderr)
+                sys.exit(p.rc())
+        with open(stamp_file, 'w') as f:
+            json.dump({'digest': digest, 'files': len(files)}, f)
+        if self.v_:
+            print("Built {}".format(self.installer_(name)))
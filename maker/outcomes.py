@@ -0,0 +1,106 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  outcomes.py - What built, what failed and what that held back
+#
+# #########################################################################
+
+import sys
+import threading
+
+
+class Outcomes:
+    """Per element and arch: built, failed (and why) or blocked (by what)"""
+
+    def __init__(self, archs):
+        self.archs_ = list(archs)
+        self.lock_ = threading.Lock()
+        self.built_ = set()
+        self.failed_ = {}
+        self.blocked_ = {}
+
+    def built(self, name, A):
+        with self.lock_:
+            self.built_.add((name, A))
+
+    def failed(self, name, A, message):
+        # A None: every arch, e.g. when the sync failed
+        with self.lock_:
+            for one in self.archs_ if A is None else [A]:
+                self.failed_.setdefault((name, one), message)
+
+    def block(self, name, A, by):
+        with self.lock_:
+            self.blocked_[(name, A)] = by
+
+    def ok(self, name, A):
+        with self.lock_:
+            return (name, A) in self.built_ and \
+                (name, A) not in self.failed_
+
+    def has_failed(self, name, A):
+        with self.lock_:
+            return (name, A) in self.failed_
+
+    def any_failed(self):
+        return bool(self.failed_ or self.blocked_)
+
+    def blocker(self, depends, A):
+        # the first thing depended on that didn't build for the arch
+        with self.lock_:
+            for name in depends:
+                if (name, A) in self.failed_ or (name, A) in self.blocked_:
+                    return name
+        return None
+
+    def print(self, names, out=sys.stdout):
+        print("Build summary:", file=out)
+        for name in names:
+            for A in self.archs_:
+                key = (name, A)
+                if key in self.failed_:
+                    print("  failed   {} {}: {}".format(
+                          name, A, self.failed_[key].splitlines()[0]),
+                          file=out)
+                elif key in self.blocked_:
+                    print("  skipped  {} {}: {} did not build".format(
+                          name, A, self.blocked_[key]), file=out)
+                elif key in self.built_:
+                    print("  ok       {} {}".format(name, A), file=out)
+        print("{} built, {} failed, {} skipped".format(
+              len(self.built_ - set(self.failed_)),
+              len(self.failed_), len(self.blocked_)), file=out)
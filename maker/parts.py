@@ -43,6 +43,35 @@ import os
 import sys
 import yaml
 
+PROFILES = 'profiles'
+
+
+class Profile:
+
+    def __init__(self, name, yaml_content):
+        self.name_ = name
+        yaml_content = yaml_content if yaml_content else {}
+        self.content_ = yaml_content
+        self.prebuild_params_ = yaml_content.get('prebuild_params', [])
+        self.build_params_ = yaml_content.get('build_params', [])
+        self.env_ = {str(k): str(v) for k, v in
+                     yaml_content.get('env', {}).items()}
+
+    def name(self):
+        return self.name_
+
+    def content(self):
+        return self.content_
+
+    def prebuild_params(self):
+        return self.prebuild_params_
+
+    def build_params(self):
+        return self.build_params_
+
+    def env(self):
+        return self.env_
+
 
 class Element:
 
@@ -60,6 +89,12 @@ class Element:
             self.yaml_content_['targets']
         self.headers_ = {} if 'headers' not in self.yaml_content_ else \
             self.yaml_content_['headers']
+        if isinstance(self.headers_, list):
+            # '- header : dest' entries, one mapping per line
+            merged = {}
+            for one in self.headers_:
+                merged.update(one)
+            self.headers_ = merged
         self.deliverables_ = [] if 'deliverables' not in self.yaml_content_ \
             else self.yaml_content_['deliverables']
         self.builder_name_ = 'cmake' if 'builder' not in self.yaml_content_ \
@@ -68,10 +103,52 @@ class Element:
             else self.yaml_content_['prebuild_params']
         self.script_path_ = None if 'script_path' not in self.yaml_content_ \
             else self.yaml_content_['script_path']
+        self.compiler_cache_ = True if 'compiler_cache' not in \
+            self.yaml_content_ else bool(self.yaml_content_['compiler_cache'])
+        self.cmake_seed_ = True if 'cmake_seed' not in \
+            self.yaml_content_ else bool(self.yaml_content_['cmake_seed'])
+        # None: everything at the levels before this one
+        self.depends_ = None if 'depends' not in self.yaml_content_ else \
+            self.yaml_content_['depends'] or []
+        if isinstance(self.depends_, str):
+            self.depends_ = [self.depends_]
+        self.resources_ = self.read_resources_(
+            self.yaml_content_.get('resources', {}))
+        self.profile_names_ = [] if 'profile' not in self.yaml_content_ \
+            else self.yaml_content_['profile']
+        if isinstance(self.profile_names_, str):
+            self.profile_names_ = [self.profile_names_]
+        self.profiles_ = []
+
+    def read_resources_(self, hints):
+        # memory in MB (or '<n>M', '<n>G'), weight in -j slots,
+        # max_archs as the most arches built at once
+        resources = {}
+        try:
+            for key, value in (hints or {}).items():
+                if key == 'memory':
+                    text = str(value).strip().upper()
+                    scale = 1024 if text.endswith('G') else 1
+                    resources[key] = int(float(text.rstrip('MG')) * scale)
+                elif key in ('weight', 'max_archs'):
+                    resources[key] = max(1, int(value))
+                else:
+                    raise ValueError('unknown hint {}'.format(key))
+        except (AttributeError, ValueError) as e:
+            print("Element {} has unusable resources: {}".format(
+                  self.name_, e))
+            sys.exit(117)
+        return resources
 
     def name(self):
         return self.name_
 
+    def manifest(self):
+        return self.yaml_content_
+
+    def level(self):
+        return self.level_
+
     def base_level(self):
         return self.level_ == 0
 
@@ -102,6 +179,33 @@ class Element:
     def script_path(self):
         return self.script_path_
 
+    def compiler_cache(self):
+        return self.compiler_cache_
+
+    def cmake_seed(self):
+        return self.cmake_seed_
+
+    def depends(self):
+        return self.depends_
+
+    def resources(self):
+        return self.resources_
+
+    def profile_names(self):
+        return self.profile_names_
+
+    def profiles(self):
+        return self.profiles_
+
+    def use_profiles(self, all_profiles):
+        self.profiles_ = []
+        for name in self.profile_names_:
+            if name not in all_profiles:
+                print("Element {} asks for unknown profile {}".format(
+                      self.name_, name))
+                sys.exit(117)
+            self.profiles_.append(all_profiles[name])
+
 
 class Levels:
 
@@ -109,6 +213,7 @@ class Levels:
         self.yamls_ = [y for y in os.listdir('.') if y[-4:] == 'yaml']
         self.yamls_.sort()
         self.levels_ = []
+        self.profiles_ = {}
         for one_yaml in self.yamls_:
             yaml_dict = {}
             try:
@@ -120,6 +225,9 @@ class Levels:
             if not yaml_dict:
                 print("Loading {} failed: empty file".format(one_yaml))
                 sys.exit(116)
+            # named build-acceleration profiles that elements can ask for
+            for name, content in yaml_dict.pop(PROFILES, {}).items():
+                self.profiles_[name] = Profile(name, content)
             self.levels_.append(yaml_dict)
         self.elements_ = []
         level_x = 0
@@ -127,9 +235,14 @@ class Levels:
             for elem in lev:
                 self.elements_.append(Element(level_x, elem, lev[elem]))
             level_x = level_x + 1
+        for element in self.elements_:
+            element.use_profiles(self.profiles_)
 
     def levels(self):
         return self.levels_
 
+    def profiles(self):
+        return self.profiles_
+
     def elements(self):
         return self.elements_
@@ -0,0 +1,317 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  patcher.py - In-process application of git-style unified diffs, with a
+#               record in each checkout of the patches applied to it
+#
+# #########################################################################
+
+import hashlib
+import json
+import os
+import os.path
+import re
+
+HUNK_RE = re.compile(rb'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+DEV_NULL = b'/dev/null'
+
+STATE_FILE = 'gtk-msvc-patches.json'
+STATE_DIR = 'gtk-msvc-patches'
+
+
+class PatchError(Exception):
+    pass
+
+
+def strip_(name):
+    # git diffs name their files a/... and b/...
+    if name == DEV_NULL:
+        return None
+    name = name.split(b'\t')[0]
+    if name[:2] in (b'a/', b'b/'):
+        name = name[2:]
+    return name.decode('utf-8')
+
+
+class FilePatch:
+
+    def __init__(self, old, new):
+        self.old_ = old
+        self.new_ = new
+        self.hunks_ = []
+
+    def path(self):
+        return self.new_ if self.new_ is not None else self.old_
+
+    def creates(self):
+        return self.old_ is None
+
+    def deletes(self):
+        return self.new_ is None
+
+    def reversed(self):
+        r = FilePatch(self.new_, self.old_)
+        r.hunks_ = [(new_start, old_start, new, old)
+                    for old_start, new_start, old, new in self.hunks_]
+        return r
+
+    def add_hunk(self, old, new, old_start=1, new_start=1):
+        # the starts are the hunk's 1-based line numbers in each file
+        self.hunks_.append((old_start, new_start, old, new))
+
+    def patched(self, content):
+        # content is None for a file that doesn't exist (yet); each hunk is
+        # looked for where its line numbers put it, allowing for the hunks
+        # before, then outward from there, as git apply does
+        eol = b'\r\n' if content and b'\r\n' in content else b'\n'
+        lines = [] if content is None else content.splitlines()
+        trailing = content is None or content.endswith(b'\n') or not content
+        if self.creates() and content is not None:
+            raise PatchError('{} already exists'.format(self.path()))
+        if not self.creates() and content is None:
+            raise PatchError('{} does not exist'.format(self.path()))
+        at = 0
+        offset = 0
+        for old_start, _, old, new in self.hunks_:
+            # -N,0 inserts after line N
+            expected = old_start - 1 + offset if old else old_start + offset
+            found = self.find_(lines, old, at, expected)
+            lines[found:found + len(old)] = new
+            offset += found - expected + len(new) - len(old)
+            at = found + len(new)
+        if self.deletes():
+            if lines:
+                raise PatchError('{} is not empty after deleting'.format(
+                                 self.path()))
+            return None
+        if not lines:
+            return b''
+        return eol.join(lines) + (eol if trailing else b'')
+
+    def find_(self, lines, old, at, expected):
+        # where the hunk's old lines are, no earlier than at: where expected
+        # if they're there, else the one place they are
+        last = len(lines) - len(old)
+        expected = min(max(expected, at), max(last, at))
+        if not old:
+            return expected
+        if expected <= last and lines[expected:expected + len(old)] == old:
+            return expected
+        found = [x for x in range(at, last + 1)
+                 if lines[x:x + len(old)] == old]
+        if not found:
+            raise PatchError('a hunk does not match {}'.format(self.path()))
+        if len(found) > 1:
+            raise PatchError('a hunk matches {} at lines {}, not at line '
+                             '{}'.format(self.path(), ', '.join(
+                                 str(x + 1) for x in found), expected + 1))
+        return found[0]
+
+
+class Patch:
+
+    def __init__(self, content, name=''):
+        self.content_ = content
+        self.name_ = name
+        self.digest_ = hashlib.sha256(content).hexdigest()
+        self.files_ = self.parse_(content)
+
+    @staticmethod
+    def from_file(path):
+        with open(path, 'rb') as f:
+            return Patch(f.read(), os.path.basename(path))
+
+    def name(self):
+        return self.name_
+
+    def digest(self):
+        return self.digest_
+
+    def content(self):
+        return self.content_
+
+    def parse_(self, content):
+        files = []
+        lines = [line.rstrip(b'\r') for line in content.split(b'\n')]
+        x = 0
+        while x < len(lines):
+            line = lines[x]
+            if line.startswith(b'--- ') and x + 1 < len(lines) and \
+                    lines[x + 1].startswith(b'+++ '):
+                files.append(FilePatch(strip_(line[4:]),
+                                       strip_(lines[x + 1][4:])))
+                x += 2
+                continue
+            m = HUNK_RE.match(line)
+            if m and files:
+                old_count = 1 if m.group(2) is None else int(m.group(2))
+                new_count = 1 if m.group(4) is None else int(m.group(4))
+                old, new = [], []
+                x += 1
+                while (len(old) < old_count or len(new) < new_count) and \
+                        x < len(lines):
+                    body = lines[x]
+                    if body.startswith(b'\\'):
+                        pass
+                    elif body.startswith(b'-'):
+                        old.append(body[1:])
+                    elif body.startswith(b'+'):
+                        new.append(body[1:])
+                    else:
+                        old.append(body[1:])
+                        new.append(body[1:])
+                    x += 1
+                files[-1].add_hunk(old, new, int(m.group(1)),
+                                   int(m.group(3)))
+                continue
+            x += 1
+        if not files:
+            raise PatchError('{} holds no file changes'.format(self.name_))
+        return files
+
+    def paths(self, root):
+        return [os.path.join(root, *f.path().split('/')) for f in self.files_]
+
+    def outcome_(self, root, reverse):
+        results = []
+        for f in self.files_:
+            f = f.reversed() if reverse else f
+            path = os.path.join(root, *f.path().split('/'))
+            content = None
+            if os.path.isfile(path):
+                with open(path, 'rb') as old:
+                    content = old.read()
+            results.append((path, content, f.patched(content)))
+        return results
+
+    def apply(self, root, reverse=False):
+        # every file is checked before any is written; files whose content
+        # comes out the same are left alone
+        for path, before, after in self.outcome_(root, reverse):
+            if after is None:
+                os.remove(path)
+            elif after != before:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as out:
+                    out.write(after)
+
+    def applies(self, root, reverse=False):
+        try:
+            self.outcome_(root, reverse)
+        except PatchError:
+            return False
+        return True
+
+
+def file_times(paths):
+    # (content digest, times) of the patched files, so that a file that
+    # comes out the same after un-patching, pulling and re-patching can get
+    # its old timestamps back
+    times = {}
+    for path in paths:
+        if os.path.isfile(path):
+            with open(path, 'rb') as f:
+                digest = hashlib.sha256(f.read()).digest()
+            st = os.stat(path)
+            times[path] = (digest, (st.st_atime_ns, st.st_mtime_ns))
+    return times
+
+
+def restore_times(times):
+    for path, (digest, ns) in file_times(times.keys()).items():
+        if path in times and times[path][0] == digest:
+            os.utime(path, ns=times[path][1])
+
+
+class PatchState:
+    """What's applied to a checkout, kept where git won't see it"""
+
+    def __init__(self, git_dir):
+        self.git_dir_ = git_dir
+        self.path_ = os.path.join(git_dir, STATE_FILE)
+        self.commit_ = None
+        self.patches_ = []
+        self.known_ = False
+        if os.path.isfile(self.path_):
+            with open(self.path_, 'r') as f:
+                state = json.load(f)
+            self.commit_ = state.get('commit')
+            self.patches_ = state.get('patches', [])
+            self.known_ = True
+
+    def known(self):
+        return self.known_
+
+    def commit(self):
+        return self.commit_
+
+    def digests(self):
+        return [p['sha256'] for p in self.patches_]
+
+    def matches(self, commit, patches):
+        return self.known_ and self.commit_ == commit and \
+            self.digests() == [p.digest() for p in patches]
+
+    def applied(self):
+        # the patches as they were when applied, even if the patch files
+        # have changed since
+        patches = []
+        for p in self.patches_:
+            keep = os.path.join(self.git_dir_, STATE_DIR,
+                                p['sha256'] + '.patch')
+            if not os.path.isfile(keep):
+                raise PatchError('the applied copy of {} is missing'.format(
+                                 p['name']))
+            patches.append(Patch.from_file(keep))
+            patches[-1].name_ = p['name']
+        return patches
+
+    def record(self, commit, patches):
+        keep_dir = os.path.join(self.git_dir_, STATE_DIR)
+        os.makedirs(keep_dir, exist_ok=True)
+        for p in patches:
+            keep = os.path.join(keep_dir, p.digest() + '.patch')
+            if not os.path.isfile(keep):
+                with open(keep, 'wb') as f:
+                    f.write(p.content())
+        self.commit_ = commit
+        self.patches_ = [{'name': p.name(), 'sha256': p.digest()}
+                         for p in patches]
+        self.known_ = True
+        with open(self.path_, 'w') as f:
+            json.dump({'commit': commit, 'patches': self.patches_}, f,
+                      indent=2)
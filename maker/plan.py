@@ -0,0 +1,232 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  plan.py - What a build would do, and why, worked out without running
+#             anything
+#
+# #########################################################################
+
+import os
+import os.path
+import sys
+from . import proc
+from .target import StepFailed
+
+
+def short_(commit):
+    return commit[:10] if commit else '(none)'
+
+
+def list_changes_(before, after):
+    removed = [x for x in before if x not in after]
+    added = [x for x in after if x not in before]
+    words = ['-' + str(x) for x in removed] + ['+' + str(x) for x in added]
+    return ' '.join(words) if words else 'reordered'
+
+
+def changes(recorded, current):
+    # what differs between two records of a build's inputs, in words
+    if recorded is None:
+        return ['not built successfully before']
+    found = []
+    if recorded.get('commit') != current['commit']:
+        found.append('commit {} -> {}'.format(
+            short_(recorded.get('commit')), short_(current['commit'])))
+    before = recorded.get('patches', {})
+    after = current['patches']
+    for name in sorted(set(before) | set(after)):
+        if name not in before:
+            found.append('patch {} added'.format(name))
+        elif name not in after:
+            found.append('patch {} removed'.format(name))
+        elif before[name] != after[name]:
+            found.append('patch {} changed ({} -> {})'.format(
+                name, before[name][:10], after[name][:10]))
+    for key in ['prebuild_params', 'build_params']:
+        if recorded.get(key, []) != current[key]:
+            found.append('{}: {}'.format(
+                key, list_changes_(recorded.get(key, []), current[key])))
+    if recorded.get('toolchain') != current['toolchain']:
+        found.append('toolchain {} -> {}'.format(recorded.get('toolchain'),
+                                                 current['toolchain']))
+    before = recorded.get('manifest', {})
+    after = current['manifest']
+    keys = sorted(k for k in set(before) | set(after)
+                  if before.get(k) != after.get(k))
+    if keys:
+        found.append('manifest entry changed: {}'.format(', '.join(keys)))
+    return found
+
+
+class Planner:
+    """Sync, configure, build and gather decisions, spawning nothing"""
+
+    def __init__(self, targets, build_matrix, vcvars=None):
+        self.targets_ = targets
+        self.matrix_ = build_matrix
+        self.vcvars_ = vcvars
+
+    def run_(self, work, out):
+        if self.vcvars_:
+            self.vcvars_.set_capture(False)
+        proc.forbid()
+        try:
+            for A in self.matrix_.archs():
+                if self.vcvars_ and not self.vcvars_.captured(A):
+                    print("(the {} vcvars environment hasn't been captured "
+                          "yet; toolchains can't be compared)".format(A),
+                          file=out)
+            work()
+        finally:
+            proc.forbid(False)
+            if self.vcvars_:
+                self.vcvars_.set_capture(True)
+
+    def plan(self, out=sys.stdout):
+        self.run_(lambda: [self.plan_one_(t, out) for t in self.targets_],
+                  out)
+
+    def explain(self, names, out=sys.stdout):
+        by_name = {t.name(): t for t in self.targets_}
+        for name in names:
+            if name not in by_name:
+                print("FATAL: No element named {}".format(name),
+                      file=sys.stderr)
+                sys.exit(2)
+        self.run_(lambda: [self.explain_one_(by_name[n], out)
+                           for n in names], out)
+
+    def current_(self, target, A, commit=None):
+        # the inputs as of commit, or HEAD as .git records it; git isn't
+        # asked, so an element that can't be read that way is reported
+        state = target.git_state()
+        if not state.exists():
+            return None, 'sources not cloned yet'
+        commit = commit or state.head()
+        if not commit:
+            return None, 'HEAD unreadable without running git'
+        try:
+            return target.inputs(A, commit), None
+        except (StepFailed, RuntimeError) as e:
+            # RuntimeError: something that would have been run
+            return None, str(e)
+
+    def sync_plan_(self, target):
+        # (what sync would do, the commit it would leave checked out)
+        state = target.git_state()
+        if not state.exists():
+            return 'clone {}'.format(target.element().source()), None
+        head = state.head()
+        if not head:
+            return 'fetch, HEAD unreadable without running git', None
+        upstream = state.upstream()
+        steps = ['fetch']
+        commit = head
+        if upstream and upstream != head:
+            steps.append('fast-forward {} -> {} (as of the last '
+                         'fetch)'.format(short_(head), short_(upstream)))
+            commit = upstream
+        else:
+            steps.append('at {}, nothing new as of the last fetch'.format(
+                         short_(head)))
+        try:
+            if commit != head or \
+                    not target.patch_state().matches(head, target.patches()):
+                steps.append('re-apply patches')
+        except StepFailed as e:
+            steps.append(str(e))
+        return ', '.join(steps), commit
+
+    def plan_one_(self, target, out):
+        print(target.name(), file=out)
+        sync, commit = self.sync_plan_(target)
+        print('  sync: {}'.format(sync), file=out)
+        builder = target.builder()
+        for A, configs in self.matrix_.units():
+            label = '{} {}'.format(A, ','.join(configs))
+            if builder is None:
+                print('  {}: no builder'.format(label), file=out)
+                continue
+            current, error = self.current_(target, A, commit)
+            if not error and target.reused(A, configs) and \
+                    all(not changes(target.recorded_inputs(A, C), current)
+                        for C in configs):
+                print("  {}: another run's build was reused, no inputs "
+                      "changed".format(label), file=out)
+                continue
+            for tree, why in builder.configure_plan(target, A, configs):
+                print('  {}: {}'.format(label, 'configure ({})'.format(
+                      ', '.join(why)) if why else
+                      'configure skipped, unchanged'), file=out)
+            for C in configs:
+                found = [error] if error else \
+                    changes(target.recorded_inputs(A, C), current)
+                print('  {} {}: {}'.format(A, C, 'build ({})'.format(
+                      '; '.join(found)) if found else
+                      'build, no inputs changed (cmake --build checks the '
+                      'files)'), file=out)
+        print('  gather (install, package): {}'.format(
+              self.gather_plan_(target)), file=out)
+
+    def gather_plan_(self, target):
+        files = target.gathered_files()
+        stale = target.stale_files()
+        missing = sum(1 for source, _ in stale if not os.path.isfile(source))
+        words = ['{} of {} outputs to copy'.format(len(stale) - missing,
+                                                   len(files))]
+        if missing:
+            words.append('{} not built yet'.format(missing))
+        return ', '.join(words)
+
+    def explain_one_(self, target, out):
+        print(target.name(), file=out)
+        if not target.git_state().exists():
+            print('  no checkout yet', file=out)
+            return
+        _, commit = self.sync_plan_(target)
+        for A in self.matrix_.archs():
+            current, error = self.current_(target, A)
+            for C in self.matrix_.configs():
+                recorded = target.recorded_inputs(A, C)
+                found = [error] if error else changes(recorded, current)
+                print('  {} {}: {}'.format(A, C, 'since the last successful '
+                      'build: ' + '; '.join(found) if found else
+                      'no inputs changed since the last successful build'),
+                      file=out)
+        if current and commit != current['commit']:
+            print('  upstream is at {} as of the last fetch; a sync would '
+                  'bring that in'.format(short_(commit)), file=out)
@@ -41,17 +41,60 @@
 
 import os
 import subprocess
+from . import phase
 
 CMD = 'c:\\windows\\system32\\cmd.exe'
 C = '/c'
 
+# outside Windows, commands are run directly rather than through cmd.exe
+SHELL = (CMD, C) if os.name == 'nt' else ()
+
 GIT = 'git'
 
+# called with each Proc as it finishes, e.g. to pass its output along
+watchers_ = []
+
+# called with each Proc as it starts, e.g. to follow its resource use
+start_watchers_ = []
+
+
+# set while planning a dry run, when nothing may be run
+forbidden_ = False
+
+
+def forbid(on=True):
+    global forbidden_
+    forbidden_ = on
+
+
+def add_watcher(watcher):
+    watchers_.append(watcher)
+
+
+def remove_watcher(watcher):
+    if watcher in watchers_:
+        watchers_.remove(watcher)
+
+
+def add_start_watcher(watcher):
+    start_watchers_.append(watcher)
+
+
+def remove_start_watcher(watcher):
+    if watcher in start_watchers_:
+        start_watchers_.remove(watcher)
+
 
 class Proc:
 
     def __init__(self, *args, consume=False, env=None, cwd=None):
+        if forbidden_:
+            raise RuntimeError("{} would have been run by a dry run".format(
+                               ' '.join(str(arg) for arg in args)))
         try:
+            self.args_ = args
+            self.cwd_ = cwd
+            self.phase_ = phase.current()
             self.lines_ = []
             self.rc_ = None
             self.consume_ = consume
@@ -60,9 +103,13 @@ class Proc:
             if cwd:
                 extras['cwd'] = cwd
             if env:
-                env.update(os.environ)
-                extras['env'] = env
+                # env is added to (and wins over) this process's environment
+                merged = dict(os.environ)
+                merged.update(env)
+                extras['env'] = merged
             self.p_ = subprocess.Popen(args, **extras)
+            for watcher in list(start_watchers_):
+                watcher(self)
         except FileNotFoundError:
             self.p_ = None
             self.rc_ = 9009
@@ -73,8 +120,22 @@ class Proc:
         if self.consume_:
             self.lines_ += self.p_.stdout.readlines()
         self.rc_ = self.p_.wait()
+        for watcher in list(watchers_):
+            watcher(self)
         return self.rc_
 
+    def args(self):
+        return self.args_
+
+    def cwd(self):
+        return self.cwd_
+
+    def pid(self):
+        return self.p_.pid if self.p_ else None
+
+    def phase(self):
+        return self.phase_
+
     def lines(self):
         if self.rc_ is None and self.consume_:
             self.lines_ += self.p_.stdout.readlines()
@@ -89,8 +150,8 @@ def cmd(*args, **kwargs):
 
 
 def proc(*args, **kwargs):
-    return Proc(CMD, C, *args, **kwargs)
+    return Proc(*SHELL, *args, **kwargs)
 
 
 def git(*args, **kwargs):
-    return Proc(CMD, C, GIT, *args, **kwargs)
+    return Proc(*SHELL, GIT, *args, **kwargs)
@@ -0,0 +1,238 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  sampler.py - Samples CPU, memory and I/O of every process tree started
+#               through maker.proc, by element, arch and phase
+#
+# #########################################################################
+
+import os
+import os.path
+import sys
+import threading
+import time
+from . import proc
+
+PROC = '/proc'
+IDLE_CORES = 0.1
+
+CLK_TCK = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+PAGE_KB = os.sysconf('SC_PAGE_SIZE') // 1024 if hasattr(os, 'sysconf') \
+    else 4
+
+
+def available():
+    return os.path.isfile(os.path.join(PROC, 'self', 'stat'))
+
+
+def read_stat_(pid):
+    # (ppid, cpu ticks including reaped children, rss in kB)
+    with open(os.path.join(PROC, pid, 'stat'), 'rb') as f:
+        fields = f.read().rsplit(b')', 1)[1].split()
+    ticks = sum(int(x) for x in fields[11:15])
+    return fields[1].decode(), ticks, int(fields[21]) * PAGE_KB
+
+
+def read_io_(pid):
+    read_bytes = write_bytes = 0
+    try:
+        with open(os.path.join(PROC, pid, 'io'), 'rb') as f:
+            for line in f:
+                if line.startswith(b'read_bytes:'):
+                    read_bytes = int(line.split()[1])
+                elif line.startswith(b'write_bytes:'):
+                    write_bytes = int(line.split()[1])
+    except OSError:
+        pass
+    return read_bytes, write_bytes
+
+
+class Sampler:
+
+    def __init__(self, out_path, interval=0.5):
+        self.out_path_ = out_path
+        self.interval_ = interval
+        self.lock_ = threading.Lock()
+        self.stop_ = threading.Event()
+        self.roots_ = {}
+        self.last_ = {}
+        self.ticks_ = []
+        self.thread_ = None
+        self.out_ = None
+        self.t0_ = None
+
+    def start(self):
+        self.out_ = open(self.out_path_, 'w')
+        print('t,element,arch,phase,pid,cpu,rss_kb,read_kb,write_kb',
+              file=self.out_)
+        self.t0_ = time.monotonic()
+        proc.add_start_watcher(self.started_)
+        self.thread_ = threading.Thread(target=self.loop_, daemon=True)
+        self.thread_.start()
+
+    def stop(self):
+        proc.remove_start_watcher(self.started_)
+        self.stop_.set()
+        self.thread_.join()
+        self.out_.close()
+        return SampleReport(self.ticks_, self.interval_)
+
+    def peaks(self):
+        # (element, arch, phase) -> the most memory its processes held at
+        # once, in kB
+        peaks = {}
+        for _, tick in list(self.ticks_):
+            at_once = {}
+            for element, arch, name, cpu, rss in tick:
+                key = (element, arch, name)
+                at_once[key] = at_once.get(key, 0) + rss
+            for key, rss in at_once.items():
+                peaks[key] = max(peaks.get(key, 0), rss)
+        return peaks
+
+    def started_(self, p):
+        tag = p.phase() if p.phase() else ('', '', 'other')
+        with self.lock_:
+            self.roots_[str(p.pid())] = tag
+
+    def loop_(self):
+        last = time.monotonic()
+        while not self.stop_.wait(self.interval_):
+            now = time.monotonic()
+            self.sample_(now - self.t0_, now - last)
+            last = now
+
+    def sample_(self, t, elapsed):
+        stats = {}
+        children = {}
+        for pid in os.listdir(PROC):
+            if not pid.isdigit():
+                continue
+            try:
+                stats[pid] = read_stat_(pid)
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(stats[pid][0], []).append(pid)
+
+        with self.lock_:
+            roots = dict(self.roots_)
+            for pid in roots:
+                if pid not in stats:
+                    del self.roots_[pid]
+        tick = []
+        for root, (element, arch, name) in roots.items():
+            if root not in stats:
+                self.last_.pop(root, None)
+                continue
+            tree = [root]
+            for pid in tree:
+                tree += children.get(pid, [])
+            ticks = sum(stats[pid][1] for pid in tree)
+            rss = sum(stats[pid][2] for pid in tree)
+            io = [read_io_(pid) for pid in tree]
+            read_kb = sum(r for r, _ in io) // 1024
+            write_kb = sum(w for _, w in io) // 1024
+            before = self.last_.get(root, (ticks, read_kb, write_kb))
+            self.last_[root] = (ticks, read_kb, write_kb)
+            cpu = (ticks - before[0]) / CLK_TCK / elapsed if elapsed else 0
+            tick.append((element, arch, name, cpu, rss))
+            print('{:.2f},{},{},{},{},{:.2f},{},{},{}'.format(
+                  t, element or '', arch or '', name, root, cpu, rss,
+                  read_kb - before[1], write_kb - before[2]), file=self.out_)
+        self.ticks_.append((t, tick))
+
+
+class SampleReport:
+
+    def __init__(self, ticks, interval):
+        self.ticks_ = ticks
+        self.interval_ = interval
+
+    def print(self, out=sys.stdout):
+        if not self.ticks_:
+            print("No samples were taken", file=out)
+            return
+        cores = os.cpu_count() or 1
+        busy = [sum(s[3] for s in tick) for _, tick in self.ticks_]
+        print("Resource use, {} samples every {}s on {} cores".format(
+              len(self.ticks_), self.interval_, cores), file=out)
+        print("  overall utilization {:.0%}".format(
+              sum(busy) / len(busy) / cores), file=out)
+
+        phases = {}
+        for _, tick in self.ticks_:
+            rss_by_phase = {}
+            for element, arch, name, cpu, rss in tick:
+                p = phases.setdefault(name, {'ticks': 0, 'cpu': 0.0,
+                                             'peak': 0, 'at': None})
+                rss_by_phase.setdefault(name, [0, []])
+                rss_by_phase[name][0] += rss
+                rss_by_phase[name][1].append('{} {}'.format(
+                    element, arch) if arch else element)
+                p['cpu'] += cpu
+            for name, (rss, who) in rss_by_phase.items():
+                phases[name]['ticks'] += 1
+                if rss > phases[name]['peak']:
+                    phases[name]['peak'] = rss
+                    phases[name]['at'] = ', '.join(who)
+        for name in sorted(phases):
+            p = phases[name]
+            print("  {:<10} {:7.1f}s  {:5.1f} cores avg ({:.0%})  peak RSS "
+                  "{:,} MB ({})".format(
+                      name, p['ticks'] * self.interval_,
+                      p['cpu'] / p['ticks'], p['cpu'] / p['ticks'] / cores,
+                      p['peak'] // 1024, p['at']), file=out)
+
+        gaps = []
+        start = None
+        for (t, _), b in zip(self.ticks_, busy):
+            if b < IDLE_CORES:
+                start = t if start is None else start
+            elif start is not None:
+                gaps.append((start, t))
+                start = None
+        if start is not None:
+            gaps.append((start, self.ticks_[-1][0]))
+        gaps = [(a, b) for a, b in gaps if b - a >= self.interval_]
+        if gaps:
+            longest = max(gaps, key=lambda g: g[1] - g[0])
+            print("  idle (under {} cores busy): {:.1f}s in {} gap(s), "
+                  "longest {:.1f}s from {:.1f}s".format(
+                      IDLE_CORES, sum(b - a for a, b in gaps), len(gaps),
+                      longest[1] - longest[0], longest[0]), file=out)
+        else:
+            print("  no idle gaps", file=out)
@@ -0,0 +1,186 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  schedule.py - Runs independent pieces of build work concurrently
+#
+# #########################################################################
+
+import os
+import threading
+
+
+def default_jobs():
+    return os.cpu_count() or 1
+
+
+def physical_memory_mb():
+    # None when it can't be told
+    if os.name == 'nt':
+        import ctypes
+
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [('dwLength', ctypes.c_ulong),
+                        ('dwMemoryLoad', ctypes.c_ulong),
+                        ('ullTotalPhys', ctypes.c_ulonglong),
+                        ('ullAvailPhys', ctypes.c_ulonglong),
+                        ('ullTotalPageFile', ctypes.c_ulonglong),
+                        ('ullAvailPageFile', ctypes.c_ulonglong),
+                        ('ullTotalVirtual', ctypes.c_ulonglong),
+                        ('ullAvailVirtual', ctypes.c_ulonglong),
+                        ('ullAvailExtendedVirtual', ctypes.c_ulonglong)]
+        status = MemoryStatus()
+        status.dwLength = ctypes.sizeof(MemoryStatus)
+        if not ctypes.windll.kernel32.GlobalMemoryStatusEx(
+                ctypes.byref(status)):
+            return None
+        return status.ullTotalPhys // (1024 * 1024)
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') // \
+            (1024 * 1024)
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+class Job:
+
+    def __init__(self, label, work, memory=None, weight=1, group=None,
+                 group_limit=None):
+        # memory: expected peak MB (None if not known); weight: how many
+        # of the -j slots it fills; at most group_limit jobs of a group
+        # run at once
+        self.label_ = label
+        self.work_ = work
+        self.memory_ = memory
+        self.weight_ = weight
+        self.group_ = group
+        self.group_limit_ = group_limit
+
+    def label(self):
+        return self.label_
+
+    def memory(self):
+        return self.memory_
+
+    def weight(self):
+        return self.weight_
+
+    def group(self):
+        return self.group_
+
+    def group_limit(self):
+        return self.group_limit_
+
+    def run(self):
+        return self.work_()
+
+
+class Scheduler:
+
+    def __init__(self, jobs=None, verbose=False, memory_budget=None):
+        self.jobs_ = jobs if jobs else default_jobs()
+        self.v_ = verbose
+        self.budget_ = memory_budget
+
+    def jobs(self):
+        return self.jobs_
+
+    def admits_(self, job, running):
+        # anything goes when nothing is running, or a job bigger than the
+        # whole budget would never start
+        if not running:
+            return True
+        slots = sum(j.weight() for j in running)
+        if slots + min(job.weight(), self.jobs_) > self.jobs_:
+            return False
+        if self.budget_ and job.memory():
+            used = sum(j.memory() or 0 for j in running)
+            if used + job.memory() > self.budget_:
+                return False
+        if job.group() is not None and job.group_limit():
+            together = sum(1 for j in running if j.group() == job.group())
+            if together >= job.group_limit():
+                return False
+        return True
+
+    def run(self, jobs):
+        # the jobs handed in together must not depend on each other; the
+        # first failure (usually a sys.exit from a failed step) is re-raised
+        # once the jobs already running have finished. Jobs start in the
+        # order given, but one that doesn't fit yet lets later ones by.
+        if not jobs:
+            return
+        waiting = list(jobs)
+        running = []
+        failures = []
+        threads = []
+        changed = threading.Condition()
+
+        def work(job):
+            try:
+                self.run_one_(job)
+            except BaseException as e:
+                with changed:
+                    failures.append(e)
+            finally:
+                with changed:
+                    running.remove(job)
+                    changed.notify_all()
+
+        with changed:
+            while waiting or running:
+                if failures:
+                    waiting = []
+                for job in list(waiting):
+                    if self.admits_(job, running):
+                        waiting.remove(job)
+                        running.append(job)
+                        threads.append(threading.Thread(
+                            target=work, args=(job,), daemon=True))
+                        threads[-1].start()
+                if running:
+                    changed.wait()
+        for thread in threads:
+            thread.join()
+        if failures:
+            raise failures[0]
+
+    def run_one_(self, job):
+        if self.v_:
+            print("Starting {}".format(job.label()))
+        job.run()
+        if self.v_:
+            print("Finished {}".format(job.label()))
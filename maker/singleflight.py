@@ -0,0 +1,223 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  singleflight.py - One build of the same inputs at a time across make.py runs
+#                  sharing a cache, the others reusing its result
+#
+# #########################################################################
+
+import json
+import os
+import os.path
+import shutil
+import socket
+import threading
+import time
+from . import dirs
+
+mkdir = dirs.mkdir_
+
+# a holder touches its lock this often; a lock untouched for STALE seconds
+# was left by a run that died (process ids aren't checked: they don't carry
+# across hosts sharing a cache, nor mean much on Windows)
+HEARTBEAT = 5
+STALE = 30
+POLL = 1
+# results are only reused this long after being built
+KEEP = 60 * 60
+
+RESULT_FILE = 'result.json'
+
+
+class Flight:
+    """A held lock, kept fresh by a heartbeat until released"""
+
+    def __init__(self, path):
+        self.path_ = path
+        self.stop_ = threading.Event()
+        self.thread_ = threading.Thread(target=self.beat_, daemon=True)
+        self.thread_.start()
+
+    def beat_(self):
+        while not self.stop_.wait(HEARTBEAT):
+            try:
+                os.utime(self.path_)
+            except OSError:
+                pass
+
+    def release(self):
+        self.stop_.set()
+        self.thread_.join()
+        try:
+            os.remove(self.path_)
+        except OSError:
+            pass
+
+
+class SingleFlight:
+    """Locks and results in the cache, one per build's input fingerprint"""
+
+    def __init__(self, cache_dir):
+        self.dir_ = os.path.join(cache_dir, 'single-flight')
+        self.token_ = '{}:{}'.format(socket.gethostname(), os.getpid())
+        self.pruned_ = False
+
+    def lock_path_(self, key):
+        return os.path.join(self.dir_, key + '.lock')
+
+    def result_dir_(self, key):
+        return os.path.join(self.dir_, key)
+
+    def prune_(self):
+        # results too old to reuse, and anything else left that long
+        if self.pruned_:
+            return
+        self.pruned_ = True
+        now = time.time()
+        for name in os.listdir(self.dir_):
+            path = os.path.join(self.dir_, name)
+            try:
+                old = now - os.path.getmtime(path) > KEEP
+            except OSError:
+                continue
+            if old and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            elif old:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def result_(self, key):
+        path = os.path.join(self.result_dir_(key), RESULT_FILE)
+        try:
+            if time.time() - os.path.getmtime(path) > KEEP:
+                return None
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def acquire_(self, key):
+        path = self.lock_path_(key)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            if self.break_stale_(path):
+                return self.acquire_(key)
+            return None
+        with os.fdopen(fd, 'w') as f:
+            f.write(self.token_)
+        return Flight(path)
+
+    def break_stale_(self, path):
+        # renaming is atomic, so only one waiter takes a stale lock away;
+        # one that turns out to have been fresh after all is put back
+        try:
+            if time.time() - os.path.getmtime(path) <= STALE:
+                return False
+            aside = '{}.{}'.format(path, self.token_.replace(':', '-'))
+            os.rename(path, aside)
+        except OSError:
+            return False
+        try:
+            if time.time() - os.path.getmtime(aside) <= STALE and \
+                    not os.path.exists(path):
+                os.rename(aside, path)
+                return False
+            os.remove(aside)
+        except OSError:
+            pass
+        return True
+
+    def holder_(self, key):
+        try:
+            with open(self.lock_path_(key), 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def run(self, key, label, build, publish, reuse):
+        # build() unless the same inputs are, or just were, built by another
+        # run: then wait for it and reuse() its result. publish(dir) leaves
+        # a result to reuse, returning None if it can't be shared.
+        mkdir(self.dir_)
+        self.prune_()
+        told = False
+        while True:
+            result = self.result_(key)
+            if result is not None:
+                reuse(self.result_dir_(key), result)
+                print("Reused {} as built by {}".format(label,
+                      result.get('by', 'another run')))
+                return
+            flight = self.acquire_(key)
+            if flight is not None:
+                try:
+                    # it may have finished between looking and locking
+                    result = self.result_(key)
+                    if result is not None:
+                        continue
+                    build()
+                    self.publish_(key, publish)
+                finally:
+                    flight.release()
+                return
+            if not told:
+                print("Waiting for {}, being built by {}".format(
+                      label, self.holder_(key) or 'another run'))
+                told = True
+            time.sleep(POLL)
+
+    def publish_(self, key, publish):
+        # put together aside, then renamed into place whole
+        staging = '{}.{}'.format(self.result_dir_(key),
+                                 self.token_.replace(':', '-'))
+        shutil.rmtree(staging, ignore_errors=True)
+        mkdir(staging)
+        result = publish(staging)
+        if result is None:
+            shutil.rmtree(staging, ignore_errors=True)
+            return
+        result['by'] = self.token_
+        with open(os.path.join(staging, RESULT_FILE), 'w') as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        shutil.rmtree(self.result_dir_(key), ignore_errors=True)
+        try:
+            os.rename(staging, self.result_dir_(key))
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
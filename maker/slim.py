@@ -0,0 +1,122 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  slim.py - Prunes the intermediates out of build trees whose outputs have
+#             been gathered
+#
+# #########################################################################
+
+import os
+import os.path
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# objects, incremental-link and precompiled-header state, MSBuild's
+# tracking; the CMake cache, the configure stamp, generated headers and the
+# deliverables themselves all stay. So do .pdb files: a DLL's sits next to
+# it, and a static library built with /Zi refers to the compiler's PDB in
+# its tree for the debug information of everything it holds
+PRUNED_SUFFIXES = ('.obj', '.o', '.ilk', '.iobj', '.ipdb', '.idb',
+                   '.pch', '.ipch', '.res', '.exp', '.lastbuildstate')
+PRUNED_DIRS = ('.tlog', '.ipch')
+
+
+def prune_tree(tree):
+    # returns how many files and bytes went
+    files = size = 0
+    for here, subdirs, names in os.walk(tree):
+        for sub in list(subdirs):
+            if sub.lower().endswith(PRUNED_DIRS):
+                subdirs.remove(sub)
+                path = os.path.join(here, sub)
+                for inner, _, inner_names in os.walk(path):
+                    for name in inner_names:
+                        try:
+                            size += os.path.getsize(os.path.join(inner, name))
+                            files += 1
+                        except OSError:
+                            pass
+                shutil.rmtree(path, ignore_errors=True)
+        for name in names:
+            if name.lower().endswith(PRUNED_SUFFIXES):
+                path = os.path.join(here, name)
+                try:
+                    size += os.path.getsize(path)
+                    os.remove(path)
+                    files += 1
+                except OSError:
+                    pass
+    return files, size
+
+
+class Pruner:
+    """Prunes build trees on a background thread while the build goes on"""
+
+    def __init__(self, verbose=False):
+        self.v_ = verbose
+        self.pool_ = ThreadPoolExecutor(max_workers=1)
+        self.lock_ = threading.Lock()
+        self.pending_ = []
+        self.pruned_ = []
+
+    def prune(self, name, tree):
+        if os.path.isdir(tree):
+            self.pending_.append(self.pool_.submit(self.prune_, name, tree))
+
+    def prune_(self, name, tree):
+        files, size = prune_tree(tree)
+        with self.lock_:
+            self.pruned_.append((name, files, size))
+
+    def wait(self, out=sys.stdout):
+        for pending in self.pending_:
+            pending.result()
+        self.pool_.shutdown()
+        # reported here, not from the thread, to keep the output whole
+        if self.v_:
+            for name, files, size in self.pruned_:
+                print("Pruned {} intermediate file(s), {:.1f} MB, from "
+                      "{}".format(files, size / (1024 * 1024), name),
+                      file=out)
+        if self.pending_:
+            print("Slim: pruned {} intermediate file(s), {:.1f} MB".format(
+                  sum(p[1] for p in self.pruned_),
+                  sum(p[2] for p in self.pruned_) / (1024 * 1024)), file=out)
+        self.pending_ = []
+        self.pruned_ = []
@@ -0,0 +1,295 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  snapshot.py - Write/restore a portable workspace snapshot: git bundles of
+#                the sources plus, optionally, the configured build trees
+#
+# #########################################################################
+
+import json
+import os
+import os.path
+import shutil
+import sys
+import tarfile
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from . import dirs
+from . import proc
+
+mkdir = dirs.mkdir_
+
+SNAPSHOT_FORMAT = 1
+MANIFEST = 'snapshot.json'
+SOURCES = 'sources'
+BUILDS = 'builds'
+
+
+def default_jobs():
+    return os.cpu_count() or 1
+
+
+def unsafe_member_(archive, dest):
+    # the first member that isn't a plain file or directory, or would land
+    # outside dest; a snapshot may have come from anywhere
+    root = os.path.realpath(dest)
+    for member in archive.getmembers():
+        if not (member.isfile() or member.isdir()) or \
+                os.path.isabs(member.name):
+            return member.name
+        try:
+            path = os.path.realpath(os.path.join(root, member.name))
+            if os.path.commonpath([root, path]) != root:
+                return member.name
+        except ValueError:
+            # another drive
+            return member.name
+    return None
+
+
+def extract_(archive, dest):
+    # the member it wouldn't unpack, or None once it's unpacked
+    bad = unsafe_member_(archive, dest)
+    if bad is not None:
+        return bad
+    if hasattr(tarfile, 'data_filter'):
+        archive.extractall(dest, filter='data')
+    else:
+        archive.extractall(dest)
+    return None
+
+
+class Snapshot:
+
+    def __init__(self, maker_dirs, targets, jobs=None, verbose=False):
+        self.dirs_ = maker_dirs
+        self.targets_ = targets
+        self.jobs_ = jobs if jobs else default_jobs()
+        self.v_ = verbose
+
+    def trees_(self):
+        return [os.path.normcase(self.dirs_.source_dir()),
+                os.path.normcase(self.dirs_.build_dir())]
+
+    def write(self, path, with_builds=False):
+        mkdir(self.dirs_.build_root())
+        work = tempfile.mkdtemp(prefix='snapshot-',
+                                dir=self.dirs_.build_root())
+        try:
+            manifest = {'format': SNAPSHOT_FORMAT,
+                        'root': self.dirs_.root(),
+                        'trees': self.trees_(),
+                        'sources': {},
+                        'builds': []}
+            mkdir(os.path.join(work, SOURCES))
+            with ThreadPoolExecutor(max_workers=self.jobs_) as pool:
+                bundles = [pool.submit(self.bundle_, t, work)
+                           for t in self.targets_]
+                trees = []
+                if with_builds:
+                    for t in self.targets_:
+                        for A in self.build_arches_(t):
+                            trees.append((t.name(), A, pool.submit(
+                                self.pack_tree_, t, A, work)))
+                for b in bundles:
+                    entry = b.result()
+                    if entry is not None:
+                        manifest['sources'][entry['name']] = entry
+                for name, A, tree in trees:
+                    tree.result()
+                    manifest['builds'].append([name, A])
+
+            with open(os.path.join(work, MANIFEST), 'w') as m:
+                json.dump(manifest, m, indent=2)
+            # the parts are already compressed; the outer archive only
+            # gathers them into one file
+            with tarfile.open(path, 'w') as outer:
+                for entry in sorted(os.listdir(work)):
+                    outer.add(os.path.join(work, entry), arcname=entry)
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+        print("Snapshot of {} source(s) and {} build tree(s) written to {}"
+              .format(len(manifest['sources']), len(manifest['builds']),
+                      path))
+
+    def restore(self, path, with_builds=True):
+        if not os.path.isfile(path):
+            print("FATAL: No snapshot found at {}".format(path),
+                  file=sys.stderr)
+            sys.exit(2)
+        mkdir(self.dirs_.source_dir())
+        mkdir(self.dirs_.build_dir())
+        work = tempfile.mkdtemp(prefix='restore-', dir=self.dirs_.build_root())
+        try:
+            with tarfile.open(path, 'r') as outer:
+                bad = extract_(outer, work)
+            if bad is not None:
+                print("FATAL: {} in snapshot {} is not a file or directory "
+                      "inside it".format(bad, path), file=sys.stderr)
+                sys.exit(2)
+            with open(os.path.join(work, MANIFEST), 'r') as m:
+                manifest = json.load(m)
+            if manifest.get('format') != SNAPSHOT_FORMAT:
+                print("FATAL: Snapshot {} has unknown format {}".format(
+                      path, manifest.get('format')), file=sys.stderr)
+                sys.exit(2)
+
+            builds = manifest['builds'] if with_builds else []
+            trees = manifest.get('trees')
+            if builds and (trees != self.trees_() if trees else
+                           os.path.normcase(manifest['root']) !=
+                           os.path.normcase(self.dirs_.root())):
+                # CMake caches carry absolute paths, they can't be moved
+                print("WARNING: snapshot was taken with its sources and build "
+                      "trees in {}, not restoring its build trees here".format(
+                          ' and '.join(trees) if trees else manifest['root']),
+                      file=sys.stderr)
+                builds = []
+
+            by_name = {t.name(): t for t in self.targets_}
+            with ThreadPoolExecutor(max_workers=self.jobs_) as pool:
+                jobs = []
+                for name in manifest['sources']:
+                    if name in by_name:
+                        jobs.append(pool.submit(
+                            self.unbundle_, by_name[name],
+                            manifest['sources'][name], work))
+                for name, A in builds:
+                    if name in by_name:
+                        jobs.append(pool.submit(self.unpack_tree_,
+                                                by_name[name], A, work))
+                failed = [j for j in jobs if not j.result()]
+        finally:
+            shutil.rmtree(work, ignore_errors=True)
+        if failed:
+            print("FATAL: {} part(s) of snapshot {} could not be restored"
+                  .format(len(failed), path), file=sys.stderr)
+            sys.exit(3)
+        print("Restored {} source(s) and {} build tree(s) from {}".format(
+              len(manifest['sources']), len(builds), path))
+
+    def build_arches_(self, target):
+        # an arch tree is configured directly (multi-config generators) or
+        # holds one configured tree per build type
+        def configured(A):
+            tree = os.path.join(target.build_dir(), A)
+            return os.path.isfile(os.path.join(tree, 'CMakeCache.txt')) or \
+                any(os.path.isfile(os.path.join(tree, C, 'CMakeCache.txt'))
+                    for C in os.listdir(tree) if
+                    os.path.isdir(os.path.join(tree, C)))
+
+        if not os.path.isdir(target.build_dir()):
+            return []
+        return sorted(A for A in os.listdir(target.build_dir()) if
+                      os.path.isdir(os.path.join(target.build_dir(), A)) and
+                      configured(A))
+
+    def bundle_(self, target, work):
+        src = target.source_dir()
+        if not target.git_state().exists():
+            if self.v_:
+                print("No checkout for {}, not in snapshot".format(
+                      target.name()))
+            return None
+        commit = target.head()
+        branch = target.git_state().branch() or 'HEAD'
+        bundle = os.path.join(work, SOURCES, target.name() + '.bundle')
+        refs = ['HEAD'] if branch in (None, 'HEAD') else ['HEAD', branch]
+        p = proc.git('bundle', 'create', bundle, *refs, consume=True,
+                     cwd=src)
+        if not p.ok():
+            print("FATAL: git bundle failed for {}".format(target.name()),
+                  file=sys.stderr)
+            sys.exit(p.rc())
+        if self.v_:
+            print("Bundled {} at {}".format(target.name(), commit))
+        return {'name': target.name(), 'commit': commit, 'branch': branch,
+                'patches': list(target.element().patches())}
+
+    def pack_tree_(self, target, A, work):
+        dest = os.path.join(work, BUILDS, target.name())
+        mkdir(dest)
+        with tarfile.open(os.path.join(dest, A + '.tar.gz'), 'w:gz',
+                          compresslevel=6) as tree:
+            tree.add(os.path.join(target.build_dir(), A), arcname=A)
+        if self.v_:
+            print("Packed build tree {}/{}".format(target.name(), A))
+
+    def unbundle_(self, target, entry, work):
+        src = target.source_dir()
+        if os.path.isdir(src):
+            print("{} already has a checkout, leaving it alone".format(
+                  target.name()))
+            return True
+        bundle = os.path.join(work, SOURCES, target.name() + '.bundle')
+        checkout = ('-C', src, 'checkout', '-q', entry['commit'])
+        if entry['branch'] not in (None, 'HEAD'):
+            checkout = ('-C', src, 'checkout', '-q', '-B', entry['branch'],
+                        entry['commit'])
+        steps = [('clone', '-q', bundle, src), checkout,
+                 ('-C', src, 'remote', 'set-url', 'origin',
+                  target.element().source())]
+        for step in steps:
+            p = proc.git(*step, consume=True, cwd=self.dirs_.source_dir())
+            if not p.ok():
+                print("ERROR: git {} failed restoring {}".format(
+                      step[0] if step[0] != '-C' else step[2],
+                      target.name()), file=sys.stderr)
+                return False
+        target.apply_patches()
+        if self.v_:
+            print("Restored {} at {}".format(target.name(), entry['commit']))
+        return True
+
+    def unpack_tree_(self, target, A, work):
+        dest = target.build_dir()
+        if os.path.isdir(os.path.join(dest, A)):
+            print("{}/{} already has a build tree, leaving it alone".format(
+                  target.name(), A))
+            return True
+        mkdir(dest)
+        archive = os.path.join(work, BUILDS, target.name(), A + '.tar.gz')
+        with tarfile.open(archive, 'r:gz') as tree:
+            bad = extract_(tree, dest)
+        if bad is not None:
+            print("ERROR: {} in the {}/{} build tree is not a file or "
+                  "directory inside it".format(bad, target.name(), A),
+                  file=sys.stderr)
+            return False
+        if self.v_:
+            print("Restored build tree {}/{}".format(target.name(), A))
+        return True
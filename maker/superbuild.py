@@ -0,0 +1,222 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  superbuild.py - The manifests as one generated CMake project of
+#                ExternalProject steps, built natively per arch
+#
+# #########################################################################
+
+import os
+import os.path
+from . import dirs
+from . import fileapi
+from . import phase
+from . import proc
+from .target import StepFailed
+
+mkdir = dirs.mkdir_
+
+TREE_VAR = 'GTK_MSVC_TREE'
+
+HEAD = '''# generated by make.py superbuild; changes are overwritten
+cmake_minimum_required(VERSION 3.15)
+project(gtk_msvc_superbuild NONE)
+include(ExternalProject)
+
+get_property(multi_config GLOBAL PROPERTY GENERATOR_IS_MULTI_CONFIG)
+if(NOT multi_config)
+  set(build_type_arg -DCMAKE_BUILD_TYPE=${CMAKE_BUILD_TYPE})
+endif()
+'''
+
+
+def escape_(arg):
+    # for a CMake quoted argument; ; is kept from splitting lists
+    arg = str(arg).replace('\\', '\\\\').replace('"', '\\"')
+    return arg.replace('$', '\\$').replace(';', '$<SEMICOLON>')
+
+
+def quote_(arg):
+    return '"{}"'.format(escape_(arg))
+
+
+def path_(path):
+    return escape_(path.replace('\\', '/'))
+
+
+class Superbuild:
+    """Generates the superbuild project and builds it, a tree per arch"""
+
+    def __init__(self, maker_dirs, targets, build_matrix, depends, vcvars,
+                 jobs=None, verbose=False):
+        self.dirs_ = maker_dirs
+        self.targets_ = targets
+        self.matrix_ = build_matrix
+        self.depends_ = depends
+        self.vcvars_ = vcvars
+        self.jobs_ = jobs
+        self.v_ = verbose
+
+    def source_dir(self):
+        return os.path.join(self.dirs_.build_root(), 'superbuild')
+
+    def tree_dir_(self, A, C=None):
+        if C is None:
+            return os.path.join(self.dirs_.build_dir(), '.superbuild', A)
+        return os.path.join(self.dirs_.build_dir(), '.superbuild', A, C)
+
+    def base_env_(self, A):
+        return self.vcvars_.env(A) if self.vcvars_ else None
+
+    def env_(self, target):
+        # what the element adds to each arch's environment, where the arches
+        # agree; it's set around each of its builds
+        extra = None
+        for A in self.matrix_.archs():
+            base = self.base_env_(A) or {}
+            here = {k: v for k, v in (target.env(A) or {}).items()
+                    if base.get(k) != v}
+            extra = here if extra is None else \
+                {k: v for k, v in extra.items() if here.get(k) == v}
+        return extra or {}
+
+    def step_(self, target):
+        # one project serves every arch: which tree is being built comes
+        # from the tree variable
+        element = target.element()
+        names = set(t.name() for t in self.targets_)
+        lines = ['ExternalProject_Add({}'.format(target.name()),
+                 '  SOURCE_DIR "{}"'.format(path_(target.source_dir()))]
+        if element.script_path() is not None:
+            lines.append('  SOURCE_SUBDIR "{}"'.format(
+                         path_(element.script_path())))
+        lines += [
+            '  PREFIX "${{CMAKE_BINARY_DIR}}/{}"'.format(target.name()),
+            '  BINARY_DIR "{}/${{{}}}"'.format(path_(target.build_dir()),
+                                               TREE_VAR),
+            '  DOWNLOAD_COMMAND ""',
+            '  UPDATE_COMMAND ""',
+            '  PATCH_COMMAND ""',
+            '  INSTALL_COMMAND ""',
+            '  BUILD_ALWAYS 1']
+        params = list(element.prebuild_params())
+        for profile in target.profiles():
+            params += profile.prebuild_params()
+        if target.compiler_cache():
+            params += target.compiler_cache().prebuild_params()
+        lines.append('  CMAKE_ARGS ${build_type_arg}')
+        lines += ['    {}'.format(quote_(p)) for p in params]
+        env = ['{}={}'.format(k, v) for k, v in
+               sorted(self.env_(target).items())]
+        prefix = ['${CMAKE_COMMAND}', '-E', 'env'] + \
+            [quote_(e) for e in env] if env else []
+        build = []
+        for profile in target.profiles():
+            build += profile.build_params()
+        word = 'BUILD_COMMAND'
+        for t in element.targets() or [None]:
+            command = prefix + ['${CMAKE_COMMAND}', '--build', '<BINARY_DIR>',
+                                '--config', '$<CONFIG>']
+            if t is not None:
+                command += ['-t', quote_(t)]
+            command += [quote_(p) for p in build]
+            lines.append('  {} {}'.format(word, ' '.join(command)))
+            word = 'COMMAND'
+        depends = [d for d in self.depends_(target) if d in names]
+        if depends:
+            lines.append('  DEPENDS {}'.format(' '.join(depends)))
+        return '\n'.join(lines) + ')\n'
+
+    def generate(self):
+        # elements are written in level order, so DEPENDS names are defined
+        mkdir(self.source_dir())
+        text = HEAD + ''.join('\n' + self.step_(t) for t in self.targets_)
+        path = os.path.join(self.source_dir(), 'CMakeLists.txt')
+        before = None
+        if os.path.isfile(path):
+            with open(path, 'r') as f:
+                before = f.read()
+        if text != before:
+            with open(path, 'w') as f:
+                f.write(text)
+        return path
+
+    def run(self):
+        self.generate()
+        for A, configs in self.matrix_.units():
+            self.build_(A, configs)
+
+    def build_(self, A, configs):
+        trees = [(self.tree_dir_(A), configs[0], A)] \
+            if self.matrix_.multi_config() else \
+            [(self.tree_dir_(A, C), C, '{}/{}'.format(A, C)) for C in configs]
+        for t in self.targets_:
+            for C in configs:
+                tree = t.builder().tree_dir(t, A, C)
+                mkdir(tree)
+                fileapi.request(tree)
+        env = self.base_env_(A)
+        with phase.phase('superbuild', A, 'build'):
+            for tree, C, sub in trees:
+                mkdir(tree)
+                params = ['-S', self.source_dir(), '-B', tree,
+                          '-D{}={}'.format(TREE_VAR, sub)]
+                if self.matrix_.generator():
+                    params += ['-G', self.matrix_.generator()]
+                if self.matrix_.multi_config():
+                    params += ['-A', A]
+                else:
+                    params += ['-DCMAKE_BUILD_TYPE={}'.format(C)]
+                p = proc.proc('cmake', *params, env=env, consume=True)
+                if not p.ok():
+                    raise StepFailed("CMake parsing failed for the superbuild "
+                                     "({})".format(A), p.rc())
+                for C in configs if self.matrix_.multi_config() else [C]:
+                    if self.v_:
+                        print("Superbuild {} {}".format(A, C))
+                    p = proc.proc('cmake', '--build', tree, '--config', C,
+                                  '--parallel',
+                                  str(self.jobs_ or os.cpu_count()),
+                                  env=env, consume=True)
+                    if not p.ok():
+                        raise StepFailed("the superbuild failed for {} "
+                                         "{}".format(A, C), p.rc())
+        for t in self.targets_:
+            for C in configs:
+                fileapi.index(t.builder().tree_dir(t, A, C),
+                              t.element().targets())
+            t.record_inputs(A, configs)
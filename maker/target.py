@@ -39,51 +39,173 @@
 #
 # #########################################################################
 
+import copy
+import hashlib
+import json
 import os
 import os.path
 import shutil
-import sys
 from . import dirs
+from . import fileapi
+from . import gitstate
+from . import history
+from . import matrix
 from . import parts
+from . import patcher
+from . import phase
 from . import proc
 
 Element = parts.Element
 Proc = proc.Proc
 mkdir = dirs.mkdir_
 
-ARCH_Win32 = "Win32"
-ARCH_X64 = "x64"
+ARCHS = matrix.ARCHS
+BUILD_RELEASE = matrix.BUILD_RELEASE
 
-ARCHS = [ARCH_Win32, ARCH_X64]
+# what a tree was last configured with, so an unchanged one isn't again
+CONFIGURE_STAMP = '.gtk-msvc-configure.json'
+STAMP_WORDS = {'params': 'configure parameters', 'env': 'environment',
+               'toolchain': 'toolchain'}
+# what the last successful build of an arch was made from
+INPUTS_FILE = '.gtk-msvc-inputs-{}.json'
+# the deliverables another run's build left, when that's what's in the tree
+REUSED_FILE = '.gtk-msvc-reused-{}.json'
 
-BUILD_RELEASE = "Release"
+
+class StepFailed(Exception):
+    """A step of one element's sync or build failing"""
+
+    def __init__(self, message, rc=1):
+        super().__init__(message)
+        self.rc_ = rc if rc else 1
+
+    def rc(self):
+        return self.rc_
+
+
+def split_path_(rel):
+    # manifest paths are written Windows-style
+    return [part for part in rel.replace('\\', '/').split('/') if part]
+
+
+def for_config(rel, config):
+    # deliverables are listed as built for Release; other configurations
+    # land in the same place with the configuration's name in that slot
+    return os.path.join(*[config if part == BUILD_RELEASE else part
+                          for part in split_path_(rel)])
+
+
+def same_stat_(source, copy):
+    try:
+        a, b = os.stat(source), os.stat(copy)
+    except OSError:
+        return False
+    return a.st_size == b.st_size and a.st_mtime_ns == b.st_mtime_ns
 
 
 class Builder:
 
-    def __init__(self, element):
-        self.builder_name_ = element_.builder_name
-        self.prebuild_params_ = element_.prebuild_params()
+    def __init__(self, element, build_matrix):
+        self.builder_name_ = element.builder_name()
+        self.prebuild_params_ = element.prebuild_params()
+        self.matrix_ = build_matrix
         self.bob_ = None
         self.last_rc_ = 0
-        self.dirs_ = {}
-
-    def pre_build(self, target):
-        for A in ARCHS:
-            self.dirs_[A] = os.path.join(target.build_dir(), A)
-            mkdir(self.dirs_[A])
-            params = [target.script_path()] + self.prebuild_params_ + ['-A', A]
-            p = proc.proc('cmake', *params, cwd=self.dirs_[A]), consume=True)
+
+    def tree_dir(self, target, A, C=None):
+        if self.matrix_.multi_config() or C is None:
+            return os.path.join(target.build_dir(), A)
+        return os.path.join(target.build_dir(), A, C)
+
+    def pre_build(self, target, A, configs):
+        with phase.phase(target.name(), A, 'configure'):
+            self.configure_(target, A, configs)
+
+    def trees_(self, target, A, configs):
+        if self.matrix_.multi_config():
+            return [(self.tree_dir(target, A), configs[0])]
+        return [(self.tree_dir(target, A, C), C) for C in configs]
+
+    def configure_params_(self, target, A, C):
+        params = [target.script_path()] + self.prebuild_params_
+        for profile in target.profiles():
+            params += profile.prebuild_params()
+        if target.compiler_cache():
+            params += target.compiler_cache().prebuild_params()
+        if self.matrix_.generator():
+            params += ['-G', self.matrix_.generator()]
+        if self.matrix_.multi_config():
+            params += ['-A', A]
+        else:
+            params += ['-DCMAKE_BUILD_TYPE={}'.format(C)]
+        return params
+
+    def stamp_(self, target, A, C):
+        return {'params': self.configure_params_(target, A, C),
+                'env': target.env(A),
+                'toolchain': target.toolchain_fingerprint(A)}
+
+    def configure_plan(self, target, A, configs):
+        # (tree, why it would be configured, or None if it wouldn't)
+        return [(tree, self.stamp_changes_(tree, self.stamp_(target, A, C)))
+                for tree, C in self.trees_(target, A, configs)]
+
+    def configure_(self, target, A, configs):
+        for tree, C in self.trees_(target, A, configs):
+            mkdir(tree)
+            fileapi.request(tree)
+            stamp = self.stamp_(target, A, C)
+            if not self.stamp_changes_(tree, stamp):
+                # cmake --build configures again itself if a CMakeLists
+                # file has changed
+                continue
+            params = stamp['params']
+            seed = target.cmake_seed()
+            if seed:
+                params = seed.params(stamp['toolchain'], A) + params
+            p = proc.proc('cmake', *params, cwd=tree, env=target.env(A),
+                          consume=True)
             if not p.ok():
-                print("ERROR: CMake parsing failed for {}".format(
-                      target.name()), file=sys.stderr)
-                sys.exit(p.rc())
+                raise StepFailed("CMake parsing failed for {} ({})".format(
+                                 target.name(), A), p.rc())
+            fileapi.index(tree, target.element().targets())
+            with open(os.path.join(tree, CONFIGURE_STAMP), 'w') as f:
+                json.dump(stamp, f, indent=2, sort_keys=True)
+            if seed:
+                seed.harvest(stamp['toolchain'], A, tree, target.name())
+
+    def stamp_changes_(self, tree, stamp):
+        # what keeps the tree from counting as configured; empty if nothing
+        stamp_file = os.path.join(tree, CONFIGURE_STAMP)
+        if not os.path.isfile(os.path.join(tree, 'CMakeCache.txt')):
+            return ['not configured yet']
+        if not os.path.isfile(stamp_file):
+            return ['no record of how it was configured']
+        if not fileapi.indexed(tree):
+            return ['its artifacts have not been indexed']
+        try:
+            with open(stamp_file, 'r') as f:
+                before = json.load(f)
+        except ValueError:
+            return ['its configure record is unreadable']
+        return ['{} changed'.format(STAMP_WORDS[key]) for key in
+                sorted(stamp) if before.get(key) != stamp[key]]
 
-    def build(self, build_target):
-        for A in self.dirs_:
-            p = proc.proc('cmake', '--build', '.', '--config', BUILD_RELEASE,
-                          '-t', build_target, cwd=self.dirs_[A]), consume=True)
-            p.ok()
+    def build(self, target, A, C, build_target):
+        with phase.phase(target.name(), A, 'build'):
+            self.build_(target, A, C, build_target)
+
+    def build_(self, target, A, C, build_target):
+        params = []
+        for profile in target.profiles():
+            params += profile.build_params()
+        p = proc.proc('cmake', '--build', '.', '--config', C,
+                      '-t', build_target, *params,
+                      cwd=self.tree_dir(target, A, C),
+                      env=target.env(A), consume=True)
+        if not p.ok():
+            raise StepFailed("building {} failed for {} ({} {})".format(
+                             build_target, target.name(), A, C), p.rc())
 
     def post_build(self):
         pass
@@ -91,11 +213,20 @@ class Builder:
 
 class Target:
 
-    def __init__(self, element, maker_dirs, archs=None):
-        global ARCHS
+    def __init__(self, element, maker_dirs, build_matrix=None, vcvars=None,
+                 compiler_cache=None, cmake_seed=None, single_flight=None):
         self.dirs_ = maker_dirs
-        if archs:
-            ARCHS = archs
+        self.matrix_ = build_matrix if build_matrix else matrix.Matrix()
+        self.vcvars_ = vcvars
+        self.compiler_cache_ = compiler_cache if \
+            element.compiler_cache() else None
+        self.cmake_seed_ = cmake_seed if element.cmake_seed() else None
+        self.single_flight_ = single_flight
+        self.profiles_ = element.profiles()
+        # archs whose inputs changed since they were last built, so timings
+        # of real rebuilds aren't compared with ones that had nothing to do
+        self.rebuilt_ = set()
+        self.depends_ = []
 
         self.element_ = element
         self.source_sub_dir_ = os.path.join(self.dirs_.source_dir(),
@@ -106,11 +237,60 @@ class Target:
             self.element_.script_path() is None else os.path.join(
                     self.source_sub_dir_, self.element_.script_path())
 
-        self.builder_ = Builder(self.element_)
+        self.builder_ = Builder(self.element_, self.matrix_)
 
     def name(self):
         return self.element_.name_
 
+    def element(self):
+        return self.element_
+
+    def use_depends(self, targets):
+        # the targets this one is built against
+        self.depends_ = list(targets)
+
+    def compiler_cache(self):
+        return self.compiler_cache_
+
+    def cmake_seed(self):
+        return self.cmake_seed_
+
+    def profiles(self):
+        return self.profiles_
+
+    def toolchain_fingerprint(self, A):
+        launcher = self.compiler_cache_.launcher() if \
+            self.compiler_cache_ else None
+        return history.toolchain_fingerprint(
+            self.matrix_.generator(),
+            self.vcvars_.env(A) if self.vcvars_ else None, launcher)
+
+    def variant(self, profiles, build_dir):
+        # the same element built with other profiles into another tree
+        other = copy.copy(self)
+        other.profiles_ = profiles
+        # built for the timing: never reused, nor counted as this one's
+        other.single_flight_ = None
+        other.rebuilt_ = set()
+        other.build_sub_dir_ = build_dir
+        other.builder_ = Builder(self.element_, self.matrix_)
+        return other
+
+    def env(self, A):
+        # the environment the arch's vcvars script sets up, if there is one,
+        # and the compiler cache's settings
+        env = {}
+        if self.vcvars_ and self.vcvars_.env(A):
+            env.update(self.vcvars_.env(A))
+        if self.compiler_cache_:
+            env.update(self.compiler_cache_.env(self.name(), A))
+        for profile in self.profiles_:
+            env.update(profile.env())
+        return env if env else None
+
+    def source_dir(self):
+        return self.source_sub_dir_
+
     def build_dir(self):
         return self.build_sub_dir_
 
@@ -120,81 +300,400 @@ class Target:
     def git(self, *args):
         return proc.git(*args, consume=True, cwd=self.source_sub_dir_)
 
+    def git_line_(self, *args):
+        p = self.git(*args)
+        if not p.ok() or not p.lines():
+            return None
+        return p.lines()[0].decode('utf-8', 'replace').strip()
+
+    def git_state(self):
+        return gitstate.GitState(self.source_sub_dir_)
+
+    def git_dir(self):
+        return self.git_state().git_dir()
+
+    def head(self):
+        head = self.git_state().head()
+        return head if head else self.git_line_('rev-parse', 'HEAD')
+
+    def upstream_(self):
+        # git is only asked when .git doesn't answer plainly: a config it
+        # can't follow, a detached HEAD, an unusual merge ref
+        state = self.git_state()
+        upstream = state.upstream() if state.exists() else None
+        return upstream if upstream else self.git_line_('rev-parse', '@{u}')
+
+    def is_at(self, commit):
+        # checked out at commit with the patches as wanted, git not run
+        return os.path.isdir(self.source_sub_dir_) and \
+            self.head() == commit and \
+            self.patch_state().matches(commit, self.patches())
+
+    def patches(self):
+        patches = []
+        for p in self.element_.patches():
+            patch_file = os.path.join(self.dirs_.patches_dir(), p)
+            if not os.path.isfile(patch_file):
+                raise StepFailed("patch {} for {} is missing".format(
+                                 patch_file, self.element_.name()), 6)
+            patches.append(patcher.Patch.from_file(patch_file))
+        return patches
+
+    def patch_state(self):
+        return patcher.PatchState(self.git_dir())
+
+    def applied_patches_(self, state):
+        # the record says what's on the tree; checkouts patched before there
+        # was a record get whichever of the patches are found applied
+        if state.known():
+            return state.applied()
+        return [p for p in self.patches() if
+                p.applies(self.source_sub_dir_, reverse=True) and
+                not p.applies(self.source_sub_dir_)]
+
     def apply_patches(self, reverse=False):
-        patches = [p for p in self.element_.patches()]
-        if patches:
-            if reverse:
-                patches.reverse()
-                for p in patches:
-                    patch_file = os.path.join(self.dirs_.patches_dir(), p)
-                    self.git("apply", "-R", patch_file).ok()
-            else:
-                for p in patches:
-                    patch_file = os.path.join(self.dirs_.patches_dir(), p)
-                    self.git("apply", patch_file).ok()
+        state = self.patch_state()
+        try:
+            applied = self.applied_patches_(state)
+            wanted = [] if reverse else self.patches()
+            head = self.head()
+            if [p.digest() for p in applied] == \
+                    [p.digest() for p in wanted] and state.commit() == head:
+                return
+            for p in reversed(applied):
+                p.apply(self.source_sub_dir_, reverse=True)
+            state.record(head, [])
+            for p in wanted:
+                p.apply(self.source_sub_dir_)
+            state.record(head, wanted)
+        except patcher.PatchError as e:
+            raise StepFailed("patching {} failed: {}".format(
+                             self.element_.name(), e), 6)
 
     def sync(self):
+        with phase.phase(self.name(), None, 'sync'):
+            self.sync_()
+
+    def sync_(self):
         p = None
+        times = {}
         if os.path.isdir(self.source_sub_dir_):
-            self.apply_patches(reverse=True)
-            cmd = "pull"
-            p = self.git("pull")
+            cmd = "fetch"
+            p = self.git("fetch")
+            if p.ok():
+                head = self.head()
+                upstream = self.upstream_()
+                if upstream in (None, head) and self.is_at(head):
+                    # nothing new upstream and the patches are as wanted;
+                    # leave the tree (and its timestamps) alone
+                    return
+                times = patcher.file_times(
+                    path for one in self.applied_patches_(self.patch_state())
+                    for path in one.paths(self.source_sub_dir_))
+                self.apply_patches(reverse=True)
+                if upstream is not None:
+                    cmd = "pull"
+                    p = self.git("merge", "--ff-only", "@{u}")
         else:
             cmd = "clone"
             p = proc.git("clone", self.element_.source(), self.source_sub_dir_,
                          consume=True, cwd=self.dirs_.source_dir())
         if not p.ok():
-            print("FATAL: git {} command failed for {}".format(
-                cmd, self.element_.name()), file=sys.stderr)
-            sys.exit(p.rc())
+            message = "git {} command failed for {}".format(
+                cmd, self.element_.name())
+            if cmd == "pull":
+                for path in self.git_state().dirty() or []:
+                    message += "\n    changed: {}".format(path)
+            raise StepFailed(message, p.rc())
 
         if not os.path.isdir(self.source_sub_dir_) and not \
                 os.path.isdir(os.path.join(self.source_sub_dir_, ".git")):
-            print("FATAL: The project source for %s could not be cloned" %
-                  (self.element_.name()), file=sys.stderr)
-            sys.exit(p.rc())
-
-        cmd = "submodule"
-        p = self.git("submodule", "update", "--init")
-        if p.ok():
-            cmd = "status"
-            p = self.git("status")
-        if not p.ok():
-            print("FATAL: git {} command failed for {}".format(
-                    cmd, self.element_.name()), file=sys.stderr)
-            sys.exit(p.rc())
+            raise StepFailed("The project source for {} could not be "
+                             "cloned".format(self.element_.name()), p.rc())
+
+        if os.path.isfile(os.path.join(self.source_sub_dir_, ".gitmodules")):
+            p = self.git("submodule", "update", "--init")
+            if not p.ok():
+                raise StepFailed("git submodule command failed for {}".format(
+                                 self.element_.name()), p.rc())
+        if self.head() is None:
+            raise StepFailed("the checkout of {} has no HEAD".format(
+                             self.element_.name()))
+
+        self.apply_patches()
+        if times:
+            patcher.restore_times(times)
+
+    def sync_to(self, commit):
+        # check out a locked revision, e.g. one handed out by a coordinator
+        with phase.phase(self.name(), None, 'sync'):
+            self.sync_to_(commit)
 
+    def sync_to_(self, commit):
+        if self.is_at(commit):
+            return
+        if os.path.isdir(self.source_sub_dir_):
+            steps = [("fetch", ("-C", self.source_sub_dir_, "fetch"))]
+            self.apply_patches(reverse=True)
+        else:
+            mkdir(self.dirs_.source_dir())
+            steps = [("clone", ("clone", self.element_.source(),
+                                self.source_sub_dir_))]
+        steps += [("checkout", ("-C", self.source_sub_dir_, "checkout", "-q",
+                                "--detach", commit)),
+                  ("submodule", ("-C", self.source_sub_dir_, "submodule",
+                                 "update", "--init"))]
+        for cmd, args in steps:
+            p = proc.git(*args, consume=True, cwd=self.dirs_.source_dir())
+            if not p.ok():
+                raise StepFailed("git {} command failed for {}".format(
+                                 cmd, self.element_.name()), p.rc())
         self.apply_patches()
 
     def build(self):
+        for A, configs in self.matrix_.units():
+            self.build_unit(A, configs)
+
+    def build_unit(self, A, configs):
+        # one configured tree (an arch, or for single-config generators an
+        # arch and build type) and every configuration built out of it
         mkdir(self.build_sub_dir_)
-        if self.builder_ is not None:
-            self.builder_.pre_build(self)
+        if self.builder_ is None:
+            return
+        changed = not self.built_(A, configs)
+        if changed:
+            self.rebuilt_.add(A)
+        elif self.reused(A, configs):
+            # nothing here to configure or build against; what was copied
+            # in stays good until the inputs change
+            return
+        if self.single_flight_ and changed and self.shareable_():
+            self.single_flight_.run(
+                self.flight_key_(A, configs), '{} {} {}'.format(
+                    self.name(), A, ','.join(configs)),
+                lambda: self.build_unit_(A, configs),
+                lambda staging: self.publish_(A, configs, staging),
+                lambda result_dir, result: self.reuse_(A, configs,
+                                                       result_dir, result))
+        else:
+            self.build_unit_(A, configs)
+
+    def build_unit_(self, A, configs):
+        cached = None
+        if self.compiler_cache_:
+            cached = self.compiler_cache_.begin(self.name(), A)
+        self.builder_.pre_build(self, A, configs)
+        for C in configs:
             for t in self.element_.targets():
-                self.builder_.build(t)
-            self.builder_.post_build()
+                self.builder_.build(self, A, C, t)
+        self.builder_.post_build()
+        if self.compiler_cache_:
+            self.compiler_cache_.end(self.name(), A, cached)
+        self.record_inputs(A, configs)
 
-    def gather(self):
-        # copy headers from the source to the destination
+    def rebuilt(self):
+        return self.rebuilt_
+
+    def built_(self, A, configs):
+        # already built here from these inputs; cmake --build only has to
+        # look
+        inputs = self.inputs(A)
+        return all(self.recorded_inputs(A, C) == inputs for C in configs)
+
+    def shareable_(self):
+        # no edits in the source tree beyond what the patches make, since
+        # the inputs don't account for them; git not answering counts too
+        dirty = self.git_state().dirty()
+        if dirty is None:
+            return False
+        patched = set(os.path.relpath(path, self.source_sub_dir_)
+                      .replace(os.sep, '/') for p in self.patches()
+                      for path in p.paths(self.source_sub_dir_))
+        return all(path in patched for path in dirty)
+
+    def flight_key_(self, A, configs):
+        # the same for any checkout building the same thing the same way,
+        # against the same builds of what it depends on
+        key = json.dumps({'name': self.name(), 'arch': A,
+                          'configs': list(configs),
+                          'generator': self.matrix_.generator(),
+                          'inputs': self.inputs(A),
+                          'depends': {d.name(): [d.recorded_inputs(A, C)
+                                                 for C in configs]
+                                      for d in self.depends_}},
+                         sort_keys=True)
+        return '{}-{}-{}'.format(self.name(), A, hashlib.sha256(
+                                 key.encode('utf-8')).hexdigest()[:16])
+
+    def publish_(self, A, configs, staging):
+        # the deliverables and the artifact index of each build type, as
+        # {config: [paths relative to the tree]}; None if any lies outside
+        # the tree, or wasn't built
+        files = {}
+        for C in configs:
+            tree = self.builder_.tree_dir(self, A, C)
+            found = self.deliverables_(A, C)
+            if any(os.path.isabs(f) or not os.path.isfile(
+                    os.path.join(tree, f)) for f in found):
+                return None
+            if fileapi.indexed(tree):
+                found = found + [fileapi.ARTIFACTS_FILE]
+            for f in found:
+                mkdir(os.path.dirname(os.path.join(staging, C, f)))
+                shutil.copy2(os.path.join(tree, f),
+                             os.path.join(staging, C, f))
+            files[C] = [f.replace(os.sep, '/') for f in found]
+        return {'files': files}
+
+    def reuse_(self, A, configs, result_dir, result):
+        for C in configs:
+            tree = self.builder_.tree_dir(self, A, C)
+            for f in result['files'][C]:
+                dest = os.path.join(tree, *f.split('/'))
+                mkdir(os.path.dirname(dest))
+                shutil.copy2(os.path.join(result_dir, C, *f.split('/')), dest)
+        self.record_inputs(A, configs)
+        for C in configs:
+            with open(self.reused_file_(A, C), 'w') as f:
+                json.dump(result['files'][C], f, indent=2)
+
+    def reused_file_(self, A, C):
+        return os.path.join(self.build_sub_dir_, A, REUSED_FILE.format(C))
+
+    def reused(self, A, configs):
+        # the trees hold another run's build, all of it still there
+        for C in configs:
+            try:
+                with open(self.reused_file_(A, C), 'r') as f:
+                    files = json.load(f)
+            except (OSError, ValueError):
+                return False
+            tree = self.builder_.tree_dir(self, A, C)
+            if not all(os.path.isfile(os.path.join(tree, *f.split('/')))
+                       for f in files):
+                return False
+        return True
+
+    def record_inputs(self, A, configs):
+        inputs = self.inputs(A)
+        for C in configs:
+            with open(self.inputs_file_(A, C), 'w') as f:
+                json.dump(inputs, f, indent=2, sort_keys=True)
+            # built here, whatever was reused before
+            if os.path.isfile(self.reused_file_(A, C)):
+                os.remove(self.reused_file_(A, C))
+
+    def inputs(self, A, commit=None):
+        # what goes into a build of the arch, to tell later what changed;
+        # at commit if given, so HEAD needn't be read
+        prebuild = list(self.element_.prebuild_params())
+        build = []
+        for profile in self.profiles_:
+            prebuild += profile.prebuild_params()
+            build += profile.build_params()
+        return json.loads(json.dumps({
+            'commit': commit or self.head(),
+            'patches': {p.name(): p.digest() for p in self.patches()},
+            'prebuild_params': prebuild,
+            'build_params': build,
+            'toolchain': self.toolchain_fingerprint(A),
+            'manifest': self.element_.manifest()}, default=str))
+
+    def inputs_file_(self, A, C):
+        return os.path.join(self.build_sub_dir_, A, INPUTS_FILE.format(C))
+
+    def recorded_inputs(self, A, C):
+        # None if the arch and build type haven't been built successfully
+        try:
+            with open(self.inputs_file_(A, C), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def builder(self):
+        return self.builder_
+
+    def header_files(self):
+        # source is the key, dest sub-dir off include is the value; '.' for
+        # none
         header_dict = self.element_.headers()
+        files = []
         for h in header_dict:
-            # source is the key, dest sub-dir off include is the value;
-            # '.' for none
-            source = os.path.join(self.source_sub_dir_, h)
+            source = os.path.join(self.source_sub_dir_, *split_path_(h))
             if header_dict[h] == '.':
                 dest = self.dirs_.include_dir()
             else:
-                dest = os.path.join(self.dirs_.include_dir(), header_dict[h])
-                mkdir(dest)
-            shutil.copy2(source, dest)
-        # copy .lib's / .dll's from build to the destination
-        for deliv in self.element_.deliverables():
+                dest = os.path.join(self.dirs_.include_dir(),
+                                    *split_path_(header_dict[h]))
+            files.append((source, dest))
+        return files
+
+    def deliverables_(self, A, C):
+        # where CMake said the targets' artifacts are, or failing that, where
+        # the manifest says they are; relative to the tree
+        tree = self.builder_.tree_dir(self, A, C)
+        found = fileapi.artifacts(tree, C, self.element_.targets())
+        if found is not None:
+            return found
+        return [for_config(deliv, C) for deliv in self.element_.deliverables()]
+
+    def deliverable_files(self, A, C):
+        # .lib's go to the lib directory, .dll's (and .exe's) to bin, per
+        # arch and config
+        files = []
+        tree = self.builder_.tree_dir(self, A, C)
+        for deliv in self.deliverables_(A, C):
+            source = os.path.join(tree, deliv)
             if deliv[-3:].lower() == 'lib':
-                for A in ARCHS:
-                    shutil.copy2(os.path.join(self.build_sub_dir_, A, deliv),
-                                 self.dirs_.lib_dir(A))
+                files.append((source, self.dirs_.lib_dir(A, C)))
             else:
-                assert deliv[-3:].lower() == 'dll'
-                for A in ARCHS:
-                    shutil.copy2(os.path.join(self.build_sub_dir_, A, deliv),
-                                 self.dirs_.bin_dir(A))
+                assert deliv[-3:].lower() in ('dll', 'exe')
+                files.append((source, self.dirs_.bin_dir(A, C)))
+        return files
+
+    def dll_work_dir(self, A, C):
+        return os.path.join(self.build_sub_dir_, 'dll-work', A, C)
+
+    def import_lib_files(self, A, C):
+        # (dll, .lib to make for it) for the DLLs delivered without an
+        # import library of their own
+        delivs = self.deliverables_(A, C)
+        libs = set(os.path.splitext(os.path.basename(d))[0].lower()
+                   for d in delivs if d[-3:].lower() == 'lib')
+        files = []
+        tree = self.builder_.tree_dir(self, A, C)
+        for dll in delivs:
+            if dll[-3:].lower() != 'dll':
+                continue
+            stem = os.path.splitext(os.path.basename(dll))[0]
+            if stem.lower() not in libs:
+                files.append((os.path.join(tree, dll), os.path.join(
+                    self.dll_work_dir(A, C), stem + '.lib')))
+        return files
+
+    def gathered_files(self):
+        files = self.header_files()
+        for A, C in self.matrix_.cells():
+            files += self.deliverable_files(A, C)
+            files += [(lib, self.dirs_.lib_dir(A, C)) for _, lib in
+                      self.import_lib_files(A, C)]
+        return files
+
+    def output_files(self):
+        # what gather puts under the output root, relative to it
+        root = self.dirs_.output_root()
+        return [os.path.relpath(os.path.join(dest, os.path.basename(source)),
+                                root).replace(os.sep, '/')
+                for source, dest in self.gathered_files()]
+
+    def stale_files(self):
+        # the gathered files whose copies are missing or differ in size or
+        # modification time; copy2 keeps the time, so nothing is hashed
+        return [(source, dest) for source, dest in self.gathered_files()
+                if not same_stat_(source, os.path.join(
+                    dest, os.path.basename(source)))]
+
+    def gather(self):
+        for source, dest in self.stale_files():
+            mkdir(dest)
+            shutil.copy2(source, dest)
@@ -0,0 +1,139 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  vcvars.py - Runs each arch's vcvars script once and keeps the environment
+#              it sets up, for every command built for that arch
+#
+# #########################################################################
+
+import json
+import os
+import os.path
+import sys
+import threading
+from . import dirs
+from . import proc
+
+mkdir = dirs.mkdir_
+
+
+def capture_args_(script):
+    # run the script, then print the environment it leaves behind
+    if os.name == 'nt':
+        return (proc.CMD, proc.C, 'call', script, '>nul', '&&', 'set')
+    return ('sh', '-c', '. "$0" >/dev/null && env', script)
+
+
+def key_(name):
+    # Windows environment names don't care about case
+    return name.upper() if os.name == 'nt' else name
+
+
+def environment_diff(lines, base):
+    base = {key_(k): v for k, v in base.items()}
+    diff = {}
+    for line in lines:
+        line = line.decode('utf-8', 'replace').rstrip('\r\n')
+        name, eq, value = line.partition('=')
+        if not eq or not name:
+            continue
+        if base.get(key_(name)) != value:
+            diff[name] = value
+    return diff
+
+
+class VcVars:
+
+    def __init__(self, scripts, cache_dir, verbose=False):
+        self.scripts_ = {A: s for A, s in scripts.items() if s}
+        self.cache_dir_ = cache_dir
+        self.v_ = verbose
+        self.envs_ = {}
+        self.capture_ = True
+        self.lock_ = threading.Lock()
+
+    def set_capture(self, capture):
+        # without capture only what's already cached is used; an arch whose
+        # script hasn't been run yet has no environment
+        self.capture_ = capture
+
+    def captured(self, A):
+        return A not in self.scripts_ or self.env(A) is not None
+
+    def cache_file_(self, A):
+        return os.path.join(self.cache_dir_, 'vcvars-{}.json'.format(A))
+
+    def env(self, A):
+        # None when there's no script for the arch: commands then just get
+        # this process's environment
+        if A not in self.scripts_:
+            return None
+        with self.lock_:
+            if A not in self.envs_:
+                self.envs_[A] = self.load_(A)
+            return self.envs_[A]
+
+    def load_(self, A):
+        script = self.scripts_[A]
+        if not os.path.isfile(script):
+            print("FATAL: vcvars script {} for {} is missing".format(
+                  script, A), file=sys.stderr)
+            sys.exit(8)
+        mtime = os.stat(script).st_mtime_ns
+        cache_file = self.cache_file_(A)
+        if os.path.isfile(cache_file):
+            with open(cache_file, 'r') as f:
+                cached = json.load(f)
+            if cached.get('script') == script and \
+                    cached.get('mtime') == mtime:
+                return cached['env']
+        if not self.capture_:
+            return None
+
+        p = proc.Proc(*capture_args_(script), consume=True)
+        if not p.ok():
+            print("FATAL: running {} failed".format(script), file=sys.stderr)
+            sys.exit(p.rc())
+        env = environment_diff(p.lines(), os.environ)
+        mkdir(self.cache_dir_)
+        with open(cache_file, 'w') as f:
+            json.dump({'script': script, 'mtime': mtime, 'env': env}, f,
+                      indent=2)
+        if self.v_:
+            print("Captured {} environment settings from {}".format(
+                  len(env), script))
+        return env
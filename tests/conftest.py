@@ -0,0 +1,257 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  conftest.py - Shared fixtures: a scratch workspace and stand-ins for the
+#                Windows tools, so the tests run anywhere
+#
+# #########################################################################
+
+import os
+import os.path
+import shutil
+import stat
+import subprocess
+import sys
+
+import pytest
+import yaml
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from maker.dirs import MakerDirs  # noqa: E402
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    # MakerDirs rooted in a scratch directory
+    monkeypatch.chdir(tmp_path)
+    return MakerDirs(str(tmp_path / 'prefix'))
+
+
+@pytest.fixture
+def stand_in(tmp_path):
+    # writes an executable python script standing in for a tool
+    def write(name, body):
+        bin_dir = tmp_path / 'bin'
+        bin_dir.mkdir(exist_ok=True)
+        path = bin_dir / name
+        path.write_text('#!{}\nimport os, sys\n{}'.format(sys.executable,
+                                                          body))
+        path.chmod(path.stat().st_mode | stat.S_IEXEC)
+        return str(path)
+    return write
+
+
+# configures by writing a CMakeCache.txt; builds -t TARGET by writing
+# TARGET.dll into the tree, after FAKE_CMAKE_SLEEP seconds, failing for
+# FAKE_CMAKE_FAIL. With a C compiler launcher, each .c file of the source
+# is "compiled" through it. Each step is noted in FAKE_CMAKE_LOG.
+CMAKE = '''
+import glob
+import subprocess
+import time
+args = sys.argv[1:]
+
+
+def note(line):
+    log = os.environ.get('FAKE_CMAKE_LOG')
+    if log:
+        with open(log, 'a') as f:
+            f.write(line + '\\n')
+
+
+if args[0] == '--build':
+    tree = os.path.abspath(args[1])
+    built = args[args.index('-t') + 1] if '-t' in args else 'all'
+    config = args[args.index('--config') + 1]
+    time.sleep(float(os.environ.get('FAKE_CMAKE_SLEEP', '0')))
+    if built == os.environ.get('FAKE_CMAKE_FAIL'):
+        sys.exit(1)
+    with open(os.path.join(tree, 'CMakeCache.txt'), 'r') as f:
+        cache = dict(line.strip().split('=', 1) for line in f if '=' in line)
+    launcher = cache.get('CMAKE_C_COMPILER_LAUNCHER:STRING')
+    if launcher:
+        for source in sorted(glob.glob(os.path.join(
+                cache['CMAKE_HOME_DIRECTORY:INTERNAL'], '*.c'))):
+            subprocess.check_call([launcher, sys.executable, '-c', 'pass',
+                                   source])
+    with open(os.path.join(tree, built + '.dll'), 'w') as f:
+        f.write('built {} {} {}'.format(built, config, os.getpid()))
+    note('build {} {}'.format(tree, built))
+else:
+    with open('CMakeCache.txt', 'w') as f:
+        f.write('HAVE_STDINT_H:INTERNAL=1\\n')
+        f.write('CMAKE_HOME_DIRECTORY:INTERNAL={}\\n'.format(
+                os.path.abspath([a for x, a in enumerate(args)
+                                 if not a.startswith('-') and
+                                 args[x - 1] not in ('-C', '-G', '-A')][0])))
+        for arg in args:
+            if arg.startswith('-DCMAKE_C_COMPILER_LAUNCHER='):
+                f.write('CMAKE_C_COMPILER_LAUNCHER:STRING={}\\n'.format(
+                        arg.split('=', 1)[1]))
+    note('configure {} {}'.format(os.getcwd(), ' '.join(args)))
+'''
+
+# ccache-alike: a hit for content it has seen before, logged to
+# CCACHE_STATSLOG the way ccache does; always runs the compile
+LAUNCHER = '''
+import hashlib
+import subprocess
+with open(sys.argv[-1], 'rb') as f:
+    key = hashlib.sha256(f.read()).hexdigest()
+os.makedirs(os.environ['CCACHE_DIR'], exist_ok=True)
+seen = os.path.join(os.environ['CCACHE_DIR'], key)
+outcome = 'direct_cache_hit' if os.path.isfile(seen) else 'cache_miss'
+open(seen, 'w').close()
+with open(os.environ['CCACHE_STATSLOG'], 'a') as f:
+    f.write('# {}\\n{}\\n'.format(sys.argv[-1], outcome))
+sys.exit(subprocess.call(sys.argv[1:]))
+'''
+
+GENDEF = '''
+stem = os.path.splitext(sys.argv[1])[0]
+with open(stem + '.def', 'w') as f:
+    f.write('LIBRARY {}\\nEXPORTS\\n'.format(stem))
+'''
+
+LIB = '''
+out = [a[5:] for a in sys.argv if a.startswith('/out:')][0]
+with open(out, 'w') as f:
+    f.write(' '.join(sys.argv[1:]))
+'''
+
+
+class Toolchain:
+
+    def __init__(self, stand_in, log):
+        self.cmake_ = stand_in('cmake', CMAKE)
+        self.gendef_ = stand_in('gendef', GENDEF)
+        self.lib_ = stand_in('lib', LIB)
+        self.launcher_ = stand_in('ccache', LAUNCHER)
+        self.log_ = log
+
+    def gendef(self):
+        return self.gendef_
+
+    def launcher(self):
+        return self.launcher_
+
+    def log(self):
+        return self.log_
+
+    def steps(self, kind):
+        if not os.path.isfile(self.log_):
+            return []
+        with open(self.log_, 'r') as f:
+            return [line.split()[1:] for line in f
+                    if line.split()[0] == kind]
+
+
+@pytest.fixture
+def toolchain(tmp_path, stand_in, monkeypatch):
+    # stand-in cmake, gendef and lib, first on the PATH
+    chain = Toolchain(stand_in, str(tmp_path / 'cmake.log'))
+    monkeypatch.setenv('PATH', str(tmp_path / 'bin') + os.pathsep +
+                       os.environ['PATH'])
+    monkeypatch.setenv('FAKE_CMAKE_LOG', chain.log())
+    return chain
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    # a git repository to clone, with one commit of the given files
+    if shutil.which('git') is None:
+        pytest.skip('needs git')
+
+    def make(name, files):
+        root = tmp_path / 'upstream' / name
+        root.mkdir(parents=True)
+        for path, content in files.items():
+            (root / path).write_text(content)
+        for args in (['init', '-q'], ['add', '-A'],
+                     ['-c', 'user.name=t', '-c', 'user.email=t@t', 'commit',
+                      '-q', '-m', 'first']):
+            subprocess.run(['git'] + args, cwd=str(root), check=True)
+        return str(root)
+    return make
+
+
+class Checkout:
+    """A copy of make.py and maker with its own manifests and configvars"""
+
+    def __init__(self, root):
+        self.root_ = root
+
+    def root(self):
+        return self.root_
+
+    def path(self, *parts):
+        return os.path.join(self.root_, *parts)
+
+    def start(self, *args):
+        return subprocess.Popen([sys.executable, 'make.py'] + list(args),
+                                cwd=self.root_, stdout=subprocess.PIPE,
+                                stderr=subprocess.STDOUT,
+                                universal_newlines=True)
+
+    def run(self, *args):
+        p = self.start(*args)
+        out, _ = p.communicate(timeout=120)
+        return p.returncode, out
+
+
+@pytest.fixture
+def checkout(tmp_path, toolchain):
+    def make(name, manifests, **settings):
+        root = tmp_path / name
+        root.mkdir()
+        shutil.copy(os.path.join(REPO, 'make.py'), str(root))
+        shutil.copytree(os.path.join(REPO, 'maker'), str(root / 'maker'),
+                        ignore=shutil.ignore_patterns('__pycache__'))
+        for file_name, content in manifests.items():
+            with open(str(root / file_name), 'w') as f:
+                yaml.safe_dump(content, f)
+        values = {'GENERATOR': 'Ninja', 'PREFIX': str(root / 'prefix'),
+                  'COMPILER': None, 'MAKE_NSIS': None, 'VCVARS': '',
+                  'ARCHS': ['x64'], 'GENDEF': toolchain.gendef()}
+        values.update(settings)
+        with open(str(root / 'configvars.py'), 'w') as f:
+            for key in sorted(values):
+                f.write('{} = {!r}\n'.format(key, values[key]))
+        return Checkout(str(root))
+    return make
@@ -0,0 +1,105 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_ccache.py - Builds through a stand-in ccache launcher: hits and misses
+#                 per element, and a rebuild after an upstream change
+#
+# #########################################################################
+
+import os
+import re
+import subprocess
+
+import pytest
+
+pytestmark = pytest.mark.skipif(os.name == 'nt',
+                                reason='the stand-in launcher is run '
+                                       'directly')
+
+
+def counts(out, name):
+    m = re.search(r'^  {}\s+(\d+) hits\s+(\d+) misses'.format(name), out,
+                  re.MULTILINE)
+    assert m, out
+    return int(m.group(1)), int(m.group(2))
+
+
+def test_only_changed_sources_miss(checkout, upstream, toolchain):
+    source = upstream('alpha', {'a.c': 'int a;', 'b.c': 'int b;',
+                                'alpha.h': ''})
+    work = checkout('work', {'00-libraries.yaml': {'alpha': {
+        'source': source, 'targets': ['alpha'],
+        'deliverables': ['alpha.dll']}}},
+        COMPILER_LAUNCHER=toolchain.launcher())
+    rc, out = work.run('all')
+    assert rc == 0, out
+    assert counts(out, 'alpha') == (0, 2)
+
+    with open(os.path.join(source, 'b.c'), 'w') as f:
+        f.write('int b = 1;')
+    subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t',
+                    'commit', '-q', '-am', 'bump'], cwd=source, check=True)
+    rc, out = work.run('all')
+    assert rc == 0, out
+    assert counts(out, 'alpha') == (1, 1)
+
+
+def test_other_runs_stats_are_left_alone(checkout, upstream, toolchain):
+    work = checkout('work', {'00-libraries.yaml': {'alpha': {
+        'source': upstream('alpha', {'a.c': 'int a;'}),
+        'targets': ['alpha'], 'deliverables': ['alpha.dll']}}},
+        COMPILER_LAUNCHER=toolchain.launcher())
+    stats = work.path('build', 'cache', 'compiler-stats')
+    os.makedirs(stats)
+    other = os.path.join(stats, 'zlib-x64-1.log')
+    with open(other, 'w') as f:
+        f.write('cache_miss\n')
+    rc, out = work.run('all')
+    assert rc == 0, out
+    assert counts(out, 'alpha') == (0, 1)
+    assert 'zlib' not in out
+    assert os.path.isfile(other)
+
+
+def test_visual_studio_generators_warn(checkout, upstream, toolchain):
+    work = checkout('work', {'00-libraries.yaml': {'alpha': {
+        'source': upstream('alpha', {'a.c': 'int a;'})}}},
+        GENERATOR='Visual Studio 17 2022')
+    rc, out = work.run('perf-report', '--compiler-cache',
+                       toolchain.launcher())
+    assert 'WARNING: Visual Studio 17 2022 ignores compiler launchers' in out
+    assert not os.path.isdir(work.path('build', 'cache', 'compiler'))
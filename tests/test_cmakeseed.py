@@ -0,0 +1,77 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_cmakeseed.py - Which check results are shared between configures
+#
+# #########################################################################
+
+from maker.cmakeseed import CMakeSeed
+
+
+def configured(tmp_path, name, results):
+    tree = tmp_path / name
+    tree.mkdir()
+    (tree / 'CMakeCache.txt').write_text(''.join(
+        '{}:INTERNAL={}\n'.format(k, v) for k, v in results.items()))
+    return str(tree)
+
+
+def seeded(seed):
+    with open(seed.params('fp', 'x64')[1], 'r') as f:
+        return sorted(line.split()[0][4:] for line in f)
+
+
+def test_only_toolchain_results_are_seeded(tmp_path):
+    seed = CMakeSeed(str(tmp_path / 'cache'))
+    assert seed.params('fp', 'x64') == []
+    seed.harvest('fp', 'x64', configured(tmp_path, 'a', {
+        'HAVE_STDINT_H': '1', 'SIZEOF_VOID_P': '8',
+        # the project's own header, and a check that links
+        'HAVE_CONFIG_H': '1', 'CMAKE_HAVE_LIBC_PTHREAD': '',
+        'HAVE_MEMMOVE': '1'}))
+    assert seeded(seed) == ['HAVE_STDINT_H', 'SIZEOF_VOID_P']
+
+
+def test_results_that_differ_are_dropped(tmp_path):
+    seed = CMakeSeed(str(tmp_path / 'cache'))
+    seed.harvest('fp', 'x64', configured(tmp_path, 'a', {
+        'HAVE_STDINT_H': '1', 'HAVE_UNISTD_H': ''}))
+    seed.harvest('fp', 'x64', configured(tmp_path, 'b', {
+        'HAVE_STDINT_H': '1', 'HAVE_UNISTD_H': '1'}))
+    seed.harvest('fp', 'x64', configured(tmp_path, 'c', {
+        'HAVE_UNISTD_H': ''}))
+    assert seeded(seed) == ['HAVE_STDINT_H']
@@ -0,0 +1,235 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_distrib.py - A coordinator and several workers on localhost, each in
+#                  its own checkout, building with the stand-in toolchain
+#
+# #########################################################################
+
+import io
+import json
+import os
+import os.path
+import socket
+import tarfile
+import threading
+import time
+
+from maker import distrib
+from maker.distrib import Coordinator
+from maker.matrix import Matrix
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def element(source, name):
+    return {'source': source, 'targets': [name],
+            'headers': {name + '.h': '.'}, 'deliverables': [name + '.dll']}
+
+
+def coordinate(coordinator, workers):
+    # the coordinator's output, once it and every worker are done
+    address = '127.0.0.1:{}'.format(free_port())
+    p = coordinator.start('coordinate', '--listen', address)
+    lines = []
+    for line in p.stdout:
+        lines.append(line)
+        if line.startswith('Coordinator listening'):
+            break
+    running = [w.start('work', '--connect', address) for w in workers]
+    out, _ = p.communicate(timeout=120)
+    lines.append(out)
+    for w in running:
+        w.communicate(timeout=60)
+        assert w.returncode == 0
+    assert p.returncode == 0, ''.join(lines)
+    return ''.join(lines)
+
+
+def test_workers_share_the_levels(checkout, upstream, monkeypatch):
+    monkeypatch.setenv('FAKE_CMAKE_SLEEP', '1')
+    first = {}
+    for name in ['alpha', 'beta', 'gamma']:
+        first[name] = element(upstream(name, {name + '.h': '// ' + name}),
+                              name)
+    last = {'delta': element(upstream('delta', {'delta.h': '// delta'}),
+                             'delta')}
+    manifests = {'00-first.yaml': first, '01-last.yaml': last}
+    coordinator = checkout('coordinator', manifests)
+    workers = [checkout('worker{}'.format(x), manifests) for x in range(2)]
+
+    out = coordinate(coordinator, workers)
+    handed = [line.split(' -> ')[1].strip() for line in out.splitlines()
+              if ' -> ' in line]
+    assert len(handed) == 4
+    assert len(set(handed)) == 2
+    # what the workers built came back, gendef's import libraries too
+    for name in ['alpha', 'beta', 'gamma', 'delta']:
+        assert os.path.isfile(coordinator.path(
+            'build', 'bin', 'x64', 'Release', name + '.dll'))
+        assert os.path.isfile(coordinator.path(
+            'build', 'lib', 'x64', 'Release', name + '.lib'))
+        assert os.path.isfile(coordinator.path('build', 'include',
+                                               name + '.h'))
+        assert os.path.isfile(coordinator.path('build', 'logs', name,
+                                               'x64.log'))
+
+
+def test_workers_build_with_the_profiles(checkout, upstream, toolchain):
+    alpha = element(upstream('alpha', {'alpha.h': ''}), 'alpha')
+    alpha['profile'] = 'unity'
+    manifests = {'00-libraries.yaml': {
+        'profiles': {'unity': {'prebuild_params': ['-DUNITY=ON'],
+                               'build_params': ['--', '-k0']}},
+        'alpha': alpha}}
+    coordinate(checkout('coordinator', manifests),
+               [checkout('worker', manifests)])
+    configures = toolchain.steps('configure')
+    assert len(configures) == 1
+    assert '-DUNITY=ON' in configures[0]
+
+
+class FakeElement:
+
+    def level(self):
+        return 0
+
+    def manifest(self):
+        return {}
+
+
+class FakeTarget:
+
+    def name(self):
+        return 'alpha'
+
+    def head(self):
+        return 'abc'
+
+    def element(self):
+        return FakeElement()
+
+    def profiles(self):
+        return []
+
+
+class RawWorker:
+    """Speaks the protocol by hand, to go silent when told"""
+
+    def __init__(self, address):
+        self.sock_ = socket.create_connection(address)
+        self.rfile_ = self.sock_.makefile('rb')
+        self.send_({'op': 'register', 'name': 'raw'})
+
+    def send_(self, header, payload=b''):
+        if payload:
+            header = dict(header, size=len(payload))
+        self.sock_.sendall(json.dumps(header).encode() + b'\n' + payload)
+
+    def job(self):
+        return json.loads(self.rfile_.readline().decode())
+
+    def finish(self):
+        data = io.BytesIO()
+        tarfile.open(fileobj=data, mode='w:gz').close()
+        self.send_({'op': 'result', 'ok': True, 'message': ''},
+                   data.getvalue())
+
+    def close(self):
+        self.sock_.close()
+
+
+def coordinating(workspace, monkeypatch):
+    # a coordinator for one job, in a thread; it gives a silent worker up
+    # after a second or so
+    monkeypatch.setattr(distrib, 'HEARTBEAT', 0.25)
+    address = ('127.0.0.1', free_port())
+    coordinator = Coordinator(workspace, [FakeTarget()],
+                              Matrix(['x64'], ['Release'], 'Ninja'), address)
+    exits = []
+
+    def run():
+        try:
+            coordinator.run()
+            exits.append(0)
+        except SystemExit as e:
+            exits.append(e.code)
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    for _ in range(100):
+        try:
+            socket.create_connection(address).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return address, thread, exits
+
+
+def test_silent_worker_job_goes_to_another(workspace, monkeypatch):
+    address, thread, exits = coordinating(workspace, monkeypatch)
+    silent = RawWorker(address)
+    first = silent.job()
+    assert first['job']['attempts'] == 0
+    # no heartbeat from here on; the next worker gets the job
+    other = RawWorker(address)
+    second = other.job()
+    assert second['job']['id'] == first['job']['id']
+    assert second['job']['attempts'] == 1
+    other.finish()
+    assert other.job() == {'op': 'done'}
+    thread.join(10)
+    assert exits == [0]
+    silent.close()
+    other.close()
+
+
+def test_job_given_up_after_max_attempts(workspace, monkeypatch, capsys):
+    address, thread, exits = coordinating(workspace, monkeypatch)
+    workers = []
+    for attempt in range(distrib.MAX_ATTEMPTS):
+        workers.append(RawWorker(address))
+        assert workers[-1].job()['job']['attempts'] == attempt
+    thread.join(10)
+    assert exits == [7]
+    assert 'lost {} workers'.format(distrib.MAX_ATTEMPTS) in \
+        capsys.readouterr().err
+    for worker in workers:
+        worker.close()
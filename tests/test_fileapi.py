@@ -0,0 +1,90 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_fileapi.py - Deliverables as a build tree's File API index names them
+#
+# #########################################################################
+
+import json
+import os.path
+
+from maker import fileapi
+from maker.matrix import Matrix
+from maker.parts import Element
+from maker.target import Target
+
+
+def test_missing_import_library_is_made_by_gendef(workspace):
+    target = Target(Element(0, 'zlib', {'targets': ['zlib'],
+                                        'deliverables': ['zlib.dll']}),
+                    workspace, Matrix(['x64'], ['Release'], 'Ninja'))
+    tree = target.builder().tree_dir(target, 'x64', 'Release')
+    os.makedirs(tree)
+    with open(os.path.join(tree, fileapi.ARTIFACTS_FILE), 'w') as f:
+        json.dump({'Release': {'zlib': ['zlib.dll', 'zlib.lib']}}, f)
+    # a DLL exporting nothing: the linker made no zlib.lib
+    open(os.path.join(tree, 'zlib.dll'), 'w').close()
+    made = os.path.join(target.dll_work_dir('x64', 'Release'), 'zlib.lib')
+    assert target.import_lib_files('x64', 'Release') == [
+        (os.path.join(tree, 'zlib.dll'), made)]
+    assert [source for source, _ in target.gathered_files()] == [
+        os.path.join(tree, 'zlib.dll'), made]
+
+    open(os.path.join(tree, 'zlib.lib'), 'w').close()
+    assert target.import_lib_files('x64', 'Release') == []
+    assert [source for source, _ in target.gathered_files()] == [
+        os.path.join(tree, 'zlib.dll'), os.path.join(tree, 'zlib.lib')]
+
+
+def test_missing_static_library_stays_missing(workspace):
+    target = Target(Element(0, 'zlib', {'targets': ['zlib', 'zlibstatic'],
+                                        'deliverables': ['zlib.dll']}),
+                    workspace, Matrix(['x64'], ['Release'], 'Ninja'))
+    tree = target.builder().tree_dir(target, 'x64', 'Release')
+    os.makedirs(tree)
+    with open(os.path.join(tree, fileapi.ARTIFACTS_FILE), 'w') as f:
+        json.dump({'Release': {'zlib': ['zlib.dll', 'zlib.lib'],
+                               'zlibstatic': ['zlibstatic.lib']}}, f)
+    open(os.path.join(tree, 'zlib.dll'), 'w').close()
+    # neither .lib was made; only the import library is made up for
+    sources = [source for source, _ in target.gathered_files()]
+    assert os.path.join(tree, 'zlibstatic.lib') in sources
+    assert os.path.join(tree, 'zlib.lib') not in sources
+    assert [missing for missing, _ in target.stale_files()
+            if not os.path.isfile(missing)] == [
+        os.path.join(tree, 'zlibstatic.lib'),
+        os.path.join(target.dll_work_dir('x64', 'Release'), 'zlib.lib')]
@@ -0,0 +1,133 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_gendef.py - Import libraries made by stand-in gendef and lib tools,
+#                 and taken from the cache the second time
+#
+# #########################################################################
+
+import os
+import os.path
+
+from maker.gendef import ImportLibs
+from maker.matrix import Matrix
+
+GENDEF = '''
+with open(os.environ['GENDEF_LOG'], 'a') as log:
+    log.write(sys.argv[1] + '\\n')
+stem = os.path.splitext(sys.argv[1])[0]
+with open(stem + '.def', 'w') as f:
+    f.write('LIBRARY {}\\nEXPORTS\\n'.format(stem))
+'''
+
+LIB = '''
+out = [a[5:] for a in sys.argv if a.startswith('/out:')][0]
+with open(out, 'w') as f:
+    f.write(' '.join(sys.argv[1:]))
+'''
+
+
+class FakeTarget:
+
+    def __init__(self, tree, log):
+        self.tree_ = tree
+        self.log_ = log
+
+    def name(self):
+        return 'zlib'
+
+    def env(self, A):
+        return {'GENDEF_LOG': self.log_}
+
+    def import_lib_files(self, A, C):
+        return [(os.path.join(self.tree_, 'zlib.dll'),
+                 os.path.join(self.tree_, 'dll-work', A, C, 'zlib.lib'))]
+
+
+def run(workspace, stand_in, target):
+    ImportLibs(workspace, [target], Matrix(['x64'], None, 'Ninja'), 2,
+               gendef=stand_in('gendef', GENDEF),
+               lib=stand_in('lib', LIB)).run()
+
+
+def test_generated_then_cached(workspace, stand_in, tmp_path):
+    log = str(tmp_path / 'gendef.log')
+    tree = tmp_path / 'tree'
+    tree.mkdir()
+    (tree / 'zlib.dll').write_bytes(b'MZ one')
+    target = FakeTarget(str(tree), log)
+
+    run(workspace, stand_in, target)
+    out = tree / 'dll-work' / 'x64' / 'Release'
+    assert '/machine:X64' in (out / 'zlib.lib').read_text()
+    assert (out / 'zlib.def').is_file()
+    assert open(log).read().split() == ['zlib.dll']
+
+    # the same DLL again comes out of the cache
+    (out / 'zlib.lib').unlink()
+    run(workspace, stand_in, target)
+    assert (out / 'zlib.lib').is_file()
+    assert open(log).read().split() == ['zlib.dll']
+
+    # a different one doesn't
+    (tree / 'zlib.dll').write_bytes(b'MZ two')
+    run(workspace, stand_in, target)
+    assert open(log).read().split() == ['zlib.dll', 'zlib.dll']
+
+
+def test_failure_holds_back_dependents(checkout, upstream, stand_in):
+    # gendef fails on alpha.dll; under -k that is alpha's failure, and beta
+    # (a level later) isn't built against import libraries that aren't there
+    failing = stand_in('gendef-failing', '''
+if sys.argv[1] == 'alpha.dll':
+    sys.exit(3)
+''' + GENDEF.replace("os.environ['GENDEF_LOG']", "os.devnull"))
+    manifests = {}
+    for level, name in enumerate(['alpha', 'beta']):
+        manifests['0{}-{}.yaml'.format(level, name)] = {name: {
+            'source': upstream(name, {name + '.h': ''}), 'targets': [name],
+            'headers': {name + '.h': '.'}, 'deliverables': [name + '.dll']}}
+    tree = checkout('tree', manifests, GENDEF=failing)
+
+    rc, out = tree.run('-k', 'all')
+    assert rc == 1, out
+    assert 'failed   alpha x64: gendef failed on alpha.dll' in out
+    assert 'skipped  beta x64: alpha did not build' in out
+
+    rc, out = tree.run('all')
+    assert rc == 3, out
+    assert 'FATAL: gendef failed on alpha.dll for alpha' in out
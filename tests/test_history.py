@@ -0,0 +1,87 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_history.py - What perf-report holds the last run against
+#
+# #########################################################################
+
+import json
+
+from maker.history import PerfReport
+
+
+def write_runs(path, runs):
+    # runs: [{element: (seconds, rebuilt)}], oldest first
+    with open(path, 'w') as f:
+        for n, timings in enumerate(runs):
+            f.write(json.dumps({
+                'time': n, 'commits': {}, 'toolchains': {},
+                'timings': [{'element': element, 'arch': 'x64',
+                             'phase': 'build', 'seconds': seconds,
+                             'ok': True, 'fresh': False,
+                             'rebuilt': rebuilt}
+                            for element, (seconds, rebuilt)
+                            in timings.items()]}) + '\n')
+
+
+def flagged(path):
+    return [key[0] for key, *_ in PerfReport(str(path)).regressions()]
+
+
+def test_no_op_builds_are_no_baseline(tmp_path):
+    path = tmp_path / 'history.jsonl'
+    # quick no-op builds between real rebuilds would make the last
+    # rebuild look slow
+    write_runs(path, [{'a': (30.0, True)}, {'a': (2.5, False)},
+                      {'a': (2.5, False)}, {'a': (31.0, True)}])
+    assert flagged(path) == []
+    write_runs(path, [{'a': (30.0, True)}, {'a': (30.0, True)},
+                      {'a': (50.0, True)}])
+    assert flagged(path) == ['a']
+
+
+def test_only_the_last_run_is_reported(tmp_path):
+    path = tmp_path / 'history.jsonl'
+    # b's slow rebuild was in an earlier run, already reported then
+    write_runs(path, [{'a': (30.0, True), 'b': (30.0, True)},
+                      {'a': (30.0, True), 'b': (50.0, True)},
+                      {'a': (40.0, True)}])
+    assert flagged(path) == ['a']
+    write_runs(path, [{'a': (30.0, True), 'b': (30.0, True)},
+                      {'a': (30.0, True), 'b': (50.0, True)},
+                      {'a': (40.0, True), 'b': (2.5, False)}])
+    assert flagged(path) == ['a']
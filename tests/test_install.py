@@ -0,0 +1,134 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_install.py - Installing a generation into a shared prefix, and rolling
+#                  back to the one before
+#
+# #########################################################################
+
+import json
+import os
+import os.path
+
+from maker.install import MANIFEST, NEW, OLD, Installer
+
+FILES = ['include/alpha.h', 'lib/x64/Release/alpha.lib',
+         'bin/x64/Release/alpha.dll']
+
+
+def built(workspace, rel, content=None):
+    path = os.path.join(workspace.output_root(), *rel.split('/'))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content or rel)
+
+
+def installed(workspace):
+    prefix = workspace.prefix()
+    return sorted(os.path.relpath(os.path.join(here, name), prefix)
+                  .replace(os.sep, '/')
+                  for area in ('include', 'lib', 'bin')
+                  for here, _, names in os.walk(os.path.join(prefix, area))
+                  for name in names)
+
+
+def test_install_drop_and_roll_back(workspace):
+    prefix = workspace.prefix()
+    # another package's header, already in the shared prefix
+    theirs = os.path.join(prefix, 'include', 'other.h')
+    os.makedirs(os.path.dirname(theirs))
+    with open(theirs, 'w') as f:
+        f.write('other')
+    ino = os.stat(theirs).st_ino
+    for rel in FILES:
+        built(workspace, rel)
+    installer = Installer(workspace, jobs=2)
+
+    installer.install(FILES)
+    assert installed(workspace) == sorted(FILES + ['include/other.h'])
+    # staged beside the live trees, and carried over as a hardlink
+    assert not any(os.path.exists(os.path.join(prefix, area + NEW))
+                   for area in ('include', 'lib', 'bin'))
+    assert os.stat(theirs).st_ino == ino
+    assert os.path.isfile(os.path.join(prefix, 'include' + OLD, 'other.h'))
+    with open(os.path.join(prefix, MANIFEST)) as f:
+        assert json.load(f)['files'] == sorted(FILES)
+
+    # a file no longer built goes; another package's stays
+    installer.install(FILES[:2])
+    assert installed(workspace) == sorted(FILES[:2] + ['include/other.h'])
+
+    installer.rollback()
+    assert installed(workspace) == sorted(FILES + ['include/other.h'])
+    assert installer.manifest() == sorted(FILES)
+    # rolling back again undoes the rollback
+    installer.rollback()
+    assert installed(workspace) == sorted(FILES[:2] + ['include/other.h'])
+    assert installer.manifest() == sorted(FILES[:2])
+
+
+def test_changed_files_replaced_unchanged_linked(workspace):
+    for rel in FILES:
+        built(workspace, rel)
+    installer = Installer(workspace)
+    installer.install(FILES)
+    live = os.path.join(workspace.prefix(), 'include', 'alpha.h')
+    dll = os.path.join(workspace.prefix(), 'bin', 'x64', 'Release',
+                       'alpha.dll')
+    ino = os.stat(live).st_ino
+
+    built(workspace, 'bin/x64/Release/alpha.dll', 'a different size')
+    installer.install(FILES)
+    assert os.stat(live).st_ino == ino
+    with open(dll) as f:
+        assert f.read() == 'a different size'
+
+
+def test_uninstall_leaves_other_packages(workspace):
+    prefix = workspace.prefix()
+    theirs = os.path.join(prefix, 'bin', 'other.dll')
+    os.makedirs(os.path.dirname(theirs))
+    open(theirs, 'w').close()
+    for rel in FILES:
+        built(workspace, rel)
+    installer = Installer(workspace)
+    installer.install(FILES)
+    installer.uninstall()
+    assert installed(workspace) == ['bin/other.dll']
+    assert installer.manifest() == []
+    installer.rollback()
+    assert installed(workspace) == sorted(FILES + ['bin/other.dll'])
@@ -0,0 +1,109 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_nsis.py - Installers made by a stand-in makensis, at once and only
+#                when something changed
+#
+# #########################################################################
+
+import os
+import os.path
+
+from maker.nsis import Packager
+
+# packs what the script's File lines name into its OutFile, noting in
+# MAKENSIS_LOG when it started and finished
+MAKENSIS = '''
+import time
+started = time.time()
+out, packed = None, []
+with open(sys.argv[-1], 'r', encoding='utf-8') as f:
+    for line in f:
+        word, _, rest = line.strip().partition(' ')
+        path = rest.strip('"').replace('$$', '$')
+        if word == 'OutFile':
+            out = path
+        elif word == 'File':
+            with open(path, 'r') as src:
+                packed.append(src.read())
+time.sleep(0.5)
+with open(out, 'w') as f:
+    f.write('\\n'.join(packed))
+with open(os.environ['MAKENSIS_LOG'], 'a') as log:
+    log.write('{} {} {}\\n'.format(os.path.basename(out), started,
+                                   time.time()))
+'''
+
+FILES = ['include/zlib.h', 'bin/x64/zlib.dll', 'lib/x64/zlib.lib',
+         'bin/x86/zlib.dll', 'lib/x86/zlib.lib']
+
+
+def made(log):
+    # (installer, started, finished) for each makensis run
+    with open(log, 'r') as f:
+        return [(name, float(start), float(end)) for name, start, end
+                in (line.split() for line in f)]
+
+
+def test_components_built_at_once_then_kept(workspace, stand_in, tmp_path,
+                                            monkeypatch):
+    log = str(tmp_path / 'makensis.log')
+    monkeypatch.setenv('MAKENSIS_LOG', log)
+    for rel in FILES:
+        path = os.path.join(workspace.output_root(), *rel.split('/'))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(rel)
+    packager = Packager(workspace, stand_in('makensis', MAKENSIS), jobs=3)
+
+    packager.package(FILES)
+    runs = made(log)
+    assert sorted(name for name, _, _ in runs) == [
+        'gtk-msvc-headers.exe', 'gtk-msvc-x64.exe', 'gtk-msvc-x86.exe']
+    # each started before any other had finished
+    assert max(start for _, start, _ in runs) < \
+        min(end for _, _, end in runs)
+    with open(os.path.join(workspace.nsis_dir(), 'gtk-msvc-x64.exe')) as f:
+        assert sorted(f.read().split()) == ['bin/x64/zlib.dll',
+                                            'lib/x64/zlib.lib']
+
+    # only the component whose files changed is made again
+    with open(os.path.join(workspace.output_root(), 'include',
+                           'zlib.h'), 'a') as f:
+        f.write(' changed')
+    packager.package(FILES)
+    assert [name for name, _, _ in made(log)[3:]] == ['gtk-msvc-headers.exe']
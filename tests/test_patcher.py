@@ -0,0 +1,183 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_patcher.py - Unified diffs applied in-process, and the record kept of
+#                  them
+#
+# #########################################################################
+
+import os
+import os.path
+
+import pytest
+
+from maker.patcher import Patch, PatchError, PatchState
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHANGE = b'''--- a/f.txt
++++ b/f.txt
+@@ -2,3 +2,3 @@
+ two
+-three
++THREE
+ four
+'''
+
+# aimed at the second of two identical blocks
+SECOND = b'''--- a/f.txt
++++ b/f.txt
+@@ -5,3 +5,3 @@
+ if(A)
+-  x()
++  y()
+ endif()
+'''
+BLOCKS = b'if(A)\n  x()\nendif()\n\nif(A)\n  x()\nendif()\n'
+
+
+def write(root, name, content):
+    path = os.path.join(str(root), name)
+    with open(path, 'wb') as f:
+        f.write(content)
+    return path
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_forward_and_reverse(tmp_path):
+    path = write(tmp_path, 'f.txt', b'one\ntwo\nthree\nfour\nfive\n')
+    patch = Patch(CHANGE, 'change.patch')
+    assert patch.applies(str(tmp_path))
+    assert not patch.applies(str(tmp_path), reverse=True)
+    patch.apply(str(tmp_path))
+    assert read(path) == b'one\ntwo\nTHREE\nfour\nfive\n'
+    assert not patch.applies(str(tmp_path))
+    patch.apply(str(tmp_path), reverse=True)
+    assert read(path) == b'one\ntwo\nthree\nfour\nfive\n'
+
+
+def test_crlf_files_stay_crlf(tmp_path):
+    path = write(tmp_path, 'f.txt', b'one\r\ntwo\r\nthree\r\nfour\r\n')
+    Patch(CHANGE).apply(str(tmp_path))
+    assert read(path) == b'one\r\ntwo\r\nTHREE\r\nfour\r\n'
+
+
+def test_created_file(tmp_path):
+    # the bzip2 patch adds bz2.def and changes CMakeLists.txt at line 300
+    lines = [b'# filler'] * 299 + [
+        b'if(ENABLE_SHARED_LIB)', b'    # The libbz2 shared library.',
+        b'    add_library(bz2 SHARED ${BZ2_RES})', b'    target_sources(bz2',
+        b'        PRIVATE   ${BZ2_SOURCES}',
+        b'                  ${CMAKE_CURRENT_SOURCE_DIR}/libbz2.def',
+        b'        PUBLIC    ${CMAKE_CURRENT_SOURCE_DIR}/bzlib_private.h',
+        b'        INTERFACE ${CMAKE_CURRENT_SOURCE_DIR}/bzlib.h)', b'']
+    cmake = write(tmp_path, 'CMakeLists.txt', b'\n'.join(lines) + b'\n')
+    patch = Patch.from_file(os.path.join(REPO, 'patch',
+                                         'bzip2-def-file.patch'))
+    patch.apply(str(tmp_path))
+    assert read(os.path.join(str(tmp_path), 'bz2.def')).startswith(
+        b'LIBRARY')
+    assert b'${BZ2_DEF}' in read(cmake)
+    patch.apply(str(tmp_path), reverse=True)
+    assert not os.path.exists(os.path.join(str(tmp_path), 'bz2.def'))
+    assert read(cmake) == b'\n'.join(lines) + b'\n'
+
+
+def test_offset_hunk(tmp_path):
+    path = write(tmp_path, 'f.txt', b'new\nnew\none\ntwo\nthree\nfour\n')
+    Patch(CHANGE).apply(str(tmp_path))
+    assert read(path) == b'new\nnew\none\ntwo\nTHREE\nfour\n'
+
+
+def test_duplicate_context_goes_where_the_hunk_says(tmp_path):
+    path = write(tmp_path, 'f.txt', BLOCKS)
+    Patch(SECOND).apply(str(tmp_path))
+    assert read(path) == b'if(A)\n  x()\nendif()\n\nif(A)\n  y()\nendif()\n'
+
+
+def test_ambiguous_offset_hunk_fails(tmp_path):
+    # neither block is where the hunk says
+    path = write(tmp_path, 'f.txt', b'\n\n\n\n\n\n\n' + BLOCKS)
+    with pytest.raises(PatchError, match='lines 8, 12'):
+        Patch(SECOND).apply(str(tmp_path))
+    assert read(path) == b'\n\n\n\n\n\n\n' + BLOCKS
+
+
+def test_recorded_state(tmp_path):
+    git_dir = str(tmp_path / '.git')
+    os.makedirs(git_dir)
+    assert not PatchState(git_dir).known()
+    patch = Patch(CHANGE, 'change.patch')
+    PatchState(git_dir).record('abc', [patch])
+    state = PatchState(git_dir)
+    assert state.known() and state.commit() == 'abc'
+    assert state.matches('abc', [patch])
+    assert not state.matches('def', [patch])
+    assert not state.matches('abc', [])
+    applied = state.applied()
+    assert [(p.name(), p.content()) for p in applied] == [
+        ('change.patch', CHANGE)]
+
+
+def test_sync_with_nothing_new_leaves_the_tree(checkout, upstream):
+    # a checkout at upstream, patched as wanted, isn't touched again
+    source = upstream('alpha', {'f.txt': 'one\ntwo\nthree\nfour\n'})
+    tree = checkout('tree', {'00-libraries.yaml': {'alpha': {
+        'source': source, 'patches': ['change.patch'],
+        'targets': ['alpha'], 'deliverables': ['alpha.dll']}}})
+    os.makedirs(tree.path('patch'))
+    write(tree.path('patch'), 'change.patch', CHANGE)
+    rc, out = tree.run('all')
+    assert rc == 0, out
+    patched = tree.path('build', 'source', 'alpha', 'f.txt')
+    assert read(patched) == b'one\ntwo\nTHREE\nfour\n'
+    # the record isn't even written again
+    record = tree.path('build', 'source', 'alpha', '.git',
+                       'gtk-msvc-patches.json')
+    past = os.stat(patched).st_mtime_ns - 10 ** 10
+    for path in (patched, record):
+        os.utime(path, ns=(past, past))
+
+    rc, out = tree.run('all')
+    assert rc == 0, out
+    assert read(patched) == b'one\ntwo\nTHREE\nfour\n'
+    assert os.stat(patched).st_mtime_ns == past
+    assert os.stat(record).st_mtime_ns == past
@@ -0,0 +1,68 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_plan.py - Dry runs that can't read an element without git
+#
+# #########################################################################
+
+import os.path
+
+
+def test_dry_run_reports_what_it_cannot_read(checkout, upstream):
+    manifests = {'00-libraries.yaml': {name: {
+        'source': upstream(name, {name + '.h': ''}), 'targets': [name],
+        'headers': {name + '.h': '.'}, 'deliverables': [name + '.dll']}
+        for name in ['alpha', 'beta']}}
+    tree = checkout('tree', manifests)
+
+    rc, out = tree.run('-n', 'all')
+    assert rc == 0, out
+    assert 'would have been run' not in out
+    assert out.count('clone ') == 2
+    assert out.count('x64 Release: build (sources not cloned yet)') == 2
+
+    rc, out = tree.run('all')
+    assert rc == 0, out
+    # a HEAD .git can't answer for; git would have to be asked
+    head = os.path.join(tree.path('build', 'source', 'alpha'), '.git', 'HEAD')
+    with open(head, 'w') as f:
+        f.write('ref: refs/heads/nowhere\n')
+    rc, out = tree.run('-n', 'all')
+    assert rc == 0, out
+    assert 'x64 Release: build (HEAD unreadable without running git)' in out
+    # and the rest of the plan still comes out
+    assert out.count('gather (install, package)') == 2
@@ -0,0 +1,121 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_schedule.py - How many jobs the scheduler lets run at once
+#
+# #########################################################################
+
+import threading
+import time
+
+import pytest
+
+from maker.schedule import Job, Scheduler
+
+
+class Concurrency:
+    """Fake jobs that note how many of them ran at once"""
+
+    def __init__(self):
+        self.lock_ = threading.Lock()
+        self.now_ = 0
+        self.most_ = 0
+        self.ran_ = []
+
+    def work_(self, label):
+        with self.lock_:
+            self.now_ += 1
+            self.most_ = max(self.most_, self.now_)
+        time.sleep(0.1)
+        with self.lock_:
+            self.now_ -= 1
+            self.ran_.append(label)
+
+    def jobs(self, count, **kwargs):
+        return [Job(str(x), lambda x=x: self.work_(str(x)), **kwargs)
+                for x in range(count)]
+
+    def most(self):
+        return self.most_
+
+    def ran(self):
+        return sorted(self.ran_)
+
+
+def test_memory_budget():
+    seen = Concurrency()
+    Scheduler(8, memory_budget=1000).run(seen.jobs(4, memory=600))
+    assert seen.most() == 1
+    assert seen.ran() == ['0', '1', '2', '3']
+    seen = Concurrency()
+    Scheduler(8, memory_budget=1000).run(seen.jobs(4, memory=400))
+    assert seen.most() == 2
+
+
+def test_job_bigger_than_the_budget_still_runs():
+    seen = Concurrency()
+    Scheduler(8, memory_budget=1000).run(seen.jobs(2, memory=4000))
+    assert seen.most() == 1
+    assert seen.ran() == ['0', '1']
+
+
+def test_group_limit():
+    seen = Concurrency()
+    Scheduler(8).run(seen.jobs(6, group='zlib', group_limit=2))
+    assert seen.most() == 2
+
+
+def test_weight():
+    seen = Concurrency()
+    Scheduler(8).run(seen.jobs(6, weight=3))
+    assert seen.most() == 2
+    # one heavier than every slot still runs, alone
+    seen = Concurrency()
+    Scheduler(2).run(seen.jobs(3, weight=4))
+    assert seen.most() == 1
+
+
+def test_first_failure_is_raised_after_the_running_ones():
+    seen = Concurrency()
+
+    def fail():
+        raise RuntimeError('broken')
+    jobs = seen.jobs(1) + [Job('bad', fail)] + seen.jobs(1)
+    with pytest.raises(RuntimeError, match='broken'):
+        Scheduler(2).run(jobs)
+    # the one running alongside finished; the one waiting never started
+    assert seen.ran() == ['0']
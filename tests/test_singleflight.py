@@ -0,0 +1,181 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_singleflight.py - Runs sharing a cache building the same thing once
+#
+# #########################################################################
+
+import os
+import os.path
+import subprocess
+import threading
+import time
+
+from maker import singleflight
+from maker.singleflight import SingleFlight
+
+
+def libraries(upstream):
+    # alpha, and beta a level later built against it
+    manifests = {}
+    for level, name in enumerate(['alpha', 'beta']):
+        manifests['0{}-{}.yaml'.format(level, name)] = {name: {
+            'source': upstream(name, {name + '.c': 'int x;'}),
+            'targets': [name], 'deliverables': [name + '.dll']}}
+    return manifests
+
+
+def test_concurrent_runs_build_once(checkout, upstream, toolchain, tmp_path,
+                                    monkeypatch):
+    monkeypatch.setenv('FAKE_CMAKE_SLEEP', '2')
+    manifests = libraries(upstream)
+    roots = {'cache': str(tmp_path / 'shared')}
+    runs = [checkout(name, manifests, ROOTS=roots) for name in ('one', 'two')]
+    started = [run.start('all') for run in runs]
+    outs = [p.communicate(timeout=120)[0] for p in started]
+    for p, out in zip(started, outs):
+        assert p.returncode == 0, out
+    # each library built by one run, and its build reused by the other
+    built = [tree for tree, _ in toolchain.steps('build')]
+    assert len(built) == 2, outs
+    assert sum(out.count('Reused ') for out in outs) == 2, outs
+    for run in runs:
+        for name in ['alpha', 'beta']:
+            assert os.path.isfile(run.path('build', 'build', name, 'x64',
+                                           'Release', name + '.dll'))
+
+
+def test_changed_source_tree_builds_itself(checkout, upstream, toolchain,
+                                           tmp_path):
+    manifests = libraries(upstream)
+    roots = {'cache': str(tmp_path / 'shared')}
+    one, two = [checkout(name, manifests, ROOTS=roots)
+                for name in ('one', 'two')]
+    for run in (one, two):
+        rc, out = run.run('all')
+        assert rc == 0, out
+    assert 'Reused alpha' in out
+
+    source = manifests['00-alpha.yaml']['alpha']['source']
+    with open(os.path.join(source, 'alpha.c'), 'w') as f:
+        f.write('int y;')
+    subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t',
+                    'commit', '-q', '-am', 'bump'], cwd=source, check=True)
+    rc, out = one.run('all')
+    assert rc == 0, out
+    # a file the inputs know nothing of
+    with open(two.path('build', 'source', 'alpha', 'local.c'), 'w') as f:
+        f.write('int local;')
+    tree = two.path('build', 'build', 'alpha', 'x64', 'Release')
+    before = toolchain.steps('build').count([tree, 'alpha'])
+    rc, out = two.run('all')
+    assert rc == 0, out
+    assert 'Reused alpha' not in out
+    assert toolchain.steps('build').count([tree, 'alpha']) == before + 1
+
+
+def test_stale_lock_is_taken_over(tmp_path):
+    flight = SingleFlight(str(tmp_path))
+    os.makedirs(flight.dir_)
+    lock = flight.lock_path_('key')
+    with open(lock, 'w') as f:
+        f.write('elsewhere:1')
+    old = time.time() - singleflight.STALE - 30
+    os.utime(lock, (old, old))
+    built = []
+    flight.run('key', 'alpha x64 Release', lambda: built.append(1),
+               lambda staging: {}, None)
+    assert built == [1]
+    assert not os.path.exists(lock)
+    assert os.path.isfile(os.path.join(flight.result_dir_('key'),
+                                       singleflight.RESULT_FILE))
+
+
+def test_fresh_lock_is_waited_for(tmp_path, monkeypatch):
+    monkeypatch.setattr(singleflight, 'POLL', 0.1)
+    holder = SingleFlight(str(tmp_path))
+    os.makedirs(holder.dir_)
+    held = holder.acquire_('key')
+    reused = []
+
+    def finish():
+        time.sleep(0.5)
+        holder.publish_('key', lambda staging: {'files': {}})
+        held.release()
+    thread = threading.Thread(target=finish)
+    thread.start()
+    SingleFlight(str(tmp_path)).run(
+        'key', 'alpha x64 Release', lambda: reused.append('built'),
+        lambda staging: {},
+        lambda result_dir, result: reused.append(result['files']))
+    thread.join()
+    assert reused == [{}]
+
+
+def test_benchmarks_are_built_not_reused(checkout, upstream, toolchain):
+    manifests = libraries(upstream)
+    tree = checkout('tree', manifests)
+    rc, out = tree.run('all')
+    assert rc == 0, out
+    before = len(toolchain.steps('build'))
+    rc, out = tree.run('bench-profiles', 'alpha')
+    assert rc == 0, out
+    assert 'Reused' not in out
+    assert len(toolchain.steps('build')) > before
+
+
+def test_reused_tree_stays_reused(checkout, upstream, toolchain, tmp_path):
+    manifests = libraries(upstream)
+    roots = {'cache': str(tmp_path / 'shared')}
+    one, two = [checkout(name, manifests, ROOTS=roots)
+                for name in ('one', 'two')]
+    for run in (one, two):
+        rc, out = run.run('all')
+        assert rc == 0, out
+    assert out.count('Reused ') == 2
+
+    def steps_in_two():
+        return [step for kind in ('configure', 'build')
+                for step in toolchain.steps(kind)
+                if step[0].startswith(two.root())]
+    rc, out = two.run('-n', 'all')
+    assert rc == 0, out
+    assert out.count("x64 Release: another run's build was reused") == 2
+    # nothing left over for the next run to do
+    rc, out = two.run('all')
+    assert rc == 0, out
+    assert steps_in_two() == []
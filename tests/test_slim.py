@@ -0,0 +1,63 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_slim.py - What pruning leaves in a build tree
+#
+# #########################################################################
+
+import os
+
+from maker.slim import prune_tree
+
+KEPT = ['CMakeCache.txt', 'zlib.dll', 'zlib.pdb', 'zlibstatic.lib',
+        'zlibstatic.dir/Release/zlibstatic.pdb', 'include/zconf.h']
+PRUNED = ['zlib.ilk', 'zlib.exp', 'zlibstatic.dir/Release/adler32.obj',
+          'zlibstatic.dir/Release/zlibstatic.tlog/CL.read.1.tlog']
+
+
+def test_intermediates_go_and_debug_info_stays(tmp_path):
+    for rel in KEPT + PRUNED:
+        path = tmp_path.joinpath(*rel.split('/'))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel)
+    files, _ = prune_tree(str(tmp_path))
+    assert files == len(PRUNED)
+    left = sorted(os.path.relpath(os.path.join(here, name), str(tmp_path))
+                  .replace(os.sep, '/')
+                  for here, _, names in os.walk(str(tmp_path))
+                  for name in names)
+    assert left == sorted(KEPT)
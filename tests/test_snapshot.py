@@ -0,0 +1,95 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_snapshot.py - Restoring only what stays inside the workspace
+#
+# #########################################################################
+
+import io
+import json
+import os.path
+import tarfile
+
+import pytest
+
+from maker.snapshot import MANIFEST, SNAPSHOT_FORMAT, Snapshot
+
+
+def snapshot(path, members):
+    # members: [(name, content)], content None for a symlink to /etc
+    with tarfile.open(str(path), 'w') as tar:
+        for name, content in members:
+            info = tarfile.TarInfo(name)
+            if content is None:
+                info.type = tarfile.SYMTYPE
+                info.linkname = '/etc'
+                tar.addfile(info)
+            else:
+                info.size = len(content)
+                tar.addfile(info, io.BytesIO(content))
+
+
+def manifest():
+    return json.dumps({'format': SNAPSHOT_FORMAT, 'sources': {},
+                       'builds': []}).encode()
+
+
+def test_plain_snapshot_restores(workspace, tmp_path):
+    path = tmp_path / 'plain.tar'
+    snapshot(path, [(MANIFEST, manifest())])
+    Snapshot(workspace, []).restore(str(path))
+
+
+@pytest.mark.parametrize('member', ['../evil.txt', '/tmp/evil.txt',
+                                    'sources/../../evil.txt'])
+def test_escaping_member_is_refused(workspace, tmp_path, member, capsys):
+    path = tmp_path / 'crafted.tar'
+    snapshot(path, [(MANIFEST, manifest()), (member, b'evil')])
+    with pytest.raises(SystemExit) as e:
+        Snapshot(workspace, []).restore(str(path))
+    assert e.value.code == 2
+    assert member in capsys.readouterr().err
+    # it would have been unpacked in a scratch directory in the build root
+    assert not os.path.exists(os.path.join(workspace.build_root(),
+                                           'evil.txt'))
+
+
+def test_link_is_refused(workspace, tmp_path):
+    path = tmp_path / 'linked.tar'
+    snapshot(path, [(MANIFEST, manifest()), ('sources', None)])
+    with pytest.raises(SystemExit):
+        Snapshot(workspace, []).restore(str(path))
@@ -0,0 +1,82 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_sync.py - Syncing a checkout from a local upstream
+#
+# #########################################################################
+
+import os
+import re
+import subprocess
+
+from maker.parts import Element
+from maker.target import Target
+
+
+def commit(repo, path, content):
+    with open(os.path.join(repo, path), 'w') as f:
+        f.write(content)
+    subprocess.run(['git', '-c', 'user.name=t', '-c', 'user.email=t@t',
+                    'commit', '-q', '-am', 'more'], cwd=repo, check=True)
+    return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=repo,
+                          check=True, stdout=subprocess.PIPE,
+                          universal_newlines=True).stdout.strip()
+
+
+def test_pulls_when_config_needs_git(workspace, upstream):
+    source = upstream('alpha', {'alpha.h': 'one'})
+    workspace.create_build_dirs()
+    target = Target(Element(0, 'alpha', {'source': source}), workspace)
+    target.sync()
+
+    # the branch section moves to an included file, which .git's reader
+    # doesn't follow
+    config_file = os.path.join(target.git_dir(), 'config')
+    with open(config_file) as f:
+        config = f.read()
+    branch = re.search(r'\[branch "[^"]+"\][^\[]*', config).group(0)
+    with open(config_file, 'w') as f:
+        f.write(config.replace(branch, '') + '[include]\n\tpath = more\n')
+    with open(os.path.join(target.git_dir(), 'more'), 'w') as f:
+        f.write(branch)
+    assert target.git_state().upstream() is None
+
+    latest = commit(source, 'alpha.h', 'two')
+    target.sync()
+    assert target.head() == latest
+    with open(os.path.join(target.source_dir(), 'alpha.h')) as f:
+        assert f.read() == 'two'
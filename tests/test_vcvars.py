@@ -0,0 +1,89 @@
+# #########################################################################
+#
+#  Copyright (c) 2026, Arthur N. Klassen
+#  All rights reserved.
+#
+#  Redistribution and use in source and binary forms, with or without
+#  modification, are permitted provided that the following conditions are met:
+#
+#  1. Redistributions of source code must retain the above copyright
+#     notice, this list of conditions and the following disclaimer.
+#
+#  2. Redistributions in binary form must reproduce the above copyright
+#     notice, this list of conditions and the following disclaimer in the
+#     documentation and/or other materials provided with the distribution.
+#
+#  THIS SOFTWARE IS PROVIDED BY THE COPYRIGHT HOLDERS AND CONTRIBUTORS "AS IS"
+#  AND ANY EXPRESS OR IMPLIED WARRANTIES, INCLUDING, BUT NOT LIMITED TO, THE
+#  IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A PARTICULAR PURPOSE
+#  ARE DISCLAIMED. IN NO EVENT SHALL THE COPYRIGHT HOLDER OR CONTRIBUTORS BE
+#  LIABLE FOR ANY DIRECT, INDIRECT, INCIDENTAL, SPECIAL, EXEMPLARY, OR
+#  CONSEQUENTIAL DAMAGES (INCLUDING, BUT NOT LIMITED TO, PROCUREMENT OF
+#  SUBSTITUTE GOODS OR SERVICES; LOSS OF USE, DATA, OR PROFITS; OR BUSINESS
+#  INTERRUPTION) HOWEVER CAUSED AND ON ANY THEORY OF LIABILITY, WHETHER IN
+#  CONTRACT, STRICT LIABILITY, OR TORT (INCLUDING NEGLIGENCE OR OTHERWISE)
+#  ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVEN IF ADVISED OF THE
+#  POSSIBILITY OF SUCH DAMAGE.
+#
+# #########################################################################
+#
+#  2026.10.19 - First version
+#
+#     May you do good and not evil.
+#     May you find forgiveness for yourself and forgive others.
+#     May you share freely, never taking more than you give.
+#
+# #########################################################################
+#
+#  test_vcvars.py - Capturing a stand-in vcvars script's environment once,
+#                 and again only when the script changes
+#
+# #########################################################################
+
+import os
+
+import pytest
+
+from maker.vcvars import VcVars
+
+pytestmark = pytest.mark.skipif(os.name == 'nt',
+                                reason='the stand-in is a sh script')
+
+
+def stand_in_vcvars(tmp_path):
+    runs = tmp_path / 'runs'
+    script = tmp_path / 'vcvars64.sh'
+    script.write_text('echo "setting up x64"\n'
+                      'echo run >> "{}"\n'
+                      'export FAKE_VC=x64-tools\n'
+                      'export PATH=/opt/fakevc/bin:$PATH\n'.format(runs))
+    return str(script), runs
+
+
+def test_captured_once_and_cached(tmp_path):
+    script, runs = stand_in_vcvars(tmp_path)
+    cache = str(tmp_path / 'cache')
+    env = VcVars({'x64': script}, cache).env('x64')
+    assert env['FAKE_VC'] == 'x64-tools'
+    assert env['PATH'].startswith('/opt/fakevc/bin' + os.pathsep)
+    assert 'HOME' not in env
+    assert VcVars({'Win32': ''}, cache).env('Win32') is None
+
+    # a later run takes it from the cache without running the script
+    assert VcVars({'x64': script}, cache).env('x64') == env
+    assert runs.read_text().split() == ['run']
+
+    # a changed script is run again
+    st = os.stat(script)
+    os.utime(script, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    VcVars({'x64': script}, cache).env('x64')
+    assert runs.read_text().split() == ['run', 'run']
+
+
+def test_no_capture_without_cache(tmp_path):
+    script, runs = stand_in_vcvars(tmp_path)
+    vcvars = VcVars({'x64': script}, str(tmp_path / 'cache'))
+    vcvars.set_capture(False)
+    assert vcvars.env('x64') is None
+    assert not vcvars.captured('x64')
+    assert not runs.exists()